@@ -0,0 +1,222 @@
+"""
+Controle de admissão para as etapas custosas (leitura, geração, lotes).
+
+Cada etapa tem um limite de execuções simultâneas e uma fila limitada com
+tempo máximo de espera. Quando a fila está cheia ou a espera se esgota, a
+requisição é recusada imediatamente com 503 e `Retry-After`, em vez de
+acumular memória e CPU até que todas fiquem lentas.
+"""
+import asyncio
+import threading
+from collections import deque
+from typing import AsyncIterator, Callable, Deque, Dict, Tuple
+
+from fastapi import Depends
+
+from app import config
+
+
+class Overloaded(Exception):
+    """Etapa saturada; a requisição deve ser repetida depois de `retry_after` segundos."""
+
+    def __init__(self, stage: str, reason: str, retry_after: int):
+        super().__init__(f"Etapa '{stage}' sobrecarregada ({reason})")
+        self.stage = stage
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionTicket:
+    """Vaga concedida por um AdmissionController; liberar mais de uma vez não tem efeito."""
+
+    def __init__(self, controller: "AdmissionController"):
+        self._controller = controller
+        self._released = False
+        self._lock = threading.Lock()
+
+    def release(self) -> None:
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._controller._release()
+
+
+class AdmissionController:
+    """
+    Semáforo com fila limitada, seguro entre threads e event loops.
+
+    Attributes:
+        stage: Nome da etapa controlada
+        max_concurrency: Execuções simultâneas permitidas
+        max_queue: Requisições que podem aguardar uma vaga
+        queue_timeout: Tempo máximo de espera na fila, em segundos
+        retry_after: Valor do cabeçalho Retry-After, em segundos
+        admitted: Requisições admitidas
+        rejected_queue_full: Recusadas por fila cheia
+        rejected_timeout: Recusadas por tempo de espera esgotado
+        peak_queue: Maior profundidade de fila observada
+    """
+
+    def __init__(
+        self,
+        stage: str,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout_ms: float,
+        retry_after: int = 1,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("Limite de concorrência deve ser ao menos 1")
+        if max_queue < 0:
+            raise ValueError("Tamanho da fila não pode ser negativo")
+
+        self.stage = stage
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout_ms / 1000.0
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.peak_queue = 0
+
+    async def acquire(self) -> AdmissionTicket:
+        """
+        Obtém uma vaga, aguardando na fila se necessário.
+
+        Returns:
+            Vaga a ser liberada ao fim do trabalho
+
+        Raises:
+            Overloaded: Se a fila estiver cheia ou a espera se esgotar
+        """
+        with self._lock:
+            if self._active < self.max_concurrency and not self._waiters:
+                self._active += 1
+                self.admitted += 1
+                return AdmissionTicket(self)
+            if len(self._waiters) >= self.max_queue:
+                self.rejected_queue_full += 1
+                raise Overloaded(self.stage, "fila cheia", self.retry_after)
+
+            loop = asyncio.get_running_loop()
+            waiter = loop.create_future()
+            entry = (loop, waiter)
+            self._waiters.append(entry)
+            self.peak_queue = max(self.peak_queue, len(self._waiters))
+
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except BaseException as e:
+            with self._lock:
+                still_queued = entry in self._waiters
+                if still_queued:
+                    self._waiters.remove(entry)
+                if isinstance(e, asyncio.TimeoutError):
+                    self.rejected_timeout += 1
+            # Se a vaga já foi repassada: com o aguardante cancelado, _grant a
+            # devolve; se ela chegou a ser entregue, é devolvida aqui
+            if not still_queued and waiter.done() and not waiter.cancelled():
+                self._release()
+            if isinstance(e, asyncio.TimeoutError):
+                raise Overloaded(self.stage, "tempo de espera esgotado", self.retry_after)
+            raise
+
+        with self._lock:
+            self.admitted += 1
+        return AdmissionTicket(self)
+
+    def _release(self) -> None:
+        """Repassa a vaga ao primeiro da fila ou a devolve."""
+        with self._lock:
+            while self._waiters:
+                loop, waiter = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(self._grant, waiter)
+                    return
+                except RuntimeError:
+                    # Event loop do aguardante já foi encerrado
+                    continue
+            self._active -= 1
+
+    def _grant(self, waiter: asyncio.Future) -> None:
+        """Entrega a vaga no event loop do aguardante."""
+        if waiter.done():
+            # Desistiu (tempo esgotado ou cancelamento) depois do repasse
+            self._release()
+        else:
+            waiter.set_result(None)
+
+    def stats(self) -> Dict:
+        """Retorna os limites e contadores atuais."""
+        with self._lock:
+            return {
+                "stage": self.stage,
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": len(self._waiters),
+                "peak_queue": self.peak_queue,
+                "admitted": self.admitted,
+                "rejected_queue_full": self.rejected_queue_full,
+                "rejected_timeout": self.rejected_timeout,
+            }
+
+
+def _from_config(stage: str) -> AdmissionController:
+    concurrency, queue, timeout_ms = config.ADMISSION[stage]
+    return AdmissionController(stage, concurrency, queue, timeout_ms, config.RETRY_AFTER_SECONDS)
+
+
+_decode_admission = _from_config("decode")
+_render_admission = _from_config("render")
+_batch_admission = _from_config("batch")
+
+
+def get_decode_admission() -> AdmissionController:
+    """Dependency para o controle de admissão da leitura de QR Codes."""
+    return _decode_admission
+
+
+def get_render_admission() -> AdmissionController:
+    """Dependency para o controle de admissão da geração de QR Codes."""
+    return _render_admission
+
+
+def get_batch_admission() -> AdmissionController:
+    """Dependency para o controle de admissão de importações e arquivamento."""
+    return _batch_admission
+
+
+def admission_slot(get_controller: Callable[[], AdmissionController]):
+    """
+    Cria uma dependency que ocupa uma vaga da etapa durante a requisição.
+
+    A vaga é liberada depois do envio da resposta, inclusive respostas em
+    fluxo contínuo.
+
+    Args:
+        get_controller: Dependency que fornece o controle de admissão
+
+    Returns:
+        Dependency para `dependencies=[Depends(...)]` da rota
+    """
+    async def slot(
+        controller: AdmissionController = Depends(get_controller)
+    ) -> AsyncIterator[AdmissionTicket]:
+        ticket = await controller.acquire()
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    return slot
+
+
+decode_slot = admission_slot(get_decode_admission)
+render_slot = admission_slot(get_render_admission)
+batch_slot = admission_slot(get_batch_admission)
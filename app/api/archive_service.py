@@ -0,0 +1,130 @@
+"""
+Serviço para arquivamento de convites antigos.
+
+Os convites ativos ficam em `invites`; os criados antes da janela de
+retenção são movidos para `invites_archive`, mantendo ID e código. As
+consultas por código procuram primeiro na tabela ativa e, se necessário,
+no arquivo.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional, Union
+
+from sqlalchemy import bindparam, delete, insert, select, union_all, update
+from sqlalchemy.orm import Session
+
+from app.models.change_sequence import allocate_change_seq
+from app.models.invite import ArchivedInvite, Invite
+
+AnyInvite = Union[Invite, ArchivedInvite]
+
+
+class ArchiveService:
+    """Serviço para mover convites entre a tabela ativa e o arquivo."""
+
+    DEFAULT_CHUNK_SIZE = 500
+
+    @staticmethod
+    def archive(
+        db: Session,
+        older_than_days: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        now: Optional[datetime] = None,
+    ) -> int:
+        """
+        Move para o arquivo os convites criados antes da janela de retenção.
+
+        Cada bloco é movido em uma transação própria, então uma interrupção
+        deixa cada convite em exatamente uma das tabelas. Os convites movidos
+        recebem novos números de sequência, para que o feed de alterações
+        informe a remoção deles da tabela ativa.
+
+        Args:
+            db: Sessão do banco de dados
+            older_than_days: Janela de retenção em dias
+            chunk_size: Quantidade de convites por transação
+            now: Data de referência (padrão: agora)
+
+        Returns:
+            Quantidade de convites arquivados
+
+        Raises:
+            ValueError: Se a janela de retenção for negativa
+        """
+        if older_than_days < 0:
+            raise ValueError("Janela de retenção não pode ser negativa")
+
+        cutoff = (now or datetime.utcnow()) - timedelta(days=older_than_days)
+        hot = Invite.__table__
+        archive = ArchivedInvite.__table__
+        columns = [column.name for column in hot.columns]
+        archived = 0
+
+        while True:
+            ids = db.execute(
+                select(hot.c.id)
+                .where(hot.c.created_at < cutoff)
+                .order_by(hot.c.id)
+                .limit(chunk_size)
+            ).scalars().all()
+            if not ids:
+                return archived
+
+            try:
+                db.execute(insert(archive).from_select(
+                    columns,
+                    select(*[hot.c[name] for name in columns]).where(hot.c.id.in_(ids))
+                ))
+                db.execute(delete(hot).where(hot.c.id.in_(ids)))
+                seq = allocate_change_seq(db, len(ids))
+                db.execute(
+                    update(archive)
+                    .where(archive.c.id == bindparam("archived_id"))
+                    .values(change_seq=bindparam("seq")),
+                    [{"archived_id": id_, "seq": seq + offset} for offset, id_ in enumerate(ids)]
+                )
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            archived += len(ids)
+
+    @staticmethod
+    def find_invite(db: Session, invite_code: str) -> Optional[AnyInvite]:
+        """
+        Busca um convite pelo código, consultando o arquivo se necessário.
+
+        Args:
+            db: Sessão do banco de dados
+            invite_code: Código do convite
+
+        Returns:
+            Convite ativo ou arquivado, ou None se não existir
+        """
+        invite = db.query(Invite).filter(Invite.invite_code == invite_code).first()
+        if invite is None:
+            invite = db.query(ArchivedInvite).filter(
+                ArchivedInvite.invite_code == invite_code
+            ).first()
+        return invite
+
+    @staticmethod
+    def list_invites(db: Session, skip: int = 0, limit: int = 100) -> List:
+        """
+        Lista convites ativos e arquivados ordenados por ID.
+
+        Args:
+            db: Sessão do banco de dados
+            skip: Quantidade de convites a pular
+            limit: Quantidade máxima de convites
+
+        Returns:
+            Linhas com as colunas dos convites
+        """
+        columns = [column.name for column in Invite.__table__.columns]
+        combined = union_all(
+            select(*[Invite.__table__.c[name] for name in columns]),
+            select(*[ArchivedInvite.__table__.c[name] for name in columns]),
+        ).subquery()
+        return db.execute(
+            select(combined).order_by(combined.c.id).offset(skip).limit(limit)
+        ).all()
@@ -0,0 +1,79 @@
+"""
+Serviço para o feed incremental de alterações dos convites.
+
+Cada criação ou validação atribui ao convite um novo `change_seq`; o
+arquivamento também, na tabela de arquivo. Um cliente guarda a última
+sequência recebida e pede apenas o que mudou depois dela.
+"""
+from typing import Dict
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.change_sequence import current_change_seq
+from app.models.invite import ArchivedInvite, Invite
+
+
+class ChangesService:
+    """Serviço para consulta das alterações desde uma sequência."""
+
+    DEFAULT_LIMIT = 500
+    MAX_LIMIT = 1000
+
+    @staticmethod
+    def changes(db: Session, since: int, limit: int = DEFAULT_LIMIT) -> Dict:
+        """
+        Lista os convites criados, validados ou arquivados após `since`.
+
+        A sequência atual é lida antes das linhas e limita a consulta: tudo
+        até ela já foi gravado, então nenhuma alteração fica para trás do
+        cursor devolvido.
+
+        Args:
+            db: Sessão do banco de dados
+            since: Última sequência conhecida pelo cliente (0 para tudo)
+            limit: Máximo de alterações na resposta
+
+        Returns:
+            Dicionário com `since`, `seq` (cursor para a próxima consulta),
+            `has_more`, `invites` (convites novos ou alterados) e `removed`
+            (IDs arquivados, que saíram da lista ativa)
+
+        Raises:
+            ValueError: Se `since` for negativo ou `limit` estiver fora do intervalo
+        """
+        if since < 0:
+            raise ValueError("Sequência inválida")
+        if not 1 <= limit <= ChangesService.MAX_LIMIT:
+            raise ValueError(f"Limite deve estar entre 1 e {ChangesService.MAX_LIMIT}")
+
+        current = current_change_seq(db)
+        invites = (
+            db.query(Invite)
+            .filter(Invite.change_seq > since, Invite.change_seq <= current)
+            .order_by(Invite.change_seq)
+            .limit(limit + 1)
+            .all()
+        )
+        removed = db.execute(
+            select(ArchivedInvite.change_seq, ArchivedInvite.id)
+            .where(ArchivedInvite.change_seq > since, ArchivedInvite.change_seq <= current)
+            .order_by(ArchivedInvite.change_seq)
+            .limit(limit + 1)
+        ).all()
+
+        merged = sorted(
+            [(invite.change_seq, invite, None) for invite in invites]
+            + [(seq, None, id_) for seq, id_ in removed],
+            key=lambda change: change[0]
+        )
+        has_more = len(merged) > limit
+        merged = merged[:limit]
+
+        return {
+            "since": since,
+            "seq": merged[-1][0] if has_more else max(current, since),
+            "has_more": has_more,
+            "invites": [invite for _, invite, _ in merged if invite is not None],
+            "removed": [id_ for _, _, id_ in merged if id_ is not None],
+        }
@@ -0,0 +1,307 @@
+"""
+Backends de leitura de QR Codes e cadeia de fallback.
+
+Cada backend embrulha uma biblioteca de decodificação (pyzbar, OpenCV,
+zxing-cpp) e é importado apenas quando usado, de modo que bibliotecas
+ausentes só desabilitam o próprio backend. A cadeia tenta os backends na
+ordem configurada e devolve o primeiro resultado.
+
+`evaluate` e `recommend_chain` medem latência e taxa de acerto de cada
+backend sobre um conjunto de imagens e sugerem a ordem mais rápida entre as
+que leem o máximo de imagens (ver `benchmarks/bench_decoders.py`).
+"""
+import io
+import itertools
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from PIL import Image
+
+from app import config
+
+
+class DecoderUnavailable(RuntimeError):
+    """Biblioteca do backend não está instalada ou não pôde ser carregada."""
+
+
+class DecoderBackend:
+    """Interface dos backends: `decode` recebe uma imagem PIL e devolve o texto ou None."""
+
+    name = ""
+
+    def decode(self, image: Image.Image) -> Optional[str]:
+        raise NotImplementedError
+
+
+class PyzbarDecoder(DecoderBackend):
+    """Leitura com pyzbar (requer a biblioteca nativa libzbar)."""
+
+    name = "pyzbar"
+
+    def __init__(self):
+        try:
+            from pyzbar.pyzbar import ZBarSymbol, decode
+        except ImportError as e:
+            raise DecoderUnavailable(f"pyzbar indisponível: {e}") from e
+        self._decode = decode
+        self._symbols = [ZBarSymbol.QRCODE]
+
+    def decode(self, image: Image.Image) -> Optional[str]:
+        decoded_objects = self._decode(image, symbols=self._symbols)
+        if decoded_objects:
+            return decoded_objects[0].data.decode('utf-8')
+        return None
+
+
+class OpenCVDecoder(DecoderBackend):
+    """Leitura com cv2.QRCodeDetector (pacote opencv-python-headless)."""
+
+    name = "opencv"
+
+    def __init__(self):
+        try:
+            import cv2
+            import numpy
+        except ImportError as e:
+            raise DecoderUnavailable(f"OpenCV indisponível: {e}") from e
+        self._cv2 = cv2
+        self._numpy = numpy
+        # QRCodeDetector não é seguro entre threads; um por thread
+        self._local = threading.local()
+
+    def decode(self, image: Image.Image) -> Optional[str]:
+        detector = getattr(self._local, "detector", None)
+        if detector is None:
+            detector = self._local.detector = self._cv2.QRCodeDetector()
+        pixels = self._numpy.asarray(image.convert("L"))
+        text, _, _ = detector.detectAndDecode(pixels)
+        return text or None
+
+
+class ZxingDecoder(DecoderBackend):
+    """Leitura com zxing-cpp (pacote zxing-cpp)."""
+
+    name = "zxing"
+
+    def __init__(self):
+        try:
+            import zxingcpp
+        except ImportError as e:
+            raise DecoderUnavailable(f"zxing-cpp indisponível: {e}") from e
+        self._zxingcpp = zxingcpp
+
+    def decode(self, image: Image.Image) -> Optional[str]:
+        results = self._zxingcpp.read_barcodes(
+            image.convert("L"), formats=self._zxingcpp.BarcodeFormat.QRCode
+        )
+        return results[0].text if results else None
+
+
+BACKENDS = {
+    PyzbarDecoder.name: PyzbarDecoder,
+    OpenCVDecoder.name: OpenCVDecoder,
+    ZxingDecoder.name: ZxingDecoder,
+}
+
+
+def load_backend(name: str) -> DecoderBackend:
+    """
+    Instancia um backend pelo nome.
+
+    Raises:
+        ValueError: Se o nome não for conhecido
+        DecoderUnavailable: Se a biblioteca não estiver instalada
+    """
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Backend de leitura desconhecido: '{name}' (opções: {', '.join(BACKENDS)})"
+        )
+    return BACKENDS[name]()
+
+
+def available_backends(names: Iterable[str] = BACKENDS) -> List[DecoderBackend]:
+    """Instancia os backends cujas bibliotecas estão instaladas."""
+    backends = []
+    for name in names:
+        try:
+            backends.append(load_backend(name))
+        except DecoderUnavailable:
+            continue
+    return backends
+
+
+class DecoderChain:
+    """
+    Tenta os backends em ordem e devolve o primeiro resultado.
+
+    Attributes:
+        backends: Backends disponíveis, na ordem configurada
+        skipped: Backends configurados cujas bibliotecas não estão instaladas
+        hits: Leituras bem-sucedidas por backend
+    """
+
+    def __init__(self, names: Sequence[str]):
+        self.backends: List[DecoderBackend] = []
+        self.skipped: Dict[str, str] = {}
+        for name in names:
+            try:
+                self.backends.append(load_backend(name))
+            except DecoderUnavailable as e:
+                self.skipped[name] = str(e)
+        if not self.backends:
+            raise DecoderUnavailable(
+                f"Nenhum backend de leitura disponível entre: {', '.join(names)}"
+            )
+        self.hits: Dict[str, int] = {backend.name: 0 for backend in self.backends}
+
+    @property
+    def names(self) -> List[str]:
+        return [backend.name for backend in self.backends]
+
+    def decode(self, image: Image.Image) -> Optional[str]:
+        """
+        Lê o QR Code da imagem.
+
+        Um backend que falha com exceção é tratado como leitura sem resultado
+        e o próximo da cadeia é tentado.
+
+        Args:
+            image: Imagem PIL
+
+        Returns:
+            Texto do QR Code ou None se nenhum backend o encontrar
+        """
+        for backend in self.backends:
+            try:
+                text = backend.decode(image)
+            except Exception as e:
+                print(f"Erro ao ler QR Code com {backend.name}: {e}")
+                continue
+            if text is not None:
+                self.hits[backend.name] += 1
+                return text
+        return None
+
+
+_decoder_chain: Optional[DecoderChain] = None
+
+
+def get_decoder_chain() -> DecoderChain:
+    """Retorna a cadeia configurada em `EASYQR_DECODERS`, criada no primeiro uso."""
+    global _decoder_chain
+    if _decoder_chain is None:
+        _decoder_chain = DecoderChain(config.DECODER_BACKENDS)
+    return _decoder_chain
+
+
+class BackendMeasurement(NamedTuple):
+    """Resultado de um backend sobre o conjunto: acerto e latência por imagem."""
+
+    name: str
+    successes: List[bool]
+    latencies: List[float]
+
+    @property
+    def success_rate(self) -> float:
+        return sum(self.successes) / len(self.successes) if self.successes else 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return sum(self.latencies) / len(self.latencies) * 1000 if self.latencies else 0.0
+
+
+class ChainEstimate(NamedTuple):
+    """Desempenho estimado de uma ordem de backends."""
+
+    names: Tuple[str, ...]
+    success_rate: float
+    mean_ms: float
+
+
+def evaluate(
+    backends: Sequence[DecoderBackend],
+    corpus: Sequence[Tuple[bytes, Optional[str]]],
+) -> List[BackendMeasurement]:
+    """
+    Mede cada backend sobre o conjunto de imagens.
+
+    Args:
+        backends: Backends a medir
+        corpus: Pares (imagem, texto esperado); com esperado None, qualquer
+            leitura conta como acerto
+
+    Returns:
+        Uma medição por backend, na ordem recebida
+    """
+    images = [(Image.open(io.BytesIO(data)), expected) for data, expected in corpus]
+    for image, _ in images:
+        image.load()
+
+    measurements = []
+    for backend in backends:
+        successes, latencies = [], []
+        for image, expected in images:
+            start = time.perf_counter()
+            try:
+                text = backend.decode(image)
+            except Exception:
+                text = None
+            latencies.append(time.perf_counter() - start)
+            successes.append(text is not None and (expected is None or text == expected))
+        measurements.append(BackendMeasurement(backend.name, successes, latencies))
+    return measurements
+
+
+def estimate_chain(measurements: Sequence[BackendMeasurement]) -> ChainEstimate:
+    """
+    Estima uma cadeia a partir das medições individuais.
+
+    Cada imagem custa a soma das latências dos backends tentados até o
+    primeiro acerto (ou de todos, se nenhum acertar).
+    """
+    count = len(measurements[0].successes)
+    hits = 0
+    total = 0.0
+    for i in range(count):
+        for measurement in measurements:
+            total += measurement.latencies[i]
+            if measurement.successes[i]:
+                hits += 1
+                break
+    return ChainEstimate(
+        tuple(m.name for m in measurements),
+        hits / count if count else 0.0,
+        total / count * 1000 if count else 0.0,
+    )
+
+
+def recommend_chain(
+    measurements: Sequence[BackendMeasurement],
+    tolerance: float = 0.0,
+) -> ChainEstimate:
+    """
+    Sugere a ordem de backends mais rápida entre as adequadas.
+
+    Avalia todas as ordens de todos os subconjuntos. Adequadas são as que
+    acertam ao menos a melhor taxa possível menos `tolerance`; entre elas,
+    vence a de menor latência média e, no empate, a com menos backends.
+
+    Args:
+        measurements: Resultado de `evaluate`
+        tolerance: Perda de taxa de acerto aceitável em troca de velocidade
+
+    Returns:
+        Estimativa da cadeia recomendada
+    """
+    if not measurements:
+        raise ValueError("Nenhuma medição para recomendar")
+
+    chains = [
+        estimate_chain(order)
+        for size in range(1, len(measurements) + 1)
+        for order in itertools.permutations(measurements, size)
+    ]
+    best_rate = max(chain.success_rate for chain in chains)
+    adequate = [chain for chain in chains if chain.success_rate >= best_rate - tolerance]
+    return min(adequate, key=lambda chain: (chain.mean_ms, len(chain.names)))
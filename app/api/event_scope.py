@@ -0,0 +1,97 @@
+"""
+Dependencies que direcionam as rotas de convites para a partição do evento.
+
+As rotas de convites são registradas duas vezes: em `/api/v1/...`, sobre o
+banco principal, e em `/api/v1/events/{event_id}/...`, sobre o arquivo do
+evento. As dependencies abaixo decidem o destino pelo `event_id` da URL, de
+modo que as mesmas funções atendem às duas formas.
+"""
+import threading
+from typing import Dict, Iterator, Optional
+
+from fastapi import Depends, HTTPException, Path, Request
+from sqlalchemy.orm import Session
+
+from app.api.events import EventBroadcaster, get_event_broadcaster
+from app.database.batch_writer import BatchWriter, get_batch_writer
+from app.database.database import get_db
+from app.database.partitions import (
+    EventNotFound, EventStateError, PartitionManager, get_partition_manager
+)
+
+READ_METHODS = ("GET", "HEAD")
+
+_broadcasters: Dict[str, EventBroadcaster] = {}
+_broadcasters_lock = threading.Lock()
+
+
+def require_event(
+    event_id: str = Path(..., description="Identificador do evento"),
+    partitions: PartitionManager = Depends(get_partition_manager)
+) -> str:
+    """Dependency das rotas por evento: responde 404 se o evento não existir."""
+    try:
+        partitions.status(event_id)
+    except EventNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return event_id
+
+
+def get_event_id(request: Request) -> Optional[str]:
+    """Dependency para obter o evento da rota (None nas rotas do banco principal)."""
+    return request.path_params.get("event_id")
+
+
+def get_scoped_db(
+    request: Request,
+    db: Session = Depends(get_db),
+    partitions: PartitionManager = Depends(get_partition_manager)
+) -> Iterator[Session]:
+    """
+    Dependency para obter a sessão do banco principal ou da partição do evento.
+
+    Em eventos encerrados, apenas leituras (GET) são aceitas; as demais
+    requisições recebem 409.
+    """
+    event_id = request.path_params.get("event_id")
+    if event_id is None:
+        yield db
+        return
+
+    try:
+        session = partitions.session(event_id, write=request.method not in READ_METHODS)
+    except EventNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except EventStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def get_scoped_batch_writer(
+    request: Request,
+    batch_writer: Optional[BatchWriter] = Depends(get_batch_writer)
+) -> Optional[BatchWriter]:
+    """A escrita em lote grava no banco principal; nas partições, cada convite é gravado direto."""
+    if "event_id" in request.path_params:
+        return None
+    return batch_writer
+
+
+def get_scoped_broadcaster(
+    request: Request,
+    events: EventBroadcaster = Depends(get_event_broadcaster)
+) -> EventBroadcaster:
+    """Cada evento tem seu próprio fluxo de eventos (`/events/{event_id}/events`)."""
+    event_id = request.path_params.get("event_id")
+    if event_id is None:
+        return events
+
+    broadcaster = _broadcasters.get(event_id)
+    if broadcaster is None:
+        with _broadcasters_lock:
+            broadcaster = _broadcasters.setdefault(event_id, EventBroadcaster())
+    return broadcaster
@@ -0,0 +1,140 @@
+"""
+Difusão de eventos em processo para o painel ao vivo (Server-Sent Events).
+
+As rotas publicam cada criação e validação de convite; cada painel conectado
+tem uma fila própria e recebe os eventos sem consultar o banco.
+"""
+import asyncio
+import json
+import threading
+from typing import Any, Dict, Optional, Set
+
+_CLOSED = object()
+
+
+class Subscription:
+    """
+    Fila de eventos de um assinante, ligada ao event loop que a criou.
+
+    Attributes:
+        dropped: Indica que o assinante foi desconectado por não acompanhar os eventos
+    """
+
+    def __init__(self, broadcaster: "EventBroadcaster", max_pending: int):
+        self._broadcaster = broadcaster
+        self._loop = asyncio.get_running_loop()
+        self._queue: "asyncio.Queue" = asyncio.Queue(max_pending)
+        self.dropped = False
+
+    def _deliver(self, event: Any) -> None:
+        """Enfileira o evento; executado no event loop do assinante."""
+        if self.dropped:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Assinante lento: descarta a fila e encerra; o cliente reconecta
+            # e recebe um novo resumo
+            self.dropped = True
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(_CLOSED)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """
+        Aguarda o próximo evento.
+
+        Args:
+            timeout: Tempo máximo de espera em segundos
+
+        Returns:
+            Evento, ou None se o tempo esgotar
+
+        Raises:
+            ConnectionError: Se o assinante foi desconectado por lentidão
+        """
+        try:
+            event = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event is _CLOSED:
+            raise ConnectionError("Assinante desconectado por não acompanhar os eventos")
+        return event
+
+    def close(self) -> None:
+        """Cancela a assinatura."""
+        self._broadcaster._unsubscribe(self)
+
+    async def __aenter__(self) -> "Subscription":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+
+class EventBroadcaster:
+    """
+    Distribui eventos para todos os assinantes.
+
+    `publish` pode ser chamado de qualquer thread; cada evento é entregue no
+    event loop do assinante.
+
+    Attributes:
+        max_pending: Eventos acumulados por assinante antes de desconectá-lo
+        published: Quantidade de eventos publicados
+    """
+
+    def __init__(self, max_pending: int = 256):
+        self.max_pending = max_pending
+        self.published = 0
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> Subscription:
+        """Cria uma assinatura; deve ser chamado dentro de um event loop."""
+        subscription = Subscription(self, self.max_pending)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, event_type: str, data: Dict) -> None:
+        """
+        Envia um evento a todos os assinantes.
+
+        Args:
+            event_type: Tipo do evento ("stats", "checkin", ...)
+            data: Conteúdo serializável em JSON
+        """
+        event = {"type": event_type, "data": data}
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.published += 1
+
+        for subscription in subscribers:
+            try:
+                subscription._loop.call_soon_threadsafe(subscription._deliver, event)
+            except RuntimeError:
+                # Event loop encerrado sem cancelar a assinatura
+                self._unsubscribe(subscription)
+
+
+def format_sse(event_type: str, data: Dict) -> str:
+    """Formata um evento no protocolo Server-Sent Events."""
+    return f"event: {event_type}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+_broadcaster = EventBroadcaster()
+
+
+def get_event_broadcaster() -> EventBroadcaster:
+    """Dependency para obter o difusor de eventos do processo."""
+    return _broadcaster
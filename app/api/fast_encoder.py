@@ -0,0 +1,327 @@
+"""
+Codificador especializado para QR Codes de conteúdo com tamanho fixo.
+
+Todos os convites têm o mesmo formato (UUID, opcionalmente assinado), então
+a versão, os padrões de função, a ordem de posicionamento dos dados e as
+máscaras são sempre os mesmos. Este módulo calcula essas estruturas uma vez
+por (tamanho do conteúdo, nível de correção) e, a cada código, apenas
+posiciona os bits e avalia as oito máscaras de uma só vez com NumPy.
+
+A matriz produzida é idêntica à de `qrcode.QRCode(...).make(fit=True)`,
+inclusive na escolha da máscara.
+"""
+from functools import lru_cache
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+import qrcode
+from qrcode import base, util
+from qrcode.exceptions import DataOverflowError
+
+MASK_COUNT = 8
+
+# Padrões 1:1:3:1:1 precedidos ou seguidos de 4 módulos claros
+_FINDER_LIKE = np.array([
+    [1, 0, 1, 1, 1, 0, 1, 0, 0, 0, 0],
+    [0, 0, 0, 0, 1, 0, 1, 1, 1, 0, 1],
+], dtype=np.uint8)
+
+_GF_EXP = np.array(base.EXP_TABLE[:255] * 2, dtype=np.uint8)
+_GF_LOG = np.array(base.LOG_TABLE, dtype=np.intp)
+
+
+class _RSBlock(NamedTuple):
+    """Bloco Reed-Solomon com a tabela de correção pré-calculada."""
+    offset: int
+    data_count: int
+    # ecc_table[i, b]: contribuição do byte b na posição i para os bytes de correção
+    ecc_table: np.ndarray
+
+
+class _Template(NamedTuple):
+    """Estruturas constantes para uma versão e nível de correção."""
+    size: int
+    bit_limit: int
+    blocks: Tuple[_RSBlock, ...]
+    interleave: np.ndarray     # ordem final dos bytes (dados + correção)
+    test_base: np.ndarray      # padrões de função com informações de formato zeradas
+    final_base: np.ndarray     # padrões de função com formato final, um por máscara
+    rows: np.ndarray           # linhas das posições de dados, na ordem de escrita
+    cols: np.ndarray           # colunas das posições de dados, na ordem de escrita
+    mask_bits: np.ndarray      # máscara em cada posição de dados, uma linha por máscara
+
+
+def _data_chunks(data: str):
+    return list(util.optimal_data_chunks(data, minimum=20))
+
+
+@lru_cache(maxsize=64)
+def _best_version(error_correction: int, signature: Tuple[Tuple[int, int], ...]) -> int:
+    """Versão mínima para os blocos de dados (modo, tamanho) informados."""
+    qr = qrcode.QRCode(version=1, error_correction=error_correction)
+    for mode, length in signature:
+        # O conteúdo não influencia a versão, apenas o modo e o tamanho
+        filler = b"0" * length if mode != util.MODE_8BIT_BYTE else b"\0" * length
+        qr.add_data(util.QRData(filler, mode=mode, check_data=False))
+    return qr.best_fit(start=1)
+
+
+def _blank_modules(version: int, error_correction: int, test: bool, mask_pattern: int):
+    qr = qrcode.QRCode(version=version, error_correction=error_correction)
+    qr.modules_count = version * 4 + 17
+    qr.modules = [[None] * qr.modules_count for _ in range(qr.modules_count)]
+    qr.setup_position_probe_pattern(0, 0)
+    qr.setup_position_probe_pattern(qr.modules_count - 7, 0)
+    qr.setup_position_probe_pattern(0, qr.modules_count - 7)
+    qr.setup_position_adjust_pattern()
+    qr.setup_timing_pattern()
+    qr.setup_type_info(test, mask_pattern)
+    if version >= 7:
+        qr.setup_type_number(test)
+    return qr.modules
+
+
+def _placement_order(modules):
+    """Reproduz a ordem em zigue-zague de `QRCode.map_data`."""
+    count = len(modules)
+    rows, cols = [], []
+    inc = -1
+    row = count - 1
+    for col in range(count - 1, 0, -2):
+        if col <= 6:
+            col -= 1
+        while True:
+            for c in (col, col - 1):
+                if modules[row][c] is None:
+                    rows.append(row)
+                    cols.append(c)
+            row += inc
+            if row < 0 or count <= row:
+                row -= inc
+                inc = -inc
+                break
+    return np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)
+
+
+def _rs_remainder(data: List[int], ec_count: int) -> List[int]:
+    """Bytes de correção de um bloco, como em `qrcode.util.create_bytes`."""
+    rs_poly = base.Polynomial([1], 0)
+    for i in range(ec_count):
+        rs_poly = rs_poly * base.Polynomial([1, base.gexp(i)], 0)
+    mod_poly = base.Polynomial(data, len(rs_poly) - 1) % rs_poly
+    mod_offset = len(mod_poly) - ec_count
+    return [
+        mod_poly[i + mod_offset] if i + mod_offset >= 0 else 0
+        for i in range(ec_count)
+    ]
+
+
+def _ecc_table(data_count: int, ec_count: int) -> np.ndarray:
+    """
+    Tabela de correção linear do bloco.
+
+    O resto da divisão pelo polinômio gerador é linear sobre GF(256): os
+    bytes de correção são o XOR das contribuições de cada byte de dados, e a
+    contribuição do byte b na posição i é b vezes o resto do vetor unitário.
+    """
+    table = np.zeros((data_count, 256, ec_count), dtype=np.uint8)
+    multipliers = np.arange(1, 256)
+    for position in range(data_count):
+        unit = [0] * data_count
+        unit[position] = 1
+        remainder = np.array(_rs_remainder(unit, ec_count), dtype=np.intp)
+        nonzero = remainder != 0
+        logs = _GF_LOG[multipliers][:, np.newaxis] + _GF_LOG[remainder[nonzero]]
+        table[position, 1:, nonzero] = _GF_EXP[logs].T
+    return table
+
+
+def _rs_layout(version: int, error_correction: int):
+    blocks = []
+    offset = 0
+    ec_offset = 0
+    data_positions, ec_positions = [], []
+    for rs_block in base.rs_blocks(version, error_correction):
+        data_count = rs_block.data_count
+        ec_count = rs_block.total_count - data_count
+        blocks.append(_RSBlock(offset, data_count, _ecc_table(data_count, ec_count)))
+        data_positions.append(list(range(offset, offset + data_count)))
+        ec_positions.append(list(range(ec_offset, ec_offset + ec_count)))
+        offset += data_count
+        ec_offset += ec_count
+
+    # Intercala os blocos como em `create_bytes`: dados primeiro, depois correção
+    interleave = []
+    for positions, shift in ((data_positions, 0), (ec_positions, offset)):
+        for i in range(max(len(p) for p in positions)):
+            interleave.extend(p[i] + shift for p in positions if i < len(p))
+    return offset * 8, tuple(blocks), np.array(interleave, dtype=np.intp)
+
+
+class _IntBitBuffer:
+    """Acumulador de bits compatível com `QRData.write`."""
+
+    def __init__(self):
+        self.value = 0
+        self.length = 0
+
+    def put(self, num: int, length: int) -> None:
+        self.value = (self.value << length) | num
+        self.length += length
+
+
+def _codewords(template: _Template, version: int, chunks) -> np.ndarray:
+    """Equivalente a `qrcode.util.create_data` com a correção pré-calculada."""
+    buffer = _IntBitBuffer()
+    for chunk in chunks:
+        buffer.put(chunk.mode, 4)
+        buffer.put(len(chunk), util.length_in_bits(chunk.mode, version))
+        chunk.write(buffer)
+
+    bit_limit = template.bit_limit
+    if buffer.length > bit_limit:
+        raise DataOverflowError(
+            f"Code length overflow. Data size ({buffer.length}) > size available ({bit_limit})"
+        )
+
+    # Terminador (até quatro zeros) e alinhamento em bytes
+    buffer.put(0, min(bit_limit - buffer.length, 4))
+    buffer.put(0, -buffer.length % 8)
+
+    data = bytearray(buffer.value.to_bytes(buffer.length // 8, "big"))
+    for i in range((bit_limit - buffer.length) // 8):
+        data.append(util.PAD0 if i % 2 == 0 else util.PAD1)
+    data = np.frombuffer(bytes(data), dtype=np.uint8)
+
+    ecc = [
+        np.bitwise_xor.reduce(
+            block.ecc_table[
+                np.arange(block.data_count),
+                data[block.offset:block.offset + block.data_count],
+            ],
+            axis=0,
+        )
+        for block in template.blocks
+    ]
+    return np.concatenate([data, *ecc])[template.interleave]
+
+
+@lru_cache(maxsize=16)
+def _template(version: int, error_correction: int) -> _Template:
+    bit_limit, blocks, interleave = _rs_layout(version, error_correction)
+    test_modules = _blank_modules(version, error_correction, True, 0)
+    rows, cols = _placement_order(test_modules)
+
+    def to_array(modules):
+        return np.array([[bool(m) for m in row] for row in modules], dtype=np.uint8)
+
+    final_base = np.stack([
+        to_array(_blank_modules(version, error_correction, False, mask))
+        for mask in range(MASK_COUNT)
+    ])
+    mask_bits = np.array([
+        [util.mask_func(mask)(r, c) for r, c in zip(rows.tolist(), cols.tolist())]
+        for mask in range(MASK_COUNT)
+    ], dtype=np.uint8)
+
+    return _Template(
+        size=len(test_modules),
+        bit_limit=bit_limit,
+        blocks=blocks,
+        interleave=interleave,
+        test_base=to_array(test_modules),
+        final_base=final_base,
+        rows=rows,
+        cols=cols,
+        mask_bits=mask_bits,
+    )
+
+
+def _run_penalty(stack: np.ndarray) -> np.ndarray:
+    """Penalidade N1 (sequências de 5 ou mais módulos iguais) nas linhas."""
+    count, size, _ = stack.shape
+    padded = np.full((count, size, size + 1), 2, dtype=np.uint8)
+    padded[:, :, :size] = stack
+    flat = padded.ravel()
+
+    starts = np.concatenate(([0], np.flatnonzero(flat[1:] != flat[:-1]) + 1))
+    lengths = np.diff(np.append(starts, flat.size))
+    long_runs = lengths >= 5
+    owners = starts[long_runs] // (size * (size + 1))
+    return np.bincount(owners, weights=lengths[long_runs] - 2, minlength=count)
+
+
+def _finder_penalty(stack: np.ndarray) -> np.ndarray:
+    """Penalidade N3 (padrões semelhantes aos localizadores) nas linhas."""
+    windows = np.lib.stride_tricks.sliding_window_view(stack, 11, axis=2)
+    matches = (
+        (windows == _FINDER_LIKE[0]).all(axis=-1)
+        | (windows == _FINDER_LIKE[1]).all(axis=-1)
+    )
+    return matches.sum(axis=(1, 2)) * 40
+
+
+def mask_penalties(stack: np.ndarray) -> list:
+    """
+    Calcula a penalidade de cada matriz candidata, como `qrcode.util.lost_point`.
+
+    Args:
+        stack: Matrizes candidatas empilhadas, formato (máscaras, n, n)
+
+    Returns:
+        Lista com a penalidade de cada máscara
+    """
+    transposed = stack.transpose(0, 2, 1)
+    size = stack.shape[1]
+
+    runs = _run_penalty(stack) + _run_penalty(transposed)
+
+    top_left = stack[:, :-1, :-1]
+    blocks = (
+        (top_left == stack[:, :-1, 1:])
+        & (top_left == stack[:, 1:, :-1])
+        & (top_left == stack[:, 1:, 1:])
+    ).sum(axis=(1, 2)) * 3
+
+    finders = _finder_penalty(stack) + _finder_penalty(transposed)
+
+    penalties = []
+    for index, dark_count in enumerate(stack.sum(axis=(1, 2)).tolist()):
+        percent = float(dark_count) / (size ** 2)
+        balance = int(abs(percent * 100 - 50) / 5) * 10
+        penalties.append(int(runs[index]) + int(blocks[index]) + int(finders[index]) + balance)
+    return penalties
+
+
+def encode(data: str, error_correction: int = qrcode.constants.ERROR_CORRECT_L) -> np.ndarray:
+    """
+    Gera a matriz de módulos de um QR Code.
+
+    Args:
+        data: String com os dados para codificar no QR Code
+        error_correction: Nível de correção de erros
+
+    Returns:
+        Matriz booleana (n x n), True para módulos escuros
+    """
+    chunks = _data_chunks(data)
+    version = _best_version(
+        error_correction, tuple((chunk.mode, len(chunk)) for chunk in chunks)
+    )
+    template = _template(version, error_correction)
+
+    bits = np.unpackbits(_codewords(template, version, chunks))
+    data_bits = np.zeros(len(template.rows), dtype=np.uint8)
+    used = min(len(bits), len(data_bits))
+    data_bits[:used] = bits[:used]
+
+    masked = template.mask_bits ^ data_bits
+
+    candidates = np.repeat(template.test_base[np.newaxis], MASK_COUNT, axis=0)
+    candidates[:, template.rows, template.cols] = masked
+    penalties = mask_penalties(candidates)
+    best = penalties.index(min(penalties))
+
+    modules = template.final_base[best].copy()
+    modules[template.rows, template.cols] = masked[best]
+    return modules.astype(bool)
@@ -0,0 +1,184 @@
+"""
+Serviço para idempotência da criação de convites.
+
+Uma requisição com `Idempotency-Key` primeiro reserva a chave; repetições
+com a mesma chave aguardam a original terminar e recebem o mesmo convite e a
+mesma imagem, sem nova inserção.
+
+O convite é associado à chave na mesma transação em que é inserido: uma
+chave só pode ser liberada enquanto não há convite, então uma falha depois
+da inserção nunca leva a um segundo convite na repetição.
+"""
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.idempotency_key import IdempotencyKey
+
+
+class IdempotencyKeyMismatch(ValueError):
+    """A chave já foi usada com outro corpo de requisição."""
+
+
+class IdempotencyInProgress(Exception):
+    """A requisição original ainda não terminou."""
+
+
+class IdempotencyService:
+    """Serviço para reserva, conclusão e repetição de chaves de idempotência."""
+
+    MAX_KEY_LENGTH = 255
+    # Reserva sem conclusão após esse tempo é considerada abandonada
+    STALE_AFTER = timedelta(seconds=60)
+    POLL_INTERVAL = 0.02
+
+    @staticmethod
+    def fingerprint(body: str) -> str:
+        """Calcula a impressão digital do corpo da requisição."""
+        return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def claim(db: Session, key: str, fingerprint: str, ttl: timedelta) -> Optional[IdempotencyKey]:
+        """
+        Tenta reservar a chave para a requisição atual.
+
+        Args:
+            db: Sessão do banco de dados
+            key: Valor do cabeçalho Idempotency-Key
+            fingerprint: Impressão digital do corpo
+            ttl: Validade da chave
+
+        Returns:
+            None se a chave foi reservada agora, ou o registro existente
+        """
+        while True:
+            now = datetime.utcnow()
+            db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at < now))
+            db.execute(
+                delete(IdempotencyKey)
+                .where(IdempotencyKey.key == key)
+                .where(IdempotencyKey.invite_id.is_(None))
+                .where(IdempotencyKey.created_at < now - IdempotencyService.STALE_AFTER)
+            )
+            db.add(IdempotencyKey(
+                key=key, fingerprint=fingerprint, created_at=now, expires_at=now + ttl
+            ))
+            try:
+                db.commit()
+                return None
+            except IntegrityError:
+                db.rollback()
+            record = db.get(IdempotencyKey, key, populate_existing=True)
+            if record is not None:
+                return record
+            # A chave foi liberada entre a inserção e a leitura: tenta de novo
+
+    @staticmethod
+    async def begin(
+        db: Session,
+        key: str,
+        fingerprint: str,
+        ttl: timedelta,
+        wait_timeout: float,
+    ) -> Optional[IdempotencyKey]:
+        """
+        Reserva a chave ou aguarda a conclusão da requisição original.
+
+        A espera apenas lê o registro, sem disputar a trava de escrita com a
+        criação de convites; a reserva só é tentada de novo se o registro
+        desaparecer (original falhou e liberou a chave).
+
+        Args:
+            db: Sessão do banco de dados
+            key: Valor do cabeçalho Idempotency-Key
+            fingerprint: Impressão digital do corpo
+            ttl: Validade da chave
+            wait_timeout: Tempo máximo de espera pela requisição original, em segundos
+
+        Returns:
+            None se a requisição atual deve criar o convite, ou o registro
+            concluído a ser repetido
+
+        Raises:
+            IdempotencyKeyMismatch: Se a chave foi usada com outro corpo
+            IdempotencyInProgress: Se a original não terminar dentro do prazo
+        """
+        deadline = time.monotonic() + wait_timeout
+        while True:
+            record = await run_in_threadpool(IdempotencyService.claim, db, key, fingerprint, ttl)
+            if record is None:
+                return None
+
+            while record is not None:
+                if record.fingerprint != fingerprint:
+                    raise IdempotencyKeyMismatch(
+                        "Idempotency-Key já utilizada com dados diferentes"
+                    )
+                if record.completed:
+                    return record
+                if time.monotonic() >= deadline:
+                    raise IdempotencyInProgress("Requisição original ainda em andamento")
+                # Encerra a leitura anterior para enxergar o que a original gravou
+                db.rollback()
+                await asyncio.sleep(IdempotencyService.POLL_INTERVAL)
+                record = await run_in_threadpool(
+                    db.get, IdempotencyKey, key, populate_existing=True
+                )
+
+    @staticmethod
+    def complete(db: Session, key: str, invite_id: int, invite_code: str) -> None:
+        """
+        Associa o convite criado à chave, sem commit.
+
+        Deve ser chamado na transação que insere o convite, para que os dois
+        sejam gravados juntos.
+
+        Args:
+            db: Sessão do banco de dados
+            key: Valor do cabeçalho Idempotency-Key
+            invite_id: ID do convite criado
+            invite_code: Código do convite criado
+        """
+        record = db.get(IdempotencyKey, key)
+        record.invite_id = invite_id
+        record.invite_code = invite_code
+
+    @staticmethod
+    def store_image(db: Session, key: str, image: bytes) -> None:
+        """
+        Guarda o PNG retornado para as repetições.
+
+        Uma falha aqui não afeta o convite: sem a imagem guardada, a repetição
+        renderiza de novo o mesmo código.
+
+        Args:
+            db: Sessão do banco de dados
+            key: Valor do cabeçalho Idempotency-Key
+            image: PNG retornado
+        """
+        try:
+            db.execute(
+                update(IdempotencyKey).where(IdempotencyKey.key == key).values(image=image)
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Erro ao guardar imagem da Idempotency-Key: {e}")
+
+    @staticmethod
+    def release(db: Session, key: str) -> None:
+        """Libera a chave após uma falha em que nenhum convite foi criado."""
+        db.rollback()
+        db.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.key == key)
+            .where(IdempotencyKey.invite_id.is_(None))
+        )
+        db.commit()
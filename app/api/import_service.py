@@ -0,0 +1,164 @@
+"""
+Serviço para importação de listas de convidados em CSV.
+"""
+import csv
+import json
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.api.qrcode_service import QRCodeService
+from app.models.change_sequence import allocate_change_seq
+from app.models.invite import Invite
+
+
+class ImportService:
+    """Serviço para criação de convites em lote a partir de CSV."""
+
+    DEFAULT_CHUNK_SIZE = 500
+
+    @staticmethod
+    def read_csv(stream: TextIO, delimiter: str = ",") -> csv.DictReader:
+        """
+        Cria um leitor de CSV que processa o arquivo linha a linha.
+
+        Args:
+            stream: Arquivo de texto aberto
+            delimiter: Separador de colunas
+
+        Returns:
+            Leitor que produz um dicionário por linha
+        """
+        return csv.DictReader(stream, delimiter=delimiter)
+
+    @staticmethod
+    def _rows(reader: csv.DictReader) -> Iterator[Dict]:
+        """Percorre o CSV transformando erros de formato em resultados por linha."""
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield {"row": reader.line_num, "error": f"CSV inválido: {e}"}
+                continue
+            except UnicodeDecodeError:
+                yield {"row": reader.line_num + 1, "error": "Codificação inválida, use UTF-8"}
+                return
+            yield {"row": reader.line_num, "values": row}
+
+    @staticmethod
+    def import_rows(
+        db: Session,
+        reader: csv.DictReader,
+        data_column: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[Dict]:
+        """
+        Cria um convite por linha do CSV, gravando em blocos.
+
+        Sem `data_column`, a linha inteira é gravada em `Invite.data` como JSON.
+
+        Args:
+            db: Sessão do banco de dados
+            reader: Leitor retornado por `read_csv`
+            data_column: Coluna cujo valor vai para `Invite.data`
+            chunk_size: Quantidade de linhas por transação
+
+        Returns:
+            Iterador com um resultado por linha ({"row", "invite_code"} ou
+            {"row", "error"}) e, ao final, {"summary": {"created", "errors"}}
+
+        Raises:
+            ValueError: Se `data_column` não existir no cabeçalho
+        """
+        fieldnames = reader.fieldnames or []
+        if data_column is not None and data_column not in fieldnames:
+            raise ValueError(f"Coluna '{data_column}' não encontrada no cabeçalho")
+
+        return ImportService._with_summary(
+            ImportService._import(db, reader, data_column, chunk_size)
+        )
+
+    @staticmethod
+    def _with_summary(results: Iterator[Dict]) -> Iterator[Dict]:
+        created = 0
+        errors = 0
+        for result in results:
+            if "error" in result:
+                errors += 1
+            else:
+                created += 1
+            yield result
+
+        yield {"summary": {"created": created, "errors": errors}}
+
+    @staticmethod
+    def _import(
+        db: Session,
+        reader: csv.DictReader,
+        data_column: Optional[str],
+        chunk_size: int,
+    ) -> Iterator[Dict]:
+        chunk: List[Dict] = []
+
+        for item in ImportService._rows(reader):
+            if "error" in item:
+                yield item
+                continue
+
+            values = item["values"]
+            if None in values or None in values.values():
+                yield {"row": item["row"], "error": "Número de colunas diferente do cabeçalho"}
+                continue
+
+            if data_column is not None:
+                data = values[data_column]
+            else:
+                data = json.dumps(values, ensure_ascii=False)
+
+            chunk.append({
+                "row": item["row"],
+                "invite_code": QRCodeService.generate_unique_code(),
+                "data": data,
+            })
+            if len(chunk) >= chunk_size:
+                yield from ImportService._flush(db, chunk)
+                chunk = []
+
+        yield from ImportService._flush(db, chunk)
+
+    @staticmethod
+    def _flush(db: Session, chunk: List[Dict]) -> Iterable[Dict]:
+        """Grava um bloco de convites com um único executemany."""
+        if not chunk:
+            return []
+
+        now = datetime.utcnow()
+        try:
+            seq = allocate_change_seq(db, len(chunk))
+            db.execute(insert(Invite.__table__), [
+                {
+                    "invite_code": item["invite_code"],
+                    "data": item["data"],
+                    "created_at": now,
+                    "is_validated": False,
+                    "change_seq": seq + offset,
+                    "event_id": db.info.get("event_id"),
+                }
+                for offset, item in enumerate(chunk)
+            ])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            return [{"row": item["row"], "error": f"Erro ao gravar: {e}"} for item in chunk]
+
+        return [{"row": item["row"], "invite_code": item["invite_code"]} for item in chunk]
+
+    @staticmethod
+    def to_ndjson(results: Iterable[Dict]) -> Iterator[str]:
+        """Serializa os resultados como JSON delimitado por linhas."""
+        for result in results:
+            yield json.dumps(result, ensure_ascii=False) + "\n"
@@ -6,12 +6,19 @@ import uuid
 from typing import Optional
 import qrcode
 from PIL import Image
-from pyzbar.pyzbar import decode
+
+from app.api import fast_encoder
+from app.api.decoders import DecoderChain, get_decoder_chain
+from app.api.rasterizer import rasterize
 
 
 class QRCodeService:
     """Serviço para manipulação de QR Codes."""
 
+    ERROR_CORRECTION = qrcode.constants.ERROR_CORRECT_L
+    BOX_SIZE = 10
+    BORDER = 4
+
     @staticmethod
     def generate_unique_code() -> str:
         """
@@ -33,18 +40,11 @@ class QRCodeService:
         Returns:
             BytesIO contendo a imagem PNG do QR Code
         """
-        # Criar QR Code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
+        # Criar matriz do QR Code (mesma saída de qrcode.QRCode com fit=True)
+        modules = fast_encoder.encode(data, QRCodeService.ERROR_CORRECTION)
 
         # Criar imagem
-        img = qr.make_image(fill_color="black", back_color="white")
+        img = rasterize(modules, QRCodeService.BOX_SIZE, QRCodeService.BORDER)
 
         # Salvar em BytesIO
         img_io = io.BytesIO()
@@ -54,28 +54,29 @@ class QRCodeService:
         return img_io
 
     @staticmethod
-    def read_qrcode(image_bytes: bytes) -> Optional[str]:
+    def read_qrcode(image_bytes: bytes, decoder: Optional[DecoderChain] = None) -> Optional[str]:
         """
         Lê um QR Code de uma imagem.
 
         Args:
             image_bytes: Bytes da imagem contendo o QR Code
+            decoder: Cadeia de backends (padrão: a configurada em EASYQR_DECODERS)
 
         Returns:
             String com os dados decodificados ou None se não encontrar QR Code
+
+        Raises:
+            DecoderUnavailable: Se nenhum backend configurado estiver instalado
         """
+        if decoder is None:
+            decoder = get_decoder_chain()
+
         try:
             # Abrir imagem
             image = Image.open(io.BytesIO(image_bytes))
 
-            # Decodificar QR Code
-            decoded_objects = decode(image)
-
-            if decoded_objects:
-                # Retornar o primeiro QR Code encontrado
-                return decoded_objects[0].data.decode('utf-8')
-
-            return None
+            # Decodificar QR Code com o primeiro backend que encontrar
+            return decoder.decode(image)
         except Exception as e:
             print(f"Erro ao ler QR Code: {e}")
             return None
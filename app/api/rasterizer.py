@@ -0,0 +1,30 @@
+"""
+Rasterização vetorizada da matriz de módulos do QR Code.
+
+Substitui o desenho de um retângulo por módulo do PIL por operações de
+array: a matriz recebe a borda, é ampliada com `repeat` e empacotada
+diretamente no buffer de uma imagem de 1 bit.
+"""
+import numpy as np
+from PIL import Image
+
+
+def rasterize(modules: np.ndarray, box_size: int, border: int) -> Image.Image:
+    """
+    Converte a matriz de módulos em imagem preto e branco.
+
+    Args:
+        modules: Matriz booleana (n x n), True para módulos escuros
+        box_size: Tamanho de cada módulo em pixels
+        border: Largura da borda clara, em módulos
+
+    Returns:
+        Imagem PIL no modo "1", idêntica à gerada por `qrcode` com PilImage
+    """
+    light = np.pad(~np.asarray(modules, dtype=bool), border, constant_values=True)
+    row_pixels = light.repeat(box_size, axis=1)
+    size = row_pixels.shape[1]
+
+    # Empacotar cada linha em bits antes de repetir as linhas (8x menos dados)
+    packed = np.packbits(row_pixels, axis=1).repeat(box_size, axis=0)
+    return Image.frombytes("1", (size, size), packed.tobytes())
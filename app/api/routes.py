@@ -1,80 +1,292 @@
-from datetime import datetime
-from fastapi import APIRouter, Depends, File, UploadFile, HTTPException
-from fastapi.responses import StreamingResponse
+import asyncio
+import csv
+import io
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
+from starlette.datastructures import FormData, UploadFile
+from starlette.formparsers import MultiPartException
 
 from app.database.database import get_db
+from app.database.batch_writer import BatchWriter
+from app.database.scan_log import ScanLog, get_scan_log
+from app.database.partitions import (
+    EventNotFound, EventStateError, PartitionManager, get_partition_manager
+)
 from app.models.invite import Invite
-from app.models.schemas import InviteCreate, InviteResponse, QRCodeReadResponse
+from app.models.scan_event import (
+    SCAN_ALREADY_VALIDATED, SCAN_ERROR, SCAN_INVALID_SIGNATURE, SCAN_NO_QRCODE, SCAN_NOT_FOUND,
+    SCAN_VALIDATED
+)
+from app.models.schemas import (
+    CheckinSeriesResponse, EventCreate, EventResponse, InviteChangesResponse, InviteCreate,
+    InviteResponse, QRCodeReadResponse, ScanEventResponse, StatsSummaryResponse
+)
+from app import config
+from app.api.admission import (
+    AdmissionController, batch_slot, decode_slot, get_batch_admission,
+    get_decode_admission, get_render_admission, render_slot
+)
+from app.api.archive_service import ArchiveService
+from app.api.changes_service import ChangesService
+from app.api.event_scope import (
+    get_event_id, get_scoped_batch_writer, get_scoped_broadcaster, get_scoped_db, require_event
+)
+from app.api.events import EventBroadcaster, format_sse
+from app.api.idempotency_service import (
+    IdempotencyInProgress, IdempotencyKeyMismatch, IdempotencyService
+)
+from app.api.import_service import ImportService
 from app.api.qrcode_service import QRCodeService
+from app.api.scan_service import ScanService
+from app.api.signing import PayloadSigner, get_payload_signer
+from app.api.snapshot_service import SnapshotService
+from app.api.stats_service import StatsService
 
 router = APIRouter()
+# Rotas de convites, registradas também por evento em /events/{event_id}
+invite_router = APIRouter()
 qr_service = QRCodeService()
+snapshot_service = SnapshotService()
+import_service = ImportService()
+archive_service = ArchiveService()
+stats_service = StatsService()
+changes_service = ChangesService()
+scan_service = ScanService()
+idempotency_service = IdempotencyService()
+
+# Intervalo entre comentários de keep-alive no fluxo de eventos
+EVENTS_HEARTBEAT_SECONDS = 15.0
+
+# Documenta o envio do arquivo nas rotas que leem o formulário por conta própria
+UPLOAD_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                }
+            }
+        },
+    }
+}
+
+
+async def read_upload(request: Request, field: str = "file") -> Tuple[FormData, UploadFile]:
+    """
+    Lê o formulário multipart e devolve o arquivo enviado.
+
+    As rotas de upload não declaram `File(...)`: o FastAPI leria o corpo
+    inteiro antes das dependencies, inclusive da vaga de admissão. Chamada
+    dentro da rota, a leitura só acontece depois que a vaga foi concedida,
+    e requisições recusadas com 503 não chegam a receber o arquivo.
 
+    Args:
+        request: Requisição HTTP
+        field: Nome do campo do arquivo
 
-@router.post("/generate-qrcode", response_class=StreamingResponse)
+    Returns:
+        Tupla (formulário, arquivo); o formulário deve ser fechado após o uso
+
+    Raises:
+        HTTPException: 400 se o formulário for inválido, 422 se o arquivo não for enviado
+    """
+    try:
+        form = await request.form()
+    except MultiPartException as e:
+        raise HTTPException(status_code=400, detail=f"Formulário inválido: {e.message}")
+
+    upload = form.get(field)
+    if not isinstance(upload, UploadFile):
+        await form.close()
+        raise HTTPException(status_code=422, detail=f"Campo '{field}' obrigatório")
+    return form, upload
+
+
+@invite_router.post(
+    "/generate-qrcode",
+    response_class=StreamingResponse,
+    dependencies=[Depends(render_slot)]
+)
 async def generate_qrcode(
     invite_data: InviteCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_scoped_db),
+    batch_writer: Optional[BatchWriter] = Depends(get_scoped_batch_writer),
+    signer: Optional[PayloadSigner] = Depends(get_payload_signer),
+    events: EventBroadcaster = Depends(get_scoped_broadcaster),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
+    if idempotency_key is not None:
+        if not idempotency_key or len(idempotency_key) > idempotency_service.MAX_KEY_LENGTH:
+            raise HTTPException(status_code=400, detail="Idempotency-Key inválida")
+        try:
+            record = await idempotency_service.begin(
+                db,
+                idempotency_key,
+                idempotency_service.fingerprint(invite_data.data),
+                timedelta(hours=config.IDEMPOTENCY_TTL_HOURS),
+                config.IDEMPOTENCY_WAIT_MS / 1000.0
+            )
+        except IdempotencyKeyMismatch as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        except IdempotencyInProgress as e:
+            raise HTTPException(
+                status_code=409,
+                detail=str(e),
+                headers={"Retry-After": str(config.RETRY_AFTER_SECONDS)}
+            )
+
+        if record is not None:
+            image = record.image
+            if image is None:
+                # A imagem não chegou a ser guardada; a renderização é determinística
+                payload = record.invite_code
+                if signer is not None:
+                    payload = signer.sign(payload)
+                image = (await run_in_threadpool(qr_service.generate_qrcode, payload)).getvalue()
+            return StreamingResponse(
+                io.BytesIO(image),
+                media_type="image/png",
+                headers={
+                    "Content-Disposition": f"inline; filename=qrcode_{record.invite_code}.png",
+                    "X-Invite-Code": record.invite_code,
+                    "X-Invite-ID": str(record.invite_id),
+                    "Idempotent-Replayed": "true"
+                }
+            )
+
     try:
         invite_code = qr_service.generate_unique_code()
 
-        db_invite = Invite(
-            invite_code=invite_code,
-            data=invite_data.data
-        )
-        db.add(db_invite)
-        db.commit()
-        db.refresh(db_invite)
+        # Com Idempotency-Key, convite e chave precisam da mesma transação,
+        # que a escrita em lote não oferece
+        if batch_writer is not None and idempotency_key is None:
+            invite_id = await asyncio.wrap_future(
+                batch_writer.submit(invite_code, invite_data.data)
+            )
+        else:
+            db_invite = Invite(
+                invite_code=invite_code,
+                data=invite_data.data
+            )
+            db.add(db_invite)
+            if idempotency_key is not None:
+                db.flush()
+                idempotency_service.complete(db, idempotency_key, db_invite.id, invite_code)
+            db.commit()
+            db.refresh(db_invite)
+            invite_id = db_invite.id
+
+        events.publish("stats", {"total": 1, "validated": 0, "pending": 1})
+
+        payload = signer.sign(invite_code) if signer is not None else invite_code
+        qr_image = await run_in_threadpool(qr_service.generate_qrcode, payload)
+
+        if idempotency_key is not None:
+            idempotency_service.store_image(db, idempotency_key, qr_image.getvalue())
 
-        qr_image = qr_service.generate_qrcode(invite_code)
         return StreamingResponse(
             qr_image,
             media_type="image/png",
             headers={
                 "Content-Disposition": f"inline; filename=qrcode_{invite_code}.png",
                 "X-Invite-Code": invite_code,
-                "X-Invite-ID": str(db_invite.id)
+                "X-Invite-ID": str(invite_id)
             }
         )
 
     except Exception as e:
         db.rollback()
+        if idempotency_key is not None:
+            idempotency_service.release(db, idempotency_key)
         raise HTTPException(status_code=500, detail=f"Erro ao gerar QR Code: {str(e)}")
 
 
-@router.post("/read-qrcode", response_model=QRCodeReadResponse)
+@invite_router.post(
+    "/read-qrcode",
+    response_model=QRCodeReadResponse,
+    dependencies=[Depends(decode_slot)],
+    openapi_extra=UPLOAD_BODY
+)
 async def read_qrcode(
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    request: Request,
+    db: Session = Depends(get_scoped_db),
+    signer: Optional[PayloadSigner] = Depends(get_payload_signer),
+    events: EventBroadcaster = Depends(get_scoped_broadcaster),
+    scan_log: Optional[ScanLog] = Depends(get_scan_log),
+    event_id: Optional[str] = Depends(get_event_id),
+    gate_id: Optional[str] = Header(None, alias="X-Gate-ID")
 ):
+    decode_ms = None
+
+    def log_scan(outcome: str, content: Optional[str] = None) -> None:
+        # Apenas acrescenta ao buffer; a gravação acontece fora da requisição
+        if scan_log is not None:
+            scan_log.record(outcome, content, gate_id and gate_id[:64], decode_ms, event_id)
+
+    form, file = await read_upload(request)
+    try:
+        image_bytes = await file.read()
+    finally:
+        await form.close()
+
     try:
         if not file.content_type.startswith("image/"):
             raise HTTPException(status_code=400, detail="Arquivo deve ser uma imagem")
 
-        image_bytes = await file.read()
-        invite_code = qr_service.read_qrcode(image_bytes)
+        start = time.perf_counter()
+        invite_code = await run_in_threadpool(qr_service.read_qrcode, image_bytes)
+        decode_ms = (time.perf_counter() - start) * 1000
 
         if not invite_code:
+            log_scan(SCAN_NO_QRCODE)
             return QRCodeReadResponse(
                 success=False,
                 message="Nenhum QR Code encontrado na imagem"
             )
 
-        db_invite = db.query(Invite).filter(Invite.invite_code == invite_code).first()
+        if signer is not None:
+            content = invite_code
+            invite_code = signer.verify(invite_code)
+            if invite_code is None:
+                log_scan(SCAN_INVALID_SIGNATURE, content)
+                return QRCodeReadResponse(
+                    success=False,
+                    message="QR Code inválido: assinatura não reconhecida"
+                )
+
+        db_invite = archive_service.find_invite(db, invite_code)
 
         if not db_invite:
+            log_scan(SCAN_NOT_FOUND, invite_code)
             return QRCodeReadResponse(
                 success=False,
                 invite_code=invite_code,
                 message="Convite não encontrado no banco de dados"
             )
 
-        if not db_invite.is_validated:
+        if db_invite.is_validated:
+            log_scan(SCAN_ALREADY_VALIDATED, invite_code)
+        else:
             db_invite.is_validated = True
             db_invite.validated_at = datetime.utcnow()
             db.commit()
+            events.publish("checkin", {
+                "invite_code": invite_code,
+                "data": db_invite.data,
+                "validated_at": db_invite.validated_at.isoformat()
+            })
+            events.publish("stats", {"total": 0, "validated": 1, "pending": -1})
+            log_scan(SCAN_VALIDATED, invite_code)
 
         return QRCodeReadResponse(
             success=True,
@@ -87,12 +299,25 @@ async def read_qrcode(
     except HTTPException:
         raise
     except Exception as e:
+        log_scan(SCAN_ERROR)
         raise HTTPException(status_code=500, detail=f"Erro ao ler QR Code: {str(e)}")
 
 
-@router.get("/invites/{invite_code}", response_model=InviteResponse)
-async def get_invite(invite_code: str, db: Session = Depends(get_db)):
-    db_invite = db.query(Invite).filter(Invite.invite_code == invite_code.strip()).first()
+@invite_router.get("/invites/changes", response_model=InviteChangesResponse)
+async def invite_changes(
+    since: int = 0,
+    limit: int = ChangesService.DEFAULT_LIMIT,
+    db: Session = Depends(get_scoped_db)
+):
+    try:
+        return changes_service.changes(db, since, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@invite_router.get("/invites/{invite_code}", response_model=InviteResponse)
+async def get_invite(invite_code: str, db: Session = Depends(get_scoped_db)):
+    db_invite = archive_service.find_invite(db, invite_code.strip())
 
     if not db_invite:
         raise HTTPException(status_code=404, detail="Convite não encontrado")
@@ -100,6 +325,252 @@ async def get_invite(invite_code: str, db: Session = Depends(get_db)):
     return db_invite
 
 
-@router.get("/invites", response_model=list[InviteResponse])
-async def list_invites(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@invite_router.post(
+    "/invites/import",
+    response_class=StreamingResponse,
+    dependencies=[Depends(batch_slot)],
+    openapi_extra=UPLOAD_BODY
+)
+async def import_invites(
+    request: Request,
+    data_column: Optional[str] = None,
+    delimiter: str = ",",
+    db: Session = Depends(get_scoped_db),
+    events: EventBroadcaster = Depends(get_scoped_broadcaster)
+):
+    if len(delimiter) != 1:
+        raise HTTPException(status_code=400, detail="Delimitador deve ter um caractere")
+
+    form, file = await read_upload(request)
+    if file.filename and file.filename.lower().endswith((".xlsx", ".xls")):
+        await form.close()
+        raise HTTPException(
+            status_code=400,
+            detail="Planilhas Excel não são suportadas; exporte a lista como CSV"
+        )
+
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        reader = import_service.read_csv(stream, delimiter)
+        results = import_service.import_rows(db, reader, data_column)
+    except (ValueError, csv.Error) as e:
+        await form.close()
+        raise HTTPException(status_code=400, detail=f"Arquivo inválido: {str(e)}")
+
+    return StreamingResponse(
+        import_service.to_ndjson(_publish_import(results, events)),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(form.close)
+    )
+
+
+def _publish_import(results: Iterator[Dict], events: EventBroadcaster) -> Iterator[Dict]:
+    """Repassa os resultados da importação e publica o total criado ao final."""
+    for result in results:
+        if "summary" in result and result["summary"]["created"]:
+            created = result["summary"]["created"]
+            events.publish("stats", {"total": created, "validated": 0, "pending": created})
+        yield result
+
+
+@invite_router.get("/invites", response_model=list[InviteResponse])
+async def list_invites(
+    skip: int = 0,
+    limit: int = 100,
+    include_archived: bool = False,
+    db: Session = Depends(get_scoped_db)
+):
+    if include_archived:
+        return archive_service.list_invites(db, skip, limit)
     return db.query(Invite).offset(skip).limit(limit).all()
+
+
+@router.post("/archive", dependencies=[Depends(batch_slot)])
+async def archive_invites(
+    older_than_days: int = config.ARCHIVE_RETENTION_DAYS,
+    db: Session = Depends(get_db)
+):
+    try:
+        # Fora do event loop: o arquivamento em blocos pode levar muitos segundos
+        archived = await run_in_threadpool(archive_service.archive, db, older_than_days)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"archived": archived}
+
+
+@invite_router.get("/stats/checkins", response_model=CheckinSeriesResponse)
+async def checkin_series(
+    bucket: str = "minute",
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: Session = Depends(get_scoped_db)
+):
+    try:
+        return stats_service.checkin_series(db, bucket, since, until)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@invite_router.get("/scans", response_model=List[ScanEventResponse])
+async def list_scans(
+    invite_code: Optional[str] = None,
+    outcome: Optional[str] = None,
+    gate_id: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = ScanService.DEFAULT_LIMIT,
+    event_id: Optional[str] = Depends(get_event_id),
+    db: Session = Depends(get_db)
+):
+    # O registro fica no banco principal mesmo nas rotas de um evento
+    try:
+        return scan_service.query(
+            db, event_id, invite_code, outcome, gate_id, since, until, limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@invite_router.get("/stats/summary", response_model=StatsSummaryResponse)
+async def stats_summary(db: Session = Depends(get_scoped_db)):
+    return stats_service.summary(db)
+
+
+@invite_router.get("/events", response_class=StreamingResponse)
+async def event_stream(
+    db: Session = Depends(get_scoped_db),
+    events: EventBroadcaster = Depends(get_scoped_broadcaster)
+):
+    # A assinatura começa antes do resumo para que nenhuma alteração se perca
+    subscription = events.subscribe()
+    try:
+        summary = stats_service.summary(db)
+    except Exception:
+        subscription.close()
+        raise
+    finally:
+        # Libera a conexão; o fluxo pode ficar aberto por horas
+        db.close()
+
+    async def stream():
+        async with subscription:
+            yield "retry: 3000\n\n"
+            yield format_sse("summary", summary)
+            while True:
+                try:
+                    event = await subscription.get(EVENTS_HEARTBEAT_SECONDS)
+                except ConnectionError:
+                    return
+                if event is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield format_sse(event["type"], event["data"])
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(subscription.close)
+    )
+
+
+@router.get("/admission")
+async def admission_stats(
+    decode: AdmissionController = Depends(get_decode_admission),
+    render: AdmissionController = Depends(get_render_admission),
+    batch: AdmissionController = Depends(get_batch_admission)
+):
+    return [controller.stats() for controller in (decode, render, batch)]
+
+
+@invite_router.get("/snapshot", response_class=Response, dependencies=[Depends(batch_slot)])
+async def export_snapshot(db: Session = Depends(get_scoped_db)):
+    # Fora do event loop: com muitos convites a geração leva segundos
+    version, payload = await run_in_threadpool(snapshot_service.build_snapshot, db)
+    return Response(
+        payload,
+        media_type="application/octet-stream",
+        headers={"X-Snapshot-Version": str(version)}
+    )
+
+
+@invite_router.get("/snapshot/delta", response_class=Response)
+async def export_snapshot_delta(since: int = 0, db: Session = Depends(get_scoped_db)):
+    if since < 0:
+        raise HTTPException(status_code=400, detail="Versão inválida")
+
+    version, payload = await run_in_threadpool(snapshot_service.build_delta, db, since)
+    return Response(
+        payload,
+        media_type="application/octet-stream",
+        headers={"X-Snapshot-Version": str(version)}
+    )
+
+
+@router.post("/events", response_model=EventResponse, status_code=201)
+async def create_event(
+    event_data: EventCreate,
+    partitions: PartitionManager = Depends(get_partition_manager)
+):
+    try:
+        return await run_in_threadpool(partitions.create, event_data.id, event_data.name)
+    except EventStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/events/{event_id}", response_model=EventResponse)
+async def get_event(
+    event_id: str,
+    partitions: PartitionManager = Depends(get_partition_manager)
+):
+    try:
+        return partitions.get(event_id)
+    except EventNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+async def _event_transition(partitions: PartitionManager, action: str, event_id: str):
+    try:
+        return await run_in_threadpool(getattr(partitions, action), event_id)
+    except EventNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except EventStateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.post("/events/{event_id}/close", response_model=EventResponse)
+async def close_event(
+    event_id: str,
+    partitions: PartitionManager = Depends(get_partition_manager)
+):
+    return await _event_transition(partitions, "close", event_id)
+
+
+@router.post("/events/{event_id}/open", response_model=EventResponse)
+async def open_event(
+    event_id: str,
+    partitions: PartitionManager = Depends(get_partition_manager)
+):
+    return await _event_transition(partitions, "open", event_id)
+
+
+@router.post(
+    "/events/{event_id}/archive",
+    response_model=EventResponse,
+    dependencies=[Depends(batch_slot)]
+)
+async def archive_event(
+    event_id: str,
+    partitions: PartitionManager = Depends(get_partition_manager)
+):
+    return await _event_transition(partitions, "archive", event_id)
+
+
+router.include_router(invite_router)
+router.include_router(
+    invite_router,
+    prefix="/events/{event_id}",
+    dependencies=[Depends(require_event)]
+)
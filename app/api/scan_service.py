@@ -0,0 +1,71 @@
+"""
+Serviço para consulta do registro de leituras nas portarias.
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.scan_event import SCAN_OUTCOMES, ScanEvent
+
+
+class ScanService:
+    """Serviço para consulta das leituras gravadas pelo ScanLog."""
+
+    DEFAULT_LIMIT = 100
+    MAX_LIMIT = 1000
+
+    @staticmethod
+    def query(
+        db: Session,
+        event_id: Optional[str] = None,
+        invite_code: Optional[str] = None,
+        outcome: Optional[str] = None,
+        gate_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = DEFAULT_LIMIT
+    ) -> List[ScanEvent]:
+        """
+        Lista as leituras mais recentes que atendem aos filtros.
+
+        Leituras ainda no buffer do ScanLog não aparecem até a próxima gravação.
+
+        Args:
+            db: Sessão do banco de dados principal
+            event_id: Evento da rota (None para as leituras do banco principal)
+            invite_code: Conteúdo lido
+            outcome: Resultado da leitura (ver SCAN_OUTCOMES)
+            gate_id: Portaria ou dispositivo
+            since: Início do período (inclusivo)
+            until: Fim do período (exclusivo)
+            limit: Máximo de leituras na resposta
+
+        Returns:
+            Leituras da mais recente para a mais antiga
+
+        Raises:
+            ValueError: Se o resultado for desconhecido ou `limit` estiver fora do intervalo
+        """
+        if outcome is not None and outcome not in SCAN_OUTCOMES:
+            raise ValueError(f"Resultado inválido. Use um de: {', '.join(SCAN_OUTCOMES)}")
+        if not 1 <= limit <= ScanService.MAX_LIMIT:
+            raise ValueError(f"Limite deve estar entre 1 e {ScanService.MAX_LIMIT}")
+
+        query = db.query(ScanEvent)
+        if event_id is None:
+            query = query.filter(ScanEvent.event_id.is_(None))
+        else:
+            query = query.filter(ScanEvent.event_id == event_id)
+        if invite_code is not None:
+            query = query.filter(ScanEvent.invite_code == invite_code)
+        if outcome is not None:
+            query = query.filter(ScanEvent.outcome == outcome)
+        if gate_id is not None:
+            query = query.filter(ScanEvent.gate_id == gate_id)
+        if since is not None:
+            query = query.filter(ScanEvent.scanned_at >= since)
+        if until is not None:
+            query = query.filter(ScanEvent.scanned_at < until)
+
+        return query.order_by(ScanEvent.scanned_at.desc(), ScanEvent.id.desc()).limit(limit).all()
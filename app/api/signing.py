@@ -0,0 +1,133 @@
+"""
+Assinatura HMAC dos códigos codificados nos QR Codes.
+
+O QR Code passa a conter "<código>.<id da chave>.<HMAC truncado>", o que
+permite rejeitar códigos forjados ou ilegíveis sem consultar o banco.
+"""
+import base64
+import hashlib
+import hmac
+import uuid
+from typing import Dict, Optional
+
+from app import config
+
+SEPARATOR = "."
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+class PayloadSigner:
+    """
+    Assina e verifica os conteúdos dos QR Codes.
+
+    Attributes:
+        active_key_id: Chave usada para assinar novos convites
+        accept_unsigned: Aceita códigos sem assinatura (convites antigos)
+        mac_size: Quantidade de bytes do HMAC mantidos no QR Code
+    """
+
+    def __init__(
+        self,
+        keys: Dict[str, bytes],
+        active_key_id: Optional[str] = None,
+        accept_unsigned: bool = True,
+        mac_size: int = 12,
+    ):
+        if not keys:
+            raise ValueError("Nenhuma chave de assinatura configurada")
+        for key_id in keys:
+            if not key_id or SEPARATOR in key_id:
+                raise ValueError(f"Identificador de chave inválido: {key_id!r}")
+
+        self._keys = dict(keys)
+        self.active_key_id = active_key_id or next(iter(keys))
+        if self.active_key_id not in self._keys:
+            raise ValueError(f"Chave ativa desconhecida: {self.active_key_id}")
+        self.accept_unsigned = accept_unsigned
+        self.mac_size = mac_size
+
+    @classmethod
+    def from_string(cls, spec: str, **kwargs) -> "PayloadSigner":
+        """
+        Cria o assinador a partir de "id:segredo,id:segredo".
+
+        A primeira chave da lista é a ativa.
+        """
+        keys = {}
+        for item in spec.split(","):
+            key_id, _, secret = item.strip().partition(":")
+            if not secret:
+                raise ValueError(f"Chave sem segredo: {key_id!r}")
+            keys[key_id] = secret.encode("utf-8")
+        return cls(keys, **kwargs)
+
+    def _mac(self, key_id: str, invite_code: str) -> str:
+        message = f"{key_id}{SEPARATOR}{invite_code}".encode("utf-8")
+        digest = hmac.new(self._keys[key_id], message, hashlib.sha256).digest()
+        return _b64encode(digest[:self.mac_size])
+
+    def sign(self, invite_code: str) -> str:
+        """
+        Gera o conteúdo assinado do QR Code.
+
+        Args:
+            invite_code: Código único do convite
+
+        Returns:
+            String "<código>.<id da chave>.<HMAC>"
+        """
+        key_id = self.active_key_id
+        return SEPARATOR.join([invite_code, key_id, self._mac(key_id, invite_code)])
+
+    def verify(self, payload: str) -> Optional[str]:
+        """
+        Verifica o conteúdo lido de um QR Code.
+
+        Args:
+            payload: String decodificada do QR Code
+
+        Returns:
+            Código do convite, ou None se a assinatura for inválida ou se o
+            código não for assinado e códigos sem assinatura não forem aceitos
+        """
+        parts = payload.strip().split(SEPARATOR)
+
+        if len(parts) == 1:
+            if not self.accept_unsigned:
+                return None
+            try:
+                return str(uuid.UUID(parts[0]))
+            except ValueError:
+                return None
+
+        if len(parts) != 3:
+            return None
+
+        invite_code, key_id, mac = parts
+        if key_id not in self._keys:
+            return None
+        if not hmac.compare_digest(mac.encode("ascii", "replace"),
+                                   self._mac(key_id, invite_code).encode("ascii")):
+            return None
+        return invite_code
+
+
+_payload_signer: Optional[PayloadSigner] = None
+
+
+def get_payload_signer() -> Optional[PayloadSigner]:
+    """
+    Dependency para obter o assinador de QR Codes.
+    Retorna None quando nenhuma chave está configurada.
+    """
+    global _payload_signer
+    if not config.SIGNING_KEYS:
+        return None
+    if _payload_signer is None:
+        _payload_signer = PayloadSigner.from_string(
+            config.SIGNING_KEYS, accept_unsigned=config.ACCEPT_UNSIGNED
+        )
+    return _payload_signer
@@ -0,0 +1,77 @@
+"""
+Serviço para exportação de snapshots de validação offline.
+
+Os snapshots incluem os convites arquivados, que o servidor continua
+aceitando na validação: uma portaria sincronizada depois do arquivamento
+decide como o servidor.
+"""
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import LargeBinary, select, type_coerce, union_all
+from sqlalchemy.orm import Session
+
+from app.models.invite import ArchivedInvite, Invite
+from app.snapshot.format import CODE_SIZE, pack_delta, pack_snapshot
+
+
+def _rows(since: Optional[int] = None):
+    """Código (16 bytes), validação e sequência dos convites ativos e arquivados."""
+    selects = []
+    for model in (Invite, ArchivedInvite):
+        # Lê os 16 bytes armazenados sem convertê-los para string
+        query = select(
+            type_coerce(model.invite_code, LargeBinary).label("code"),
+            model.is_validated,
+            model.change_seq,
+        )
+        if since is not None:
+            query = query.where(model.change_seq > since)
+        selects.append(query)
+    return union_all(*selects).subquery()
+
+
+class SnapshotService:
+    """Serviço para geração de snapshots e deltas dos convites."""
+
+    @staticmethod
+    def _entries(rows: Iterable[Tuple[bytes, bool, int]]) -> Tuple[List[Tuple[bytes, bool]], int]:
+        entries = []
+        version = 0
+        for code, is_validated, change_seq in rows:
+            version = max(version, change_seq or 0)
+            if len(code) == CODE_SIZE:
+                entries.append((code, bool(is_validated)))
+        return entries, version
+
+    @staticmethod
+    def build_snapshot(db: Session) -> Tuple[int, bytes]:
+        """
+        Gera o snapshot de todos os convites.
+
+        Args:
+            db: Sessão do banco de dados
+
+        Returns:
+            Tupla (versão, bytes do snapshot)
+        """
+        rows = db.execute(select(_rows())).all()
+        entries, version = SnapshotService._entries(rows)
+        return version, pack_snapshot(version, entries)
+
+    @staticmethod
+    def build_delta(db: Session, since: int) -> Tuple[int, bytes]:
+        """
+        Gera o delta com os convites criados, validados ou arquivados após uma versão.
+
+        Args:
+            db: Sessão do banco de dados
+            since: Versão já conhecida pelo cliente
+
+        Returns:
+            Tupla (versão resultante, bytes do delta)
+        """
+        changed = _rows(since)
+        rows = db.execute(select(changed).order_by(changed.c.change_seq)).all()
+        entries, version = SnapshotService._entries(rows)
+        version = max(version, since)
+        return version, pack_delta(since, version, entries)
@@ -0,0 +1,133 @@
+"""
+Serviço para séries temporais de validações (check-ins).
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.models.checkin_rollup import CheckinRollup, epoch_minute, rebuild_checkin_rollups
+from app.models.invite import ArchivedInvite, Invite
+
+
+class StatsService:
+    """Serviço para consulta das contagens de check-in por intervalo."""
+
+    # Duração de cada intervalo em minutos e janela padrão em intervalos
+    BUCKETS = {"minute": 1, "hour": 60}
+    DEFAULT_POINTS = {"minute": 60, "hour": 24}
+    MAX_POINTS = 1440
+
+    @staticmethod
+    def _utc(moment: datetime) -> datetime:
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        return moment
+
+    @staticmethod
+    def checkin_series(
+        db: Session,
+        bucket: str = "minute",
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Dict:
+        """
+        Conta os convites validados em cada intervalo de `since` até `until`.
+
+        A consulta lê apenas a tabela de contagens por minuto, nunca os
+        convites, então o custo depende do período e não do total de
+        convites.
+
+        Args:
+            db: Sessão do banco de dados
+            bucket: "minute" ou "hour"
+            since: Início do período (padrão: 60 minutos ou 24 horas antes de `until`)
+            until: Fim do período (padrão: agora)
+
+        Returns:
+            Dicionário com o intervalo, os pontos (inclusive os vazios) e o total
+
+        Raises:
+            ValueError: Se o intervalo for desconhecido ou o período for inválido
+        """
+        if bucket not in StatsService.BUCKETS:
+            raise ValueError(f"Intervalo desconhecido: {bucket}")
+        size = StatsService.BUCKETS[bucket]
+
+        until = StatsService._utc(until) if until else datetime.utcnow()
+        last = epoch_minute(until) // size
+        if since is None:
+            first = last - StatsService.DEFAULT_POINTS[bucket] + 1
+        else:
+            first = epoch_minute(StatsService._utc(since)) // size
+
+        if first > last:
+            raise ValueError("Início do período deve ser anterior ao fim")
+        if last - first + 1 > StatsService.MAX_POINTS:
+            raise ValueError(f"Período excede {StatsService.MAX_POINTS} intervalos")
+
+        index = (CheckinRollup.minute // size).label("bucket")
+        rows = db.execute(
+            select(index, func.sum(CheckinRollup.count))
+            .where(CheckinRollup.minute >= first * size)
+            .where(CheckinRollup.minute < (last + 1) * size)
+            .group_by(index)
+        ).all()
+        counts = {bucket_index: count for bucket_index, count in rows}
+
+        epoch = datetime(1970, 1, 1)
+        points = [
+            {
+                "start": epoch + timedelta(minutes=bucket_index * size),
+                "count": counts.get(bucket_index, 0),
+            }
+            for bucket_index in range(first, last + 1)
+        ]
+        return {
+            "bucket": bucket,
+            "points": points,
+            "total": sum(counts.values()),
+        }
+
+    @staticmethod
+    def summary(db: Session) -> Dict[str, int]:
+        """
+        Conta os convites ativos e arquivados.
+
+        Args:
+            db: Sessão do banco de dados
+
+        Returns:
+            Dicionário com total, validados e pendentes
+        """
+        total = validated = 0
+        for model in (Invite, ArchivedInvite):
+            count, validated_count = db.execute(
+                select(
+                    func.count(),
+                    func.coalesce(func.sum(case((model.is_validated.is_(True), 1), else_=0)), 0)
+                ).select_from(model)
+            ).one()
+            total += count
+            validated += validated_count
+        return {"total": total, "validated": validated, "pending": total - validated}
+
+    @staticmethod
+    def backfill(db: Session) -> int:
+        """
+        Recalcula as contagens a partir dos convites já validados.
+
+        Args:
+            db: Sessão do banco de dados
+
+        Returns:
+            Quantidade de minutos com validações
+        """
+        try:
+            minutes = rebuild_checkin_rollups(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return minutes
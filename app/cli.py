@@ -0,0 +1,125 @@
+"""
+Comandos de linha de comando do EasyQR.
+
+Uso:
+    python -m app.cli import-csv convidados.csv [--data-column nome] [--delimiter ";"]
+    python -m app.cli archive [--older-than-days 90]
+    python -m app.cli backfill-checkins
+    python -m app.cli event list|create|open|close|archive [id] [--name "Festival"]
+"""
+import argparse
+import json
+import sys
+
+from app import config
+from app.api.archive_service import ArchiveService
+from app.api.import_service import ImportService
+from app.api.stats_service import StatsService
+from app.database.database import Base, SessionLocal, engine
+from app.database.migrations import run_migrations
+from app.database.partitions import EventNotFound, get_partition_manager
+
+
+def import_csv(args) -> int:
+    """Importa uma lista de convidados em CSV, imprimindo um resultado por linha."""
+    db = SessionLocal()
+    try:
+        with open(args.path, encoding="utf-8-sig", newline="") as stream:
+            reader = ImportService.read_csv(stream, args.delimiter)
+            results = ImportService.import_rows(db, reader, args.data_column, args.chunk_size)
+            for result in results:
+                if "summary" in result or not args.quiet:
+                    print(json.dumps(result, ensure_ascii=False))
+        return 0
+    except (OSError, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+
+def archive(args) -> int:
+    """Move para o arquivo os convites fora da janela de retenção."""
+    db = SessionLocal()
+    try:
+        archived = ArchiveService.archive(db, args.older_than_days, args.chunk_size)
+        print(f"{archived} convites arquivados")
+        return 0
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+
+
+def backfill_checkins(args) -> int:
+    """Recalcula as contagens de check-in por minuto a partir dos convites."""
+    db = SessionLocal()
+    try:
+        minutes = StatsService.backfill(db)
+        print(f"{minutes} minutos com validações")
+        return 0
+    finally:
+        db.close()
+
+
+def manage_event(args) -> int:
+    """Cadastra, lista, encerra, reabre ou arquiva eventos e suas partições."""
+    partitions = get_partition_manager()
+    try:
+        if args.action == "list":
+            for event in partitions.list():
+                print(f"{event.id}\t{event.status}\t{event.name or ''}")
+            return 0
+        if not args.event_id:
+            print("Erro: informe o identificador do evento", file=sys.stderr)
+            return 1
+        if args.action == "create":
+            event = partitions.create(args.event_id, args.name)
+        else:
+            event = getattr(partitions, args.action)(args.event_id)
+        print(f"{event.id}\t{event.status}")
+        return 0
+    except (EventNotFound, ValueError) as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    finally:
+        partitions.dispose()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Comandos do EasyQR")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    importer = subparsers.add_parser("import-csv", help="Importa convidados de um CSV")
+    importer.add_argument("path", help="Arquivo CSV com cabeçalho")
+    importer.add_argument("--data-column", help="Coluna gravada em Invite.data (padrão: linha inteira em JSON)")
+    importer.add_argument("--delimiter", default=",", help="Separador de colunas")
+    importer.add_argument("--chunk-size", type=int, default=ImportService.DEFAULT_CHUNK_SIZE)
+    importer.add_argument("--quiet", action="store_true", help="Imprime apenas o resumo")
+    importer.set_defaults(func=import_csv)
+
+    archiver = subparsers.add_parser("archive", help="Arquiva convites antigos")
+    archiver.add_argument("--older-than-days", type=int, default=config.ARCHIVE_RETENTION_DAYS,
+                          help="Janela de retenção em dias")
+    archiver.add_argument("--chunk-size", type=int, default=ArchiveService.DEFAULT_CHUNK_SIZE)
+    archiver.set_defaults(func=archive)
+
+    backfill = subparsers.add_parser("backfill-checkins", help="Recalcula as séries de check-in")
+    backfill.set_defaults(func=backfill_checkins)
+
+    events = subparsers.add_parser("event", help="Gerencia eventos com partição própria")
+    events.add_argument("action", choices=["list", "create", "open", "close", "archive"])
+    events.add_argument("event_id", nargs="?", help="Identificador do evento")
+    events.add_argument("--name", help="Nome exibido (create)")
+    events.set_defaults(func=manage_event)
+
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Configurações da aplicação lidas de variáveis de ambiente.
+"""
+import os
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_admission(stage: str, concurrency: int, queue: int, timeout_ms: int):
+    prefix = f"EASYQR_{stage.upper()}"
+    return (
+        int(os.getenv(f"{prefix}_CONCURRENCY", str(concurrency))),
+        int(os.getenv(f"{prefix}_QUEUE", str(queue))),
+        float(os.getenv(f"{prefix}_QUEUE_TIMEOUT_MS", str(timeout_ms))),
+    )
+
+
+# Escrita em lote (group commit) para criação de convites
+BATCH_WRITES_ENABLED = _env_bool("EASYQR_BATCH_WRITES")
+BATCH_MAX_SIZE = int(os.getenv("EASYQR_BATCH_MAX_SIZE", "64"))
+BATCH_MAX_DELAY_MS = float(os.getenv("EASYQR_BATCH_MAX_DELAY_MS", "5"))
+
+# Assinatura HMAC dos códigos nos QR Codes, no formato "id:segredo,id:segredo".
+# A primeira chave assina novos convites; as demais continuam válidas na leitura.
+SIGNING_KEYS = os.getenv("EASYQR_SIGNING_KEYS", "")
+ACCEPT_UNSIGNED = _env_bool("EASYQR_ACCEPT_UNSIGNED", True)
+
+# Convites criados há mais dias que isso são movidos para o arquivo
+ARCHIVE_RETENTION_DAYS = int(os.getenv("EASYQR_ARCHIVE_RETENTION_DAYS", "90"))
+
+# Registro de leituras (auditoria): gravado em lote fora do caminho da requisição.
+# Em uma queda, perdem-se no máximo as leituras dos últimos FLUSH_MS.
+SCAN_LOG_ENABLED = _env_bool("EASYQR_SCAN_LOG", True)
+SCAN_LOG_FLUSH_MS = float(os.getenv("EASYQR_SCAN_LOG_FLUSH_MS", "1000"))
+SCAN_LOG_BATCH_SIZE = int(os.getenv("EASYQR_SCAN_LOG_BATCH_SIZE", "500"))
+SCAN_LOG_MAX_PENDING = int(os.getenv("EASYQR_SCAN_LOG_MAX_PENDING", "10000"))
+
+# Diretório dos arquivos SQLite de cada evento (um por evento)
+EVENTS_DIR = os.getenv("EASYQR_EVENTS_DIR", "./events")
+
+# Idempotency-Key na criação de convites: validade da chave e quanto tempo uma
+# repetição aguarda a conclusão da requisição original
+IDEMPOTENCY_TTL_HOURS = float(os.getenv("EASYQR_IDEMPOTENCY_TTL_HOURS", "24"))
+IDEMPOTENCY_WAIT_MS = float(os.getenv("EASYQR_IDEMPOTENCY_WAIT_MS", "5000"))
+
+# Backends de leitura de QR Codes, em ordem de tentativa (pyzbar, opencv, zxing)
+DECODER_BACKENDS = [
+    name.strip() for name in os.getenv("EASYQR_DECODERS", "pyzbar").split(",") if name.strip()
+]
+
+# Controle de admissão: (execuções simultâneas, tamanho da fila, espera máxima em ms)
+ADMISSION = {
+    "decode": _env_admission("decode", os.cpu_count() or 4, 32, 2000),
+    "render": _env_admission("render", os.cpu_count() or 4, 64, 2000),
+    "batch": _env_admission("batch", 2, 4, 10000),
+}
+RETRY_AFTER_SECONDS = int(os.getenv("EASYQR_RETRY_AFTER_SECONDS", "1"))
@@ -0,0 +1,177 @@
+"""
+Escrita em lote (group commit) para criação de convites.
+
+Requisições concorrentes enfileiram convites e uma única thread de escrita
+grava todos em uma só transação a cada poucos milissegundos ou a cada N
+convites, resolvendo cada requisição com o ID atribuído.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app import config
+from app.database.database import SessionLocal
+from app.models.invite import Invite
+
+_STOP = object()
+
+_PendingInvite = Tuple[str, Optional[str], Future]
+
+
+class BatchWriter:
+    """
+    Agrupa inserções de convites em transações únicas.
+
+    Attributes:
+        max_batch_size: Número máximo de convites por transação
+        max_delay: Tempo máximo (segundos) que um convite espera na fila
+        batches_flushed: Quantidade de transações executadas
+        rows_written: Quantidade de convites gravados
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_batch_size: int = 64,
+        max_delay_ms: float = 5.0,
+    ):
+        self._session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000.0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batches_flushed = 0
+        self.rows_written = 0
+
+    def start(self) -> None:
+        """Inicia a thread de escrita, se ainda não estiver rodando."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="easyqr-batch-writer", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Grava os convites pendentes e encerra a thread de escrita."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def submit(self, invite_code: str, data: Optional[str]) -> Future:
+        """
+        Enfileira um convite para gravação.
+
+        Args:
+            invite_code: Código único do convite
+            data: Informações do convite
+
+        Returns:
+            Future resolvido com o ID do convite após o commit
+        """
+        future: Future = Future()
+        self._queue.put((invite_code, data, future))
+        self.start()
+        return future
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            batch: List[_PendingInvite] = []
+            self._accept(batch, item)
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=max(remaining, 0))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                self._accept(batch, item)
+
+            if batch:
+                try:
+                    self._flush(batch)
+                except Exception as e:
+                    # A thread não pode parar: os próximos convites ficariam sem resposta
+                    print(f"Erro na escrita em lote: {e}")
+
+    @staticmethod
+    def _accept(batch: List[_PendingInvite], item: _PendingInvite) -> None:
+        """Inclui o convite no lote, a menos que a requisição já tenha sido cancelada."""
+        # Depois desta chamada o Future não pode mais ser cancelado
+        if item[2].set_running_or_notify_cancel():
+            batch.append(item)
+
+    def _flush(self, batch: List[_PendingInvite]) -> None:
+        try:
+            ids = self._write(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][2].set_exception(e)
+            else:
+                # Gravar individualmente para que um convite inválido não
+                # derrube os demais do lote
+                for pending in batch:
+                    self._flush([pending])
+            return
+
+        for (_, _, future), invite_id in zip(batch, ids):
+            future.set_result(invite_id)
+
+    def _write(self, batch: List[_PendingInvite]) -> List[int]:
+        db = self._session_factory()
+        try:
+            rows = [Invite(invite_code=code, data=data) for code, data, _ in batch]
+            db.add_all(rows)
+            db.flush()
+            ids = [row.id for row in rows]
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        self.batches_flushed += 1
+        self.rows_written += len(ids)
+        return ids
+
+
+_batch_writer: Optional[BatchWriter] = None
+
+
+def get_batch_writer() -> Optional[BatchWriter]:
+    """
+    Dependency para obter o escritor em lote.
+    Retorna None quando a escrita em lote está desabilitada.
+    """
+    global _batch_writer
+    if not config.BATCH_WRITES_ENABLED:
+        return None
+    if _batch_writer is None:
+        _batch_writer = BatchWriter(
+            max_batch_size=config.BATCH_MAX_SIZE,
+            max_delay_ms=config.BATCH_MAX_DELAY_MS,
+        )
+    return _batch_writer
+
+
+def shutdown_batch_writer() -> None:
+    """Grava convites pendentes antes do encerramento da aplicação."""
+    if _batch_writer is not None:
+        _batch_writer.stop()
@@ -0,0 +1,158 @@
+"""
+Migrações de esquema para bancos SQLite já existentes.
+
+`Base.metadata.create_all` cria apenas tabelas ausentes; as funções abaixo
+atualizam tabelas criadas por versões anteriores da aplicação.
+"""
+from typing import Dict, Optional
+
+from sqlalchemy import LargeBinary, inspect, text
+from sqlalchemy.engine import Engine
+
+# Registro em `change_sequences` que indica que as séries de check-in já foram calculadas
+CHECKIN_ROLLUPS_BACKFILLED = "checkin_rollups_backfilled"
+
+
+def _columns(connection, table: str) -> set:
+    return {column["name"] for column in inspect(connection).get_columns(table)}
+
+
+def add_invite_change_seq(connection) -> None:
+    """Adiciona `invites.change_seq` e numera os convites existentes pelo ID."""
+    if "change_seq" in _columns(connection, "invites"):
+        return
+
+    connection.execute(text("ALTER TABLE invites ADD COLUMN change_seq INTEGER"))
+    connection.execute(text("UPDATE invites SET change_seq = id"))
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_invites_change_seq ON invites (change_seq)"
+    ))
+
+
+def init_change_sequence(connection) -> None:
+    """Garante que o contador de alterações comece após o maior valor em uso."""
+    connection.execute(text(
+        "INSERT OR IGNORE INTO change_sequences (name, value) "
+        "SELECT 'invites', COALESCE(MAX(change_seq), 0) FROM invites"
+    ))
+
+
+def _rebuild_invites(connection, converters: Optional[Dict[str, str]] = None) -> None:
+    """
+    Recria a tabela `invites` a partir do modelo atual, copiando os dados.
+
+    O SQLite não altera o tipo nem as restrições de colunas existentes.
+
+    Args:
+        connection: Conexão dentro da transação da migração
+        converters: Expressão SQL usada na cópia de cada coluna, quando
+            diferente do próprio nome
+    """
+    from app.models.invite import Invite
+
+    converters = converters or {}
+    inspector = inspect(connection)
+    legacy_columns = [c["name"] for c in inspector.get_columns("invites")]
+    for index in inspector.get_indexes("invites"):
+        connection.execute(text(f'DROP INDEX IF EXISTS "{index["name"]}"'))
+
+    connection.execute(text("ALTER TABLE invites RENAME TO invites_legacy"))
+    Invite.__table__.create(connection)
+
+    columns = [name for name in legacy_columns if name in Invite.__table__.c]
+    selected = [converters.get(name, name) for name in columns]
+    connection.execute(text(
+        f"INSERT INTO invites ({', '.join(columns)}) "
+        f"SELECT {', '.join(selected)} FROM invites_legacy"
+    ))
+    connection.execute(text("DROP TABLE invites_legacy"))
+
+
+def convert_invite_code_to_binary(connection) -> None:
+    """Converte `invites.invite_code` de texto (36 caracteres) para UUID binário."""
+    from app.models.types import BinaryUUID
+
+    column = next(
+        c for c in inspect(connection).get_columns("invites") if c["name"] == "invite_code"
+    )
+    if isinstance(column["type"], LargeBinary):
+        return
+
+    connection.connection.driver_connection.create_function(
+        "uuid_to_blob", 1,
+        lambda value: BinaryUUID().process_bind_param(value, None),
+        deterministic=True
+    )
+    _rebuild_invites(connection, {"invite_code": "uuid_to_blob(invite_code)"})
+
+
+def enable_invite_autoincrement(connection) -> None:
+    """
+    Recria `invites` com AUTOINCREMENT.
+
+    Sem ele o SQLite reutiliza o maior ID após uma exclusão, e um convite
+    novo poderia receber o ID de um convite já arquivado.
+    """
+    sql = connection.execute(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'invites'"
+    )).scalar()
+    if "AUTOINCREMENT" in sql.upper():
+        return
+
+    _rebuild_invites(connection)
+
+
+def add_invite_time_indexes(connection) -> None:
+    """Cria os índices de `created_at` e `validated_at` usados pelo arquivamento."""
+    for column in ("created_at", "validated_at"):
+        connection.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_invites_{column} ON invites ({column})"
+        ))
+
+
+def init_checkin_rollups(connection) -> None:
+    """
+    Calcula as contagens de check-in dos convites validados antes das séries existirem.
+
+    Executa uma única vez: a conclusão fica registrada em `change_sequences`,
+    na mesma transação, para que as próximas inicializações não percorram os
+    convites de novo enquanto as séries estiverem vazias.
+    """
+    from app.models.checkin_rollup import rebuild_checkin_rollups
+
+    marked = connection.execute(
+        text("INSERT OR IGNORE INTO change_sequences (name, value) VALUES (:name, 1)"),
+        {"name": CHECKIN_ROLLUPS_BACKFILLED}
+    ).rowcount
+    if marked:
+        rebuild_checkin_rollups(connection)
+
+
+def add_invite_event_id(connection) -> None:
+    """Adiciona `event_id` aos convites ativos e arquivados."""
+    for table in ("invites", "invites_archive"):
+        if "event_id" not in _columns(connection, table):
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN event_id VARCHAR(64)"))
+
+
+MIGRATIONS = [
+    add_invite_change_seq,
+    init_change_sequence,
+    convert_invite_code_to_binary,
+    enable_invite_autoincrement,
+    add_invite_time_indexes,
+    init_checkin_rollups,
+    add_invite_event_id,
+]
+
+
+def run_migrations(engine: Engine) -> None:
+    """
+    Aplica as migrações pendentes.
+
+    Args:
+        engine: Engine do banco de dados, com as tabelas já criadas
+    """
+    with engine.begin() as connection:
+        for migration in MIGRATIONS:
+            migration(connection)
@@ -0,0 +1,372 @@
+"""
+Partições de armazenamento por evento.
+
+Cada evento tem seu próprio arquivo SQLite (`<EASYQR_EVENTS_DIR>/<id>.db`)
+com as mesmas tabelas do banco principal, e portanto sua própria trava de
+escrita: o pico de cadastro de um evento grande não atrasa as validações de
+outro. O registro dos eventos (`Event`) fica no banco principal.
+
+Ciclo de vida: `open` aceita leituras e escritas; `closed` aceita apenas
+leituras; `archived` compacta o arquivo e o move para `archive/`, fora de
+uso até o evento ser reaberto.
+
+O estado pode mudar em outro processo (CLI ou outro worker). As escritas
+sempre consultam o registro; as leituras usam o estado em memória por até
+`status_ttl` segundos. O arquivo de uma partição só é criado no cadastro do
+evento: as conexões abrem em modo `rw`, então um arquivo movido pelo
+arquivamento gera erro em vez de um banco vazio no lugar.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import config
+from app.database.database import Base, SessionLocal
+from app.database.migrations import run_migrations
+from app.models.event import EVENT_ARCHIVED, EVENT_CLOSED, EVENT_OPEN, Event
+
+# Registra as tabelas criadas em cada partição
+import app.models.idempotency_key  # noqa: F401
+import app.models.invite  # noqa: F401
+
+EVENT_ID_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_-]{0,63}$")
+
+
+class EventNotFound(LookupError):
+    """Evento não cadastrado."""
+
+
+class EventStateError(ValueError):
+    """Operação incompatível com o estado do evento."""
+
+
+class Partition:
+    """
+    Arquivo SQLite de um evento.
+
+    Sessões criadas pela partição carregam `info["event_id"]`, usado para
+    preencher `Invite.event_id` nos convites novos.
+    """
+
+    def __init__(self, event_id: str, path: str):
+        self.event_id = event_id
+        self.path = path
+        # mode=rw: o SQLite não cria o arquivo se ele não existir
+        self.engine = create_engine(
+            f"sqlite:///file:{path}?mode=rw&uri=true", connect_args={"check_same_thread": False}
+        )
+        self.session_factory = sessionmaker(
+            autocommit=False, autoflush=False, bind=self.engine, info={"event_id": event_id}
+        )
+
+    def prepare(self) -> None:
+        """Cria as tabelas ausentes e aplica as migrações."""
+        tables = [
+            table for table in Base.metadata.sorted_tables
+            if not table.info.get("main_database_only")
+        ]
+        Base.metadata.create_all(bind=self.engine, tables=tables)
+        run_migrations(self.engine)
+
+    def session(self) -> Session:
+        return self.session_factory()
+
+    def dispose(self) -> None:
+        self.engine.dispose()
+
+
+class PartitionManager:
+    """
+    Abre, encerra e arquiva as partições dos eventos.
+
+    O estado dos eventos é mantido em memória por `status_ttl` segundos,
+    para que as leituras de um evento não consultem o banco principal a cada
+    requisição. Escritas e transições sempre releem o registro.
+
+    Attributes:
+        directory: Diretório dos arquivos das partições
+        archive_directory: Diretório dos arquivos arquivados
+        status_ttl: Validade, em segundos, do estado em memória nas leituras
+    """
+
+    STATUS_TTL = 5.0
+
+    def __init__(
+        self,
+        directory: str,
+        session_factory: Callable[[], Session] = SessionLocal,
+        status_ttl: float = STATUS_TTL,
+    ):
+        self.directory = directory
+        self.archive_directory = os.path.join(directory, "archive")
+        self.status_ttl = status_ttl
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        # event_id -> (estado, instante da consulta ao registro)
+        self._status: Dict[str, Tuple[str, float]] = {}
+        self._partitions: Dict[str, Partition] = {}
+
+    def path(self, event_id: str) -> str:
+        return os.path.join(self.directory, f"{event_id}.db")
+
+    def archived_path(self, event_id: str) -> str:
+        return os.path.join(self.archive_directory, f"{event_id}.db")
+
+    def create(self, event_id: str, name: Optional[str] = None) -> Event:
+        """
+        Cadastra um evento e cria sua partição.
+
+        Args:
+            event_id: Identificador (minúsculas, dígitos, `-` e `_`; até 64 caracteres)
+            name: Nome exibido
+
+        Returns:
+            Evento criado
+
+        Raises:
+            ValueError: Se o identificador for inválido
+            EventStateError: Se o evento já existir
+        """
+        if not EVENT_ID_PATTERN.match(event_id or ""):
+            raise ValueError(
+                "Identificador de evento inválido: use letras minúsculas, dígitos, '-' e '_'"
+            )
+
+        with self._lock:
+            db = self._session_factory()
+            try:
+                if db.get(Event, event_id) is not None:
+                    raise EventStateError(f"Evento '{event_id}' já existe")
+                partition = self._open_partition(event_id, create=True)
+                event = Event(id=event_id, name=name, status=EVENT_OPEN)
+                db.add(event)
+                db.commit()
+                db.refresh(event)
+                db.expunge(event)
+            finally:
+                db.close()
+
+            self._partitions[event_id] = partition
+            self._set_status(event_id, EVENT_OPEN)
+            return event
+
+    def get(self, event_id: str) -> Event:
+        """
+        Consulta um evento no registro.
+
+        Raises:
+            EventNotFound: Se o evento não existir
+        """
+        db = self._session_factory()
+        try:
+            event = db.get(Event, event_id)
+            if event is None:
+                raise EventNotFound(f"Evento '{event_id}' não encontrado")
+            db.expunge(event)
+            return event
+        finally:
+            db.close()
+
+    def list(self) -> List[Event]:
+        """Lista os eventos cadastrados."""
+        db = self._session_factory()
+        try:
+            events = db.query(Event).order_by(Event.created_at).all()
+            for event in events:
+                db.expunge(event)
+            return events
+        finally:
+            db.close()
+
+    def status(self, event_id: str, max_age: Optional[float] = None) -> str:
+        """
+        Retorna o estado do evento.
+
+        Args:
+            event_id: Identificador do evento
+            max_age: Idade máxima, em segundos, do estado em memória (padrão:
+                `status_ttl`; 0 consulta sempre o registro)
+
+        Raises:
+            EventNotFound: Se o evento não existir
+        """
+        if max_age is None:
+            max_age = self.status_ttl
+        cached = self._status.get(event_id)
+        if cached is not None and time.monotonic() - cached[1] < max_age:
+            return cached[0]
+
+        status = self.get(event_id).status
+        with self._lock:
+            self._set_status(event_id, status)
+        return status
+
+    def session(self, event_id: str, write: bool = False) -> Session:
+        """
+        Abre uma sessão na partição do evento.
+
+        Args:
+            event_id: Identificador do evento
+            write: Se a sessão será usada para escritas
+
+        Returns:
+            Sessão ligada ao arquivo do evento
+
+        Raises:
+            EventNotFound: Se o evento não existir
+            EventStateError: Se o evento estiver arquivado, ou encerrado e `write` for True
+        """
+        # Escritas releem o registro: o evento pode ter sido encerrado em outro processo
+        status = self.status(event_id, max_age=0 if write else None)
+        self._check_status(event_id, status, write)
+
+        partition = self._partitions.get(event_id)
+        if partition is None:
+            with self._lock:
+                partition = self._partitions.get(event_id)
+                if partition is None:
+                    # Reconfere sob a trava: um arquivamento concorrente remove a
+                    # partição e move o arquivo
+                    status = self.get(event_id).status
+                    self._set_status(event_id, status)
+                    self._check_status(event_id, status, write)
+                    partition = self._open_partition(event_id)
+                    self._partitions[event_id] = partition
+        return partition.session()
+
+    def close(self, event_id: str) -> Event:
+        """
+        Encerra o evento: os convites continuam legíveis, mas não há novas escritas.
+
+        Raises:
+            EventNotFound: Se o evento não existir
+            EventStateError: Se o evento não estiver aberto
+        """
+        return self._transition(event_id, {EVENT_OPEN}, EVENT_CLOSED)
+
+    def open(self, event_id: str) -> Event:
+        """
+        Reabre um evento encerrado ou arquivado.
+
+        Raises:
+            EventNotFound: Se o evento não existir
+            EventStateError: Se o evento já estiver aberto
+        """
+        return self._transition(event_id, {EVENT_CLOSED, EVENT_ARCHIVED}, EVENT_OPEN)
+
+    def archive(self, event_id: str) -> Event:
+        """
+        Arquiva um evento encerrado: compacta o arquivo e o move para `archive/`.
+
+        Raises:
+            EventNotFound: Se o evento não existir
+            EventStateError: Se o evento não estiver encerrado
+        """
+        return self._transition(event_id, {EVENT_CLOSED}, EVENT_ARCHIVED)
+
+    def dispose(self) -> None:
+        """Fecha as conexões de todas as partições."""
+        with self._lock:
+            for partition in self._partitions.values():
+                partition.dispose()
+            self._partitions.clear()
+
+    def _transition(self, event_id: str, allowed: set, target: str) -> Event:
+        with self._lock:
+            db = self._session_factory()
+            try:
+                event = db.get(Event, event_id)
+                if event is None:
+                    raise EventNotFound(f"Evento '{event_id}' não encontrado")
+                if event.status not in allowed:
+                    raise EventStateError(
+                        f"Evento '{event_id}' está '{event.status}'; operação não permitida"
+                    )
+
+                now = datetime.utcnow()
+                if target == EVENT_ARCHIVED:
+                    self._archive_file(event_id)
+                    event.archived_at = now
+                elif event.status == EVENT_ARCHIVED:
+                    os.replace(self.archived_path(event_id), self.path(event_id))
+                    event.archived_at = None
+
+                if target == EVENT_CLOSED:
+                    event.closed_at = now
+                elif target == EVENT_OPEN:
+                    event.closed_at = None
+                event.status = target
+                db.commit()
+                db.refresh(event)
+                db.expunge(event)
+            finally:
+                db.close()
+
+            self._set_status(event_id, target)
+            return event
+
+    def _archive_file(self, event_id: str) -> None:
+        """Desliga a partição, compacta o arquivo e o move para o arquivo morto."""
+        partition = self._partitions.pop(event_id, None)
+        if partition is not None:
+            partition.dispose()
+
+        connection = sqlite3.connect(self.path(event_id))
+        try:
+            connection.execute("VACUUM")
+        finally:
+            connection.close()
+
+        os.makedirs(self.archive_directory, exist_ok=True)
+        os.replace(self.path(event_id), self.archived_path(event_id))
+
+    def _set_status(self, event_id: str, status: str) -> None:
+        """Atualiza o estado em memória; chamado com `self._lock` adquirida."""
+        self._status[event_id] = (status, time.monotonic())
+        if status == EVENT_ARCHIVED:
+            # Arquivado em outro processo: o arquivo não está mais no lugar
+            partition = self._partitions.pop(event_id, None)
+            if partition is not None:
+                partition.dispose()
+
+    @staticmethod
+    def _check_status(event_id: str, status: str, write: bool) -> None:
+        if status == EVENT_ARCHIVED:
+            raise EventStateError(f"Evento '{event_id}' arquivado; reabra-o para acessar os convites")
+        if write and status == EVENT_CLOSED:
+            raise EventStateError(f"Evento '{event_id}' encerrado; somente leitura")
+
+    def _open_partition(self, event_id: str, create: bool = False) -> Partition:
+        path = self.path(event_id)
+        if create:
+            os.makedirs(self.directory, exist_ok=True)
+            sqlite3.connect(path).close()
+        elif not os.path.exists(path):
+            raise EventStateError(f"Arquivo do evento '{event_id}' não encontrado")
+        partition = Partition(event_id, path)
+        partition.prepare()
+        return partition
+
+
+_partition_manager: Optional[PartitionManager] = None
+
+
+def get_partition_manager() -> PartitionManager:
+    """Dependency para obter o gerenciador das partições por evento."""
+    global _partition_manager
+    if _partition_manager is None:
+        _partition_manager = PartitionManager(config.EVENTS_DIR)
+    return _partition_manager
+
+
+def shutdown_partitions() -> None:
+    """Fecha as conexões das partições (chamado no desligamento da aplicação)."""
+    if _partition_manager is not None:
+        _partition_manager.dispose()
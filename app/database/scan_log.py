@@ -0,0 +1,209 @@
+"""
+Registro de leituras com escrita adiada (write-behind).
+
+`record` apenas acrescenta a leitura a um buffer em memória; uma thread de
+fundo grava o buffer em lote a cada `flush_interval` ou a cada
+`max_batch_size` leituras, com um único executemany por transação.
+
+Perda limitada: em uma queda do processo perdem-se no máximo as leituras
+ainda no buffer, isto é, as dos últimos `flush_interval` segundos (ou menos,
+se o lote encher antes). No encerramento normal o buffer é gravado. Se o
+banco ficar indisponível, o buffer cresce até `max_pending` e as leituras
+excedentes são descartadas e contadas em `dropped`, sem bloquear a validação.
+"""
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app import config
+from app.database.database import SessionLocal
+from app.models.scan_event import ScanEvent
+
+
+class ScanLog:
+    """
+    Buffer de leituras gravado em lote por uma thread de fundo.
+
+    Attributes:
+        max_batch_size: Leituras por transação; ao atingir esse tamanho o buffer é gravado
+        flush_interval: Tempo máximo (segundos) que uma leitura espera no buffer
+        max_pending: Tamanho máximo do buffer
+        events_written: Leituras gravadas
+        batches_flushed: Transações executadas
+        dropped: Leituras descartadas com o buffer cheio
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_batch_size: int = 500,
+        flush_interval_ms: float = 1000.0,
+        max_pending: int = 10000,
+    ):
+        self._session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_pending = max_pending
+        self._buffer: Deque[Dict] = deque()
+        self._condition = threading.Condition()
+        # Serializa as gravações (thread de fundo e flush explícito)
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._write_failed = False
+        self.events_written = 0
+        self.batches_flushed = 0
+        self.dropped = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def start(self) -> None:
+        """Inicia a thread de gravação, se ainda não estiver rodando."""
+        with self._condition:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(
+                    target=self._run, name="easyqr-scan-log", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Grava as leituras pendentes e encerra a thread de gravação."""
+        with self._condition:
+            thread = self._thread
+            self._thread = None
+            self._stopping = True
+            self._condition.notify()
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+        self.flush()
+
+    def record(
+        self,
+        outcome: str,
+        invite_code: Optional[str] = None,
+        gate_id: Optional[str] = None,
+        decode_ms: Optional[float] = None,
+        event_id: Optional[str] = None,
+    ) -> None:
+        """
+        Acrescenta uma leitura ao buffer, sem acessar o banco.
+
+        Args:
+            outcome: Resultado da leitura (ver SCAN_OUTCOMES)
+            invite_code: Conteúdo lido, se houver
+            gate_id: Portaria ou dispositivo
+            decode_ms: Tempo de decodificação em milissegundos
+            event_id: Evento da rota usada
+        """
+        entry = {
+            "invite_code": invite_code,
+            "outcome": outcome,
+            "gate_id": gate_id,
+            "event_id": event_id,
+            "scanned_at": datetime.utcnow(),
+            "decode_ms": decode_ms,
+        }
+        with self._condition:
+            if len(self._buffer) >= self.max_pending:
+                self.dropped += 1
+                return
+            self._buffer.append(entry)
+            if len(self._buffer) >= self.max_batch_size:
+                self._condition.notify()
+            started = self._thread is not None
+        if not started:
+            self.start()
+
+    def flush(self) -> int:
+        """
+        Grava imediatamente todas as leituras do buffer.
+
+        Returns:
+            Quantidade de leituras gravadas
+        """
+        written = 0
+        with self._write_lock:
+            while True:
+                batch = self._take()
+                if not batch:
+                    return written
+                if not self._write(batch):
+                    return written
+                written += len(batch)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                # Após uma falha, espera o intervalo antes de tentar de novo
+                if not self._stopping and (
+                    self._write_failed or len(self._buffer) < self.max_batch_size
+                ):
+                    self._condition.wait(self.flush_interval)
+                if self._stopping:
+                    return
+            self.flush()
+
+    def _take(self) -> List[Dict]:
+        with self._condition:
+            count = min(len(self._buffer), self.max_batch_size)
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def _write(self, batch: List[Dict]) -> bool:
+        db = self._session_factory()
+        try:
+            db.execute(insert(ScanEvent.__table__), batch)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Erro ao gravar registro de leituras: {e}")
+            self._requeue(batch)
+            self._write_failed = True
+            return False
+        finally:
+            db.close()
+
+        self._write_failed = False
+        self.batches_flushed += 1
+        self.events_written += len(batch)
+        return True
+
+    def _requeue(self, batch: List[Dict]) -> None:
+        """Devolve o lote ao início do buffer, respeitando `max_pending`."""
+        with self._condition:
+            room = max(self.max_pending - len(self._buffer), 0)
+            kept = batch[:room]
+            self.dropped += len(batch) - len(kept)
+            self._buffer.extendleft(reversed(kept))
+
+
+_scan_log: Optional[ScanLog] = None
+
+
+def get_scan_log() -> Optional[ScanLog]:
+    """
+    Dependency para obter o registro de leituras.
+    Retorna None quando o registro está desabilitado.
+    """
+    global _scan_log
+    if not config.SCAN_LOG_ENABLED:
+        return None
+    if _scan_log is None:
+        _scan_log = ScanLog(
+            max_batch_size=config.SCAN_LOG_BATCH_SIZE,
+            flush_interval_ms=config.SCAN_LOG_FLUSH_MS,
+            max_pending=config.SCAN_LOG_MAX_PENDING,
+        )
+    return _scan_log
+
+
+def shutdown_scan_log() -> None:
+    """Grava as leituras pendentes antes do encerramento da aplicação."""
+    if _scan_log is not None:
+        _scan_log.stop()
@@ -0,0 +1,60 @@
+"""
+Sequência monotônica de alterações dos convites.
+"""
+from sqlalchemy import Column, Integer, String, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.database.database import Base
+
+INVITES_SEQUENCE = "invites"
+
+
+class ChangeSequence(Base):
+    """
+    Contador usado para versionar alterações de convites.
+
+    Attributes:
+        name: Nome da sequência
+        value: Último valor atribuído
+    """
+    __tablename__ = "change_sequences"
+
+    name = Column(String, primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+
+def allocate_change_seq(db: Session, count: int = 1, name: str = INVITES_SEQUENCE) -> int:
+    """
+    Reserva `count` valores consecutivos da sequência.
+
+    A reserva acontece dentro da transação corrente; como o SQLite mantém o
+    lock de escrita até o commit, a ordem dos commits segue a da sequência.
+
+    Args:
+        db: Sessão do banco de dados
+        count: Quantidade de valores a reservar
+        name: Nome da sequência
+
+    Returns:
+        Primeiro valor do intervalo reservado
+    """
+    result = db.execute(
+        update(ChangeSequence)
+        .where(ChangeSequence.name == name)
+        .values(value=ChangeSequence.value + count)
+    )
+    if result.rowcount == 0:
+        db.execute(insert(ChangeSequence).values(name=name, value=count))
+
+    value = db.execute(
+        select(ChangeSequence.value).where(ChangeSequence.name == name)
+    ).scalar_one()
+    return value - count + 1
+
+
+def current_change_seq(db: Session, name: str = INVITES_SEQUENCE) -> int:
+    """Retorna o último valor atribuído pela sequência (0 se nunca usada)."""
+    value = db.execute(
+        select(ChangeSequence.value).where(ChangeSequence.name == name)
+    ).scalar()
+    return value or 0
@@ -0,0 +1,84 @@
+"""
+Contagem de validações (check-ins) por minuto.
+"""
+import calendar
+from collections import Counter
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy import Column, Integer, cast, delete, func, select, union_all
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.database.database import Base
+
+
+def epoch_minute(moment: datetime) -> int:
+    """Converte uma data UTC sem fuso horário em minutos desde 1970-01-01."""
+    return calendar.timegm(moment.utctimetuple()) // 60
+
+
+class CheckinRollup(Base):
+    """
+    Quantidade de convites validados em cada minuto.
+
+    Attributes:
+        minute: Início do intervalo, em minutos desde 1970-01-01 (UTC)
+        count: Convites validados no intervalo
+    """
+    __tablename__ = "checkin_rollups"
+
+    minute = Column(Integer, primary_key=True, autoincrement=False)
+    count = Column(Integer, nullable=False, default=0)
+
+
+def record_checkins(db: Session, moments: Iterable[datetime]) -> None:
+    """
+    Soma validações aos intervalos correspondentes, na transação corrente.
+
+    Args:
+        db: Sessão do banco de dados
+        moments: Data e hora de cada validação
+    """
+    counts = Counter(epoch_minute(moment) for moment in moments)
+    if not counts:
+        return
+
+    statement = insert(CheckinRollup)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[CheckinRollup.minute],
+            set_={"count": CheckinRollup.count + statement.excluded["count"]}
+        ),
+        [{"minute": minute, "count": count} for minute, count in counts.items()]
+    )
+
+
+def rebuild_checkin_rollups(db) -> int:
+    """
+    Recalcula todas as contagens a partir de `validated_at` dos convites
+    ativos e arquivados.
+
+    Args:
+        db: Sessão ou conexão, dentro de uma transação
+
+    Returns:
+        Quantidade de intervalos gravados
+    """
+    from app.models.invite import ArchivedInvite, Invite
+
+    validated = union_all(*[
+        select(model.validated_at.label("validated_at"))
+        .where(model.is_validated.is_(True), model.validated_at.isnot(None))
+        for model in (Invite, ArchivedInvite)
+    ]).subquery()
+    minute = (cast(func.strftime("%s", validated.c.validated_at), Integer) // 60).label("minute")
+
+    db.execute(delete(CheckinRollup))
+    result = db.execute(
+        CheckinRollup.__table__.insert().from_select(
+            ["minute", "count"],
+            select(minute, func.count()).group_by(minute)
+        )
+    )
+    return result.rowcount
@@ -0,0 +1,39 @@
+"""
+Registro de eventos com armazenamento próprio.
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, String
+
+from app.database.database import Base
+
+EVENT_OPEN = "open"
+EVENT_CLOSED = "closed"
+EVENT_ARCHIVED = "archived"
+
+
+class Event(Base):
+    """
+    Evento cujos convites ficam em um arquivo SQLite separado.
+
+    O registro fica no banco principal; os convites, no arquivo da partição
+    do evento, com trava de escrita própria.
+
+    Attributes:
+        id: Identificador do evento, usado nas rotas e no nome do arquivo
+        name: Nome exibido
+        status: `open` (aceita escritas), `closed` (somente leitura) ou
+            `archived` (arquivo compactado e fora de uso)
+        created_at: Data e hora de criação
+        closed_at: Data e hora do encerramento
+        archived_at: Data e hora do arquivamento
+    """
+    __tablename__ = "events"
+    __table_args__ = {"info": {"main_database_only": True}}
+
+    id = Column(String(64), primary_key=True)
+    name = Column(String, nullable=True)
+    status = Column(String(16), nullable=False, default=EVENT_OPEN)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    closed_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, nullable=True)
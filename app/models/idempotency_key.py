@@ -0,0 +1,40 @@
+"""
+Chaves de idempotência para a criação de convites.
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String
+
+from app.database.database import Base
+from app.models.types import BinaryUUID
+
+
+class IdempotencyKey(Base):
+    """
+    Resultado de uma requisição identificada por `Idempotency-Key`.
+
+    Enquanto a requisição original está em andamento, apenas a chave e a
+    impressão digital do corpo estão preenchidas.
+
+    Attributes:
+        key: Valor do cabeçalho Idempotency-Key
+        fingerprint: SHA-256 do corpo da requisição original
+        invite_id: ID do convite criado
+        invite_code: Código do convite criado
+        image: PNG retornado na requisição original
+        created_at: Data e hora da requisição original
+        expires_at: Data e hora a partir da qual a chave pode ser reutilizada
+    """
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String, primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    invite_id = Column(Integer, nullable=True)
+    invite_code = Column(BinaryUUID, nullable=True)
+    image = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    @property
+    def completed(self) -> bool:
+        return self.invite_id is not None
@@ -2,29 +2,96 @@
 Modelo de dados para convites com QR Code.
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, event, inspect
+from sqlalchemy.orm import Session
 from app.database.database import Base
+from app.models.change_sequence import allocate_change_seq
+from app.models.checkin_rollup import record_checkins
+from app.models.types import BinaryUUID
 
 
-class Invite(Base):
+class InviteColumns:
     """
-    Modelo para armazenar convites únicos com QR Code.
+    Colunas comuns aos convites ativos e arquivados.
 
     Attributes:
         id: Identificador único do convite
-        invite_code: Código único do convite (usado para gerar QR Code)
+        invite_code: Código único do convite (UUID de 16 bytes, exposto como string)
         data: Informações adicionais do convite (JSON string)
         qr_code_path: Caminho onde o QR Code foi salvo (opcional)
         created_at: Data e hora de criação
         is_validated: Indica se o convite já foi validado/usado
         validated_at: Data e hora da validação
+        change_seq: Número de sequência da última alteração (criação, validação ou arquivamento)
+        event_id: Evento dono do convite (None no banco principal)
     """
-    __tablename__ = "invites"
-
     id = Column(Integer, primary_key=True, index=True)
-    invite_code = Column(String, unique=True, index=True, nullable=False)
+    invite_code = Column(BinaryUUID, unique=True, index=True, nullable=False)
     data = Column(String, nullable=True)
     qr_code_path = Column(String, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     is_validated = Column(Boolean, default=False)
-    validated_at = Column(DateTime, nullable=True)
+    validated_at = Column(DateTime, nullable=True, index=True)
+    change_seq = Column(Integer, index=True, nullable=True)
+    event_id = Column(String(64), nullable=True)
+
+
+class Invite(InviteColumns, Base):
+    """
+    Modelo para armazenar convites únicos com QR Code.
+
+    Contém apenas os convites ativos; os antigos são movidos para
+    `ArchivedInvite` mantendo o mesmo ID. O AUTOINCREMENT impede que o
+    SQLite reutilize o ID de um convite arquivado.
+    """
+    __tablename__ = "invites"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+
+class ArchivedInvite(InviteColumns, Base):
+    """Convites movidos para fora da tabela ativa pelo arquivamento."""
+    __tablename__ = "invites_archive"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=False)
+
+
+@event.listens_for(Session, "before_flush")
+def _assign_change_seq(session, flush_context, instances):
+    """Atribui números de sequência aos convites criados ou alterados, ativos ou arquivados."""
+    changed = [obj for obj in session.new if isinstance(obj, Invite)]
+    changed += [
+        obj for obj in session.dirty
+        if isinstance(obj, InviteColumns) and session.is_modified(obj, include_collections=False)
+    ]
+    if not changed:
+        return
+
+    seq = allocate_change_seq(session, len(changed))
+    for offset, invite in enumerate(changed):
+        invite.change_seq = seq + offset
+
+
+@event.listens_for(Session, "before_flush")
+def _assign_event_id(session, flush_context, instances):
+    """Marca os convites criados em uma partição com o evento dela."""
+    event_id = session.info.get("event_id")
+    if event_id is None:
+        return
+
+    for obj in session.new:
+        if isinstance(obj, Invite) and obj.event_id is None:
+            obj.event_id = event_id
+
+
+@event.listens_for(Session, "before_flush")
+def _record_checkins(session, flush_context, instances):
+    """Contabiliza nas séries de check-in os convites que acabaram de ser validados."""
+    moments = []
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, InviteColumns) or not obj.is_validated:
+            continue
+        history = inspect(obj).attrs.is_validated.history
+        if history.added and not any(history.deleted):
+            moments.append(obj.validated_at or datetime.utcnow())
+
+    record_checkins(session, moments)
@@ -0,0 +1,52 @@
+"""
+Registro de leituras de QR Code nas portarias.
+"""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Float, Integer, String
+
+from app.database.database import Base
+
+SCAN_VALIDATED = "validated"
+SCAN_ALREADY_VALIDATED = "already_validated"
+SCAN_NOT_FOUND = "not_found"
+SCAN_NO_QRCODE = "no_qrcode"
+SCAN_INVALID_SIGNATURE = "invalid_signature"
+SCAN_ERROR = "error"
+
+SCAN_OUTCOMES = (
+    SCAN_VALIDATED,
+    SCAN_ALREADY_VALIDATED,
+    SCAN_NOT_FOUND,
+    SCAN_NO_QRCODE,
+    SCAN_INVALID_SIGNATURE,
+    SCAN_ERROR,
+)
+
+
+class ScanEvent(Base):
+    """
+    Uma leitura de QR Code, com qualquer resultado.
+
+    Fica sempre no banco principal, inclusive para eventos com partição
+    própria (identificados por `event_id`).
+
+    Attributes:
+        id: Identificador da leitura
+        invite_code: Conteúdo lido (None se nenhum QR Code foi encontrado)
+        outcome: Resultado (ver SCAN_OUTCOMES)
+        gate_id: Portaria ou dispositivo que enviou a imagem
+        event_id: Evento da rota usada (None no banco principal)
+        scanned_at: Data e hora da leitura
+        decode_ms: Tempo de decodificação da imagem, em milissegundos
+    """
+    __tablename__ = "scan_events"
+    __table_args__ = {"info": {"main_database_only": True}}
+
+    id = Column(Integer, primary_key=True)
+    invite_code = Column(String, nullable=True, index=True)
+    outcome = Column(String(32), nullable=False)
+    gate_id = Column(String(64), nullable=True)
+    event_id = Column(String(64), nullable=True)
+    scanned_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    decode_ms = Column(Float, nullable=True)
@@ -2,7 +2,7 @@
 Schemas Pydantic para validação de dados da API.
 """
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -18,11 +18,22 @@ class InviteResponse(BaseModel):
     data: Optional[str] = None
     created_at: datetime
     is_validated: bool
+    validated_at: Optional[datetime] = None
+    event_id: Optional[str] = None
 
     class Config:
         from_attributes = True
 
 
+class InviteChangesResponse(BaseModel):
+    """Schema para resposta do feed de alterações dos convites."""
+    since: int
+    seq: int = Field(..., description="Sequência a enviar como `since` na próxima consulta")
+    has_more: bool
+    invites: List[InviteResponse]
+    removed: List[int] = Field(..., description="IDs de convites arquivados")
+
+
 class QRCodeReadResponse(BaseModel):
     """Schema para resposta de leitura de QR Code."""
     success: bool
@@ -30,3 +41,56 @@ class QRCodeReadResponse(BaseModel):
     data: Optional[str] = None
     is_validated: bool = False
     message: str
+
+
+class ScanEventResponse(BaseModel):
+    """Schema para uma leitura do registro de auditoria."""
+    id: int
+    invite_code: Optional[str] = None
+    outcome: str
+    gate_id: Optional[str] = None
+    event_id: Optional[str] = None
+    scanned_at: datetime
+    decode_ms: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+
+class CheckinPoint(BaseModel):
+    """Schema para um intervalo da série de check-ins."""
+    start: datetime
+    count: int
+
+
+class CheckinSeriesResponse(BaseModel):
+    """Schema para resposta da série de check-ins."""
+    bucket: str
+    points: list[CheckinPoint]
+    total: int
+
+
+class StatsSummaryResponse(BaseModel):
+    """Schema para resposta do resumo de convites."""
+    total: int
+    validated: int
+    pending: int
+
+
+class EventCreate(BaseModel):
+    """Schema para cadastro de evento."""
+    id: str = Field(..., min_length=1, max_length=64, description="Identificador do evento")
+    name: Optional[str] = Field(None, description="Nome exibido")
+
+
+class EventResponse(BaseModel):
+    """Schema para resposta com os dados de um evento."""
+    id: str
+    name: Optional[str] = None
+    status: str
+    created_at: datetime
+    closed_at: Optional[datetime] = None
+    archived_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,39 @@
+"""
+Tipos de coluna personalizados.
+"""
+import uuid
+from typing import Optional, Union
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+
+class BinaryUUID(TypeDecorator):
+    """
+    UUID armazenado em 16 bytes e exposto como string canônica.
+
+    Valores que não são UUIDs são gravados como bytes UTF-8 (com tamanho
+    diferente de 16), de modo que consultas por códigos inválidos apenas não
+    encontram resultados.
+    """
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def process_bind_param(
+        self, value: Optional[Union[str, uuid.UUID, bytes]], dialect
+    ) -> Optional[bytes]:
+        if value is None or isinstance(value, bytes):
+            return value
+        if isinstance(value, uuid.UUID):
+            return value.bytes
+        try:
+            return uuid.UUID(value).bytes
+        except ValueError:
+            return value.encode("utf-8")
+
+    def process_result_value(self, value: Optional[bytes], dialect) -> Optional[str]:
+        if value is None:
+            return None
+        if len(value) == 16:
+            return str(uuid.UUID(bytes=value))
+        return value.decode("utf-8", errors="replace")
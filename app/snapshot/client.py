@@ -0,0 +1,133 @@
+"""
+Validador offline para dispositivos de portaria.
+
+Mantém em memória os códigos do snapshot ordenados e valida convites por
+busca binária, sem acesso ao servidor. O servidor passa a ser apenas o
+destino da sincronização:
+
+    validator = OfflineValidator.from_snapshot(requests.get(".../snapshot").content)
+    validator.admit(codigo_lido)
+    validator.apply_delta(requests.get(f".../snapshot/delta?since={validator.version}").content)
+
+Depende apenas da biblioteca padrão.
+"""
+import uuid
+from bisect import bisect_left
+from typing import List, Optional
+
+try:
+    from app.snapshot.format import unpack_delta, unpack_snapshot
+except ImportError:  # copiado isoladamente para o dispositivo
+    from format import unpack_delta, unpack_snapshot
+
+ADMITTED = "admitted"
+ALREADY_VALIDATED = "already_validated"
+UNKNOWN = "unknown"
+
+
+def code_to_bytes(invite_code: str) -> Optional[bytes]:
+    """
+    Converte o código textual do convite para os 16 bytes do UUID.
+
+    Em conteúdos assinados ("<código>.<chave>.<HMAC>") apenas o código é
+    considerado; a assinatura é verificada pelo servidor.
+    """
+    try:
+        return uuid.UUID(invite_code.strip().split(".", 1)[0]).bytes
+    except (ValueError, AttributeError):
+        return None
+
+
+class OfflineValidator:
+    """
+    Conjunto de convites válidos mantido em memória.
+
+    Attributes:
+        version: Versão do último snapshot ou delta aplicado
+    """
+
+    def __init__(self, version: int = 0, codes: Optional[List[bytes]] = None,
+                 validated: Optional[bytearray] = None):
+        self.version = version
+        self._codes: List[bytes] = codes or []
+        self._validated = bytearray(len(self._codes))
+        if validated:
+            for index in range(len(self._codes)):
+                self._validated[index] = (validated[index >> 3] >> (index & 7)) & 1
+
+    @classmethod
+    def from_snapshot(cls, data: bytes) -> "OfflineValidator":
+        """Cria o validador a partir dos bytes de um snapshot."""
+        version, codes, validated = unpack_snapshot(data)
+        return cls(version, codes, validated)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def _find(self, code: bytes) -> int:
+        index = bisect_left(self._codes, code)
+        if index < len(self._codes) and self._codes[index] == code:
+            return index
+        return -1
+
+    def apply_delta(self, data: bytes) -> int:
+        """
+        Aplica um delta obtido do servidor.
+
+        Args:
+            data: Bytes do delta
+
+        Returns:
+            Quantidade de convites alterados
+        """
+        since, version, entries = unpack_delta(data)
+        if since > self.version:
+            raise ValueError(
+                f"Delta a partir da versão {since} não pode ser aplicado na versão {self.version}"
+            )
+
+        new_entries = {}
+        for code, validated in entries:
+            index = self._find(code)
+            if index >= 0:
+                # Uma validação local nunca é desfeita pelo servidor
+                self._validated[index] |= validated
+            else:
+                new_entries[code] = validated
+
+        if new_entries:
+            merged = sorted(
+                list(zip(self._codes, self._validated)) + list(new_entries.items())
+            )
+            self._codes = [code for code, _ in merged]
+            self._validated = bytearray(int(validated) for _, validated in merged)
+
+        self.version = max(self.version, version)
+        return len(entries)
+
+    def status(self, invite_code: str) -> str:
+        """Consulta a situação de um convite sem alterá-la."""
+        code = code_to_bytes(invite_code)
+        index = self._find(code) if code is not None else -1
+        if index < 0:
+            return UNKNOWN
+        return ALREADY_VALIDATED if self._validated[index] else ADMITTED
+
+    def admit(self, invite_code: str) -> str:
+        """
+        Valida um convite e o marca como utilizado localmente.
+
+        Args:
+            invite_code: Código lido do QR Code
+
+        Returns:
+            ADMITTED, ALREADY_VALIDATED ou UNKNOWN
+        """
+        code = code_to_bytes(invite_code)
+        index = self._find(code) if code is not None else -1
+        if index < 0:
+            return UNKNOWN
+        if self._validated[index]:
+            return ALREADY_VALIDATED
+        self._validated[index] = 1
+        return ADMITTED
@@ -0,0 +1,154 @@
+"""
+Formato binário dos snapshots de validação offline.
+
+Snapshot (little-endian):
+    magic "EQSN" | formato u8 | 3 bytes reservados | versão u64 | quantidade u32
+    códigos: quantidade x 16 bytes (UUIDs ordenados)
+    bitmap: ceil(quantidade / 8) bytes, bit i = convite i já validado
+    CRC32 u32 de todos os bytes anteriores
+
+Delta (little-endian):
+    magic "EQDL" | formato u8 | 3 bytes reservados | desde u64 | versão u64 | quantidade u32
+    registros: quantidade x (16 bytes do UUID + u8 de flags)
+    CRC32 u32 de todos os bytes anteriores
+
+Este módulo usa apenas a biblioteca padrão para poder ser copiado para os
+dispositivos das portarias junto com `client.py`.
+"""
+import struct
+import zlib
+from typing import Iterable, List, Tuple
+
+FORMAT_VERSION = 1
+CODE_SIZE = 16
+FLAG_VALIDATED = 0x01
+
+_SNAPSHOT_MAGIC = b"EQSN"
+_DELTA_MAGIC = b"EQDL"
+_SNAPSHOT_HEADER = struct.Struct("<4sB3xQI")
+_DELTA_HEADER = struct.Struct("<4sB3xQQI")
+_DELTA_RECORD = struct.Struct("<16sB")
+_CHECKSUM = struct.Struct("<I")
+
+
+class SnapshotFormatError(ValueError):
+    """Snapshot ou delta corrompido ou em formato desconhecido."""
+
+
+def _seal(body: bytes) -> bytes:
+    return body + _CHECKSUM.pack(zlib.crc32(body))
+
+
+def _verify(data: bytes, magic: bytes, header: struct.Struct) -> memoryview:
+    if len(data) < header.size + _CHECKSUM.size:
+        raise SnapshotFormatError("Dados truncados")
+
+    view = memoryview(data)
+    body = view[:-_CHECKSUM.size]
+    (checksum,) = _CHECKSUM.unpack(view[-_CHECKSUM.size:])
+    if zlib.crc32(body) != checksum:
+        raise SnapshotFormatError("Checksum inválido")
+
+    if bytes(body[:4]) != magic:
+        raise SnapshotFormatError("Tipo de arquivo desconhecido")
+    if body[4] != FORMAT_VERSION:
+        raise SnapshotFormatError(f"Versão de formato não suportada: {body[4]}")
+    return body
+
+
+def pack_snapshot(version: int, entries: Iterable[Tuple[bytes, bool]]) -> bytes:
+    """
+    Serializa um snapshot.
+
+    Args:
+        version: Versão (número de sequência) do snapshot
+        entries: Pares (UUID de 16 bytes, validado)
+
+    Returns:
+        Bytes do snapshot
+    """
+    entries = sorted(entries)
+    count = len(entries)
+
+    bitmap = bytearray((count + 7) // 8)
+    for index, (_, validated) in enumerate(entries):
+        if validated:
+            bitmap[index >> 3] |= 1 << (index & 7)
+
+    body = b"".join([
+        _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, FORMAT_VERSION, version, count),
+        b"".join(code for code, _ in entries),
+        bytes(bitmap),
+    ])
+    return _seal(body)
+
+
+def unpack_snapshot(data: bytes) -> Tuple[int, List[bytes], bytearray]:
+    """
+    Lê um snapshot.
+
+    Args:
+        data: Bytes do snapshot
+
+    Returns:
+        Tupla (versão, códigos ordenados, bitmap de validação)
+    """
+    body = _verify(data, _SNAPSHOT_MAGIC, _SNAPSHOT_HEADER)
+    _, _, version, count = _SNAPSHOT_HEADER.unpack(body[:_SNAPSHOT_HEADER.size])
+
+    codes_start = _SNAPSHOT_HEADER.size
+    bitmap_start = codes_start + count * CODE_SIZE
+    if len(body) != bitmap_start + (count + 7) // 8:
+        raise SnapshotFormatError("Tamanho incompatível com a quantidade de códigos")
+
+    codes = [
+        bytes(body[offset:offset + CODE_SIZE])
+        for offset in range(codes_start, bitmap_start, CODE_SIZE)
+    ]
+    return version, codes, bytearray(body[bitmap_start:])
+
+
+def pack_delta(since: int, version: int, entries: Iterable[Tuple[bytes, bool]]) -> bytes:
+    """
+    Serializa as alterações entre duas versões.
+
+    Args:
+        since: Versão a partir da qual as alterações foram coletadas
+        version: Versão resultante após aplicar o delta
+        entries: Pares (UUID de 16 bytes, validado)
+
+    Returns:
+        Bytes do delta
+    """
+    records = [
+        _DELTA_RECORD.pack(code, FLAG_VALIDATED if validated else 0)
+        for code, validated in entries
+    ]
+    body = b"".join([
+        _DELTA_HEADER.pack(_DELTA_MAGIC, FORMAT_VERSION, since, version, len(records)),
+        *records,
+    ])
+    return _seal(body)
+
+
+def unpack_delta(data: bytes) -> Tuple[int, int, List[Tuple[bytes, bool]]]:
+    """
+    Lê um delta.
+
+    Args:
+        data: Bytes do delta
+
+    Returns:
+        Tupla (desde, versão, lista de pares (UUID, validado))
+    """
+    body = _verify(data, _DELTA_MAGIC, _DELTA_HEADER)
+    _, _, since, version, count = _DELTA_HEADER.unpack(body[:_DELTA_HEADER.size])
+
+    if len(body) != _DELTA_HEADER.size + count * _DELTA_RECORD.size:
+        raise SnapshotFormatError("Tamanho incompatível com a quantidade de registros")
+
+    entries = [
+        (code, bool(flags & FLAG_VALIDATED))
+        for code, flags in _DELTA_RECORD.iter_unpack(body[_DELTA_HEADER.size:])
+    ]
+    return since, version, entries
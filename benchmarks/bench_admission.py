@@ -0,0 +1,173 @@
+"""
+Teste de carga da leitura de QR Codes com e sem controle de admissão.
+
+Sobe o servidor em um processo separado e dispara mais leituras simultâneas
+do que a CPU consegue atender. Sem controle, todas entram e a latência de
+todas cresce; com controle, as excedentes recebem 503 rapidamente e o p99
+das atendidas fica limitado pelo tempo de fila.
+
+Uso:
+    python -m benchmarks.bench_admission [--clients 128] [--duration 10]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import httpx
+
+
+def serve(port: int, db_path: str) -> None:
+    """Executa o servidor com um banco temporário (processo filho)."""
+    import uvicorn
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from main import app
+    from app.database.database import Base, get_db
+    from app.database.migrations import run_migrations
+
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    session_factory = sessionmaker(bind=engine)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="error")
+
+
+def start_server(db_path: str, env: dict) -> tuple:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.bench_admission", "--serve", str(port), db_path],
+        env={**os.environ, **env},
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/health").status_code == 200:
+                return process, url
+        except httpx.TransportError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Servidor não iniciou")
+
+
+async def load(url: str, images: list, clients: int, duration: float) -> dict:
+    latencies = []
+    rejected = []
+    errors = 0
+    started = time.monotonic()
+    deadline = started + duration
+
+    async def client_loop(client, offset):
+        nonlocal errors
+        index = offset
+        while time.monotonic() < deadline:
+            files = {"file": ("qrcode.png", images[index % len(images)], "image/png")}
+            index += 1
+            start = time.perf_counter()
+            try:
+                response = await client.post(f"{url}/api/v1/read-qrcode", files=files)
+            except httpx.TransportError:
+                errors += 1
+                continue
+            elapsed = time.perf_counter() - start
+            if response.status_code == 503:
+                rejected.append(elapsed)
+                await asyncio.sleep(float(response.headers.get("Retry-After", "1")) / 10)
+            elif response.status_code == 200:
+                latencies.append(elapsed)
+            else:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        await asyncio.gather(*[client_loop(client, n) for n in range(clients)])
+
+    return {
+        "latencies": sorted(latencies),
+        "rejected": sorted(rejected),
+        "errors": errors,
+        "elapsed": time.monotonic() - started,
+    }
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1000
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--serve":
+        serve(int(sys.argv[2]), sys.argv[3])
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=128)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--queue", type=int, default=(os.cpu_count() or 4) * 2)
+    parser.add_argument("--queue-timeout-ms", type=int, default=500)
+    args = parser.parse_args()
+
+    from app.api.qrcode_service import QRCodeService
+    images = [QRCodeService.generate_qrcode(str(uuid.uuid4())).read() for _ in range(32)]
+
+    scenarios = {
+        "sem controle": {
+            "EASYQR_DECODE_CONCURRENCY": "100000",
+            "EASYQR_DECODE_QUEUE": "0",
+        },
+        "com controle": {
+            "EASYQR_DECODE_CONCURRENCY": str(args.concurrency),
+            "EASYQR_DECODE_QUEUE": str(args.queue),
+            "EASYQR_DECODE_QUEUE_TIMEOUT_MS": str(args.queue_timeout_ms),
+        },
+    }
+
+    print(f"{args.clients} clientes simultâneos por {args.duration:.0f} s")
+    print(f"{'cenário':<14}{'atendidas/s':>12}{'p50':>10}{'p99':>10}{'503':>8}{'503 p99':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, env in scenarios.items():
+            process, url = start_server(os.path.join(tmp, f"{uuid.uuid4().hex}.db"), env)
+            try:
+                result = asyncio.run(load(url, images, args.clients, args.duration))
+            finally:
+                process.terminate()
+                try:
+                    process.wait(10)
+                except subprocess.TimeoutExpired:
+                    # Ainda processando leituras de clientes que desistiram
+                    process.kill()
+                    process.wait()
+
+            latencies, rejected = result["latencies"], result["rejected"]
+            print(
+                f"{name:<14}{len(latencies) / result['elapsed']:>12.0f}"
+                f"{percentile(latencies, 0.50):>8.0f}ms{percentile(latencies, 0.99):>8.0f}ms"
+                f"{len(rejected):>8}{percentile(rejected, 0.99):>8.0f}ms"
+            )
+            if result["errors"]:
+                print(f"  {result['errors']} erros")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark da criação de convites: commit individual vs escrita em lote.
+
+Mede a vazão (convites/s) com 1, 10 e 100 criadores concorrentes.
+
+Uso:
+    python -m benchmarks.bench_batch_writer [--invites 2000]
+"""
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.database import Base
+from app.database.batch_writer import BatchWriter
+from app.models.invite import Invite
+
+
+def _session_factory(path):
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _create_direct(session_factory):
+    db = session_factory()
+    try:
+        db_invite = Invite(invite_code=str(uuid.uuid4()), data="benchmark")
+        db.add(db_invite)
+        db.commit()
+        db.refresh(db_invite)
+        return db_invite.id
+    finally:
+        db.close()
+
+
+def run(mode, creators, invites):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, session_factory = _session_factory(os.path.join(tmp, "bench.db"))
+        writer = BatchWriter(session_factory) if mode == "batch" else None
+
+        def create(_):
+            if writer is not None:
+                return writer.submit(str(uuid.uuid4()), "benchmark").result()
+            return _create_direct(session_factory)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=creators) as pool:
+            ids = list(pool.map(create, range(invites)))
+        elapsed = time.perf_counter() - start
+
+        batches = writer.batches_flushed if writer is not None else len(ids)
+        if writer is not None:
+            writer.stop()
+        engine.dispose()
+        return invites / elapsed, batches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--invites", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'modo':<8}{'criadores':>10}{'convites/s':>14}{'transações':>13}")
+    for creators in (1, 10, 100):
+        for mode in ("direct", "batch"):
+            rate, batches = run(mode, creators, args.invites)
+            print(f"{mode:<8}{creators:>10}{rate:>14.0f}{batches:>13}")
+
+
+if __name__ == "__main__":
+    main()
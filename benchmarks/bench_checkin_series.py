@@ -0,0 +1,108 @@
+"""
+Benchmark da série de entradas por minuto: agregação sobre `invites` vs
+contagens pré-agregadas em `checkin_rollups`.
+
+Simula uma abertura de portões de três horas com a maioria dos convites
+validados e mede o custo de cada atualização do gráfico do dashboard.
+
+Uso:
+    python -m benchmarks.bench_checkin_series [--rows 1000000] [--queries 200]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.api.stats_service import StatsService
+from app.database.database import Base
+from app.database.migrations import run_migrations
+from app.models.checkin_rollup import rebuild_checkin_rollups
+from app.models.invite import Invite  # noqa: F401 (registra as tabelas)
+
+DOORS_OPEN = datetime(2025, 3, 15, 19, 0)
+WINDOW = timedelta(hours=3)
+
+SCAN_QUERY = text(
+    "SELECT CAST(strftime('%s', validated_at) AS INTEGER) / 60, COUNT(*) "
+    "FROM invites WHERE validated_at >= :since AND validated_at < :until GROUP BY 1"
+)
+
+
+def populate(engine, rows):
+    connection = engine.raw_connection()
+    window = WINDOW.total_seconds()
+
+    def generate():
+        for _ in range(rows):
+            created = DOORS_OPEN - timedelta(days=random.randint(1, 60))
+            if random.random() < 0.8:
+                validated_at = DOORS_OPEN + timedelta(seconds=random.random() * window)
+                yield uuid.uuid4().bytes, str(created), 1, str(validated_at)
+            else:
+                yield uuid.uuid4().bytes, str(created), 0, None
+
+    connection.executemany(
+        "INSERT INTO invites (invite_code, data, created_at, is_validated, validated_at) "
+        "VALUES (?, 'benchmark', ?, ?, ?)",
+        generate(),
+    )
+    connection.commit()
+    connection.close()
+
+
+def timed(function, queries):
+    start = time.perf_counter()
+    for _ in range(queries):
+        function()
+    return (time.perf_counter() - start) / queries * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        run_migrations(engine)
+        populate(engine, args.rows)
+
+        start = time.perf_counter()
+        with engine.begin() as connection:
+            rebuild_checkin_rollups(connection)
+        backfill = time.perf_counter() - start
+
+        db = sessionmaker(bind=engine)()
+        until = DOORS_OPEN + timedelta(hours=2)
+        since = until - timedelta(hours=1)
+
+        scan_hour = timed(lambda: db.execute(
+            SCAN_QUERY, {"since": str(since), "until": str(until)}
+        ).all(), args.queries)
+        rollup_hour = timed(lambda: StatsService.checkin_series(
+            db, "minute", since, until
+        ), args.queries)
+        scan_event = timed(lambda: db.execute(
+            SCAN_QUERY, {"since": str(DOORS_OPEN), "until": str(DOORS_OPEN + WINDOW)}
+        ).all(), max(1, args.queries // 20))
+        rollup_event = timed(lambda: StatsService.checkin_series(
+            db, "hour", DOORS_OPEN, DOORS_OPEN + WINDOW
+        ), args.queries)
+        db.close()
+
+    print(f"{args.rows} convites, recálculo completo das contagens em {backfill:.2f} s")
+    print(f"{'consulta':<28}{'invites':>12}{'rollups':>12}")
+    print(f"{'última hora, por minuto':<28}{scan_hour:>10.2f}ms{rollup_hour:>10.2f}ms")
+    print(f"{'evento inteiro, por hora':<28}{scan_event:>10.2f}ms{rollup_event:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
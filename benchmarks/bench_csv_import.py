@@ -0,0 +1,93 @@
+"""
+Benchmark da importação de convidados em CSV.
+
+Compara a importação em blocos com a criação de um convite por commit
+(equivalente a um POST /generate-qrcode por linha, sem a imagem).
+
+Uso:
+    python -m benchmarks.bench_csv_import [--rows 100000] [--chunk-size 500]
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.import_service import ImportService
+from app.api.qrcode_service import QRCodeService
+from app.database.database import Base
+from app.database.migrations import run_migrations
+from app.models.invite import Invite
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as stream:
+        writer = csv.writer(stream)
+        writer.writerow(["nome", "email", "mesa"])
+        for i in range(rows):
+            writer.writerow([f"Convidado {i}", f"convidado{i}@example.com", i % 50])
+
+
+def session_factory(path):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def bench_import(csv_path, db_path, chunk_size):
+    db = session_factory(db_path)()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(csv_path, encoding="utf-8-sig", newline="") as stream:
+        reader = ImportService.read_csv(stream)
+        for result in ImportService.import_rows(db, reader, chunk_size=chunk_size):
+            pass
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.close()
+    return result["summary"]["created"] / elapsed, peak
+
+
+def bench_per_row(csv_path, db_path, rows):
+    db = session_factory(db_path)()
+    start = time.perf_counter()
+    with open(csv_path, encoding="utf-8-sig", newline="") as stream:
+        for index, row in enumerate(csv.DictReader(stream)):
+            if index >= rows:
+                break
+            db.add(Invite(invite_code=QRCodeService.generate_unique_code(), data=row["nome"]))
+            db.commit()
+    elapsed = time.perf_counter() - start
+    db.close()
+    return rows / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=ImportService.DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--per-row-sample", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "convidados.csv")
+        write_csv(csv_path, args.rows)
+
+        rate, peak = bench_import(csv_path, os.path.join(tmp, "import.db"), args.chunk_size)
+        per_row = bench_per_row(
+            csv_path, os.path.join(tmp, "per_row.db"), min(args.per_row_sample, args.rows)
+        )
+
+    print(f"{args.rows} linhas, blocos de {args.chunk_size}")
+    print(f"importação em blocos: {rate:>10.0f} linhas/s (pico de memória {peak / 2**20:.1f} MB)")
+    print(f"um commit por linha:  {per_row:>10.0f} linhas/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark dos backends de leitura de QR Codes e recomendação da cadeia.
+
+Mede latência e taxa de acerto de cada backend instalado (pyzbar, opencv,
+zxing) sobre um conjunto de imagens e sugere o valor de `EASYQR_DECODERS`:
+a ordem mais rápida entre as que leem o máximo de imagens.
+
+Sem `--corpus`, usa imagens geradas: QR Codes limpos e fotos de celular
+simuladas (as mesmas de `bench_load`). Com `--corpus`, usa as imagens do
+diretório (ex.: fotos reais das portarias); qualquer leitura conta como acerto.
+
+Uso:
+    python -m benchmarks.bench_decoders [--corpus DIR] [--images 200] [--tolerance 0.01]
+"""
+import argparse
+import os
+import random
+import uuid
+
+from app.api.decoders import BACKENDS, available_backends, evaluate, recommend_chain
+from app.api.qrcode_service import QRCodeService
+from benchmarks.bench_load import phone_photo
+
+
+def synthetic_corpus(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    corpus = []
+    for n in range(count):
+        code = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        png = QRCodeService.generate_qrcode(code).getvalue()
+        # Um quarto limpo (tela do celular), o resto fotografado (papel impresso)
+        corpus.append((png if n % 4 == 0 else phone_photo(png, rng), code))
+    return corpus
+
+
+def directory_corpus(path: str) -> list:
+    corpus = []
+    for name in sorted(os.listdir(path)):
+        if name.lower().endswith((".png", ".jpg", ".jpeg", ".bmp", ".webp")):
+            with open(os.path.join(path, name), "rb") as f:
+                corpus.append((f.read(), None))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="diretório com imagens (padrão: imagens geradas)")
+    parser.add_argument("--images", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--tolerance", type=float, default=0.0,
+        help="perda de taxa de acerto aceitável em troca de velocidade (ex.: 0.01)"
+    )
+    args = parser.parse_args()
+
+    backends = available_backends()
+    missing = sorted(set(BACKENDS) - {backend.name for backend in backends})
+    if missing:
+        print(f"indisponíveis: {', '.join(missing)}")
+    if not backends:
+        raise SystemExit("Nenhum backend de leitura instalado")
+
+    corpus = directory_corpus(args.corpus) if args.corpus else synthetic_corpus(args.images, args.seed)
+    if not corpus:
+        raise SystemExit("Nenhuma imagem no conjunto")
+    measurements = evaluate(backends, corpus)
+
+    print(f"{len(corpus)} imagens")
+    print(f"{'backend':<10}{'acerto':>9}{'média':>10}{'p95':>10}")
+    for measurement in measurements:
+        latencies = sorted(measurement.latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000
+        print(
+            f"{measurement.name:<10}{measurement.success_rate:>9.1%}"
+            f"{measurement.mean_ms:>8.1f}ms{p95:>8.1f}ms"
+        )
+
+    chain = recommend_chain(measurements, args.tolerance)
+    print(
+        f"\nrecomendado: EASYQR_DECODERS={','.join(chain.names)} "
+        f"(acerto {chain.success_rate:.1%}, média {chain.mean_ms:.1f}ms)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+Gerador de carga ponta a ponta para o tráfego das portarias e do cadastro.
+
+Vários clientes simultâneos executam uma mistura configurável de criação de
+convites, validação por imagem, consulta por código e listagem. As imagens
+validadas simulam fotos de celular: QR Codes de convites reais girados,
+redimensionados, com iluminação irregular, ruído, desfoque e compressão JPEG.
+
+Por padrão a aplicação roda no próprio processo (ASGI, banco temporário);
+com `--url` a carga vai para um servidor já em execução (ex.: `python main.py`).
+
+Relata vazão e latência (p50/p95/p99) por operação e a taxa de sucesso da
+leitura das fotos.
+
+Uso:
+    python -m benchmarks.bench_load [--clients 50] [--duration 10]
+        [--mix create=1,validate=6,lookup=2,list=1] [--url http://127.0.0.1:8000]
+"""
+import argparse
+import asyncio
+import io
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+import numpy as np
+from PIL import Image, ImageFilter
+
+OPERATIONS = ("create", "validate", "lookup", "list")
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Operação desconhecida: {name}")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("A mistura precisa de ao menos um peso positivo")
+    return mix
+
+
+def phone_photo(png: bytes, rng: random.Random) -> bytes:
+    """
+    Simula uma foto de celular do QR Code.
+
+    Args:
+        png: Imagem PNG gerada pela API
+        rng: Gerador aleatório (reprodutível)
+
+    Returns:
+        JPEG com o QR Code girado, redimensionado e ruidoso sobre um fundo
+    """
+    qr = Image.open(io.BytesIO(png)).convert("L")
+    size = int(qr.width * rng.uniform(0.5, 1.3))
+    qr = qr.resize((size, size), Image.BILINEAR)
+
+    angle = rng.uniform(-30, 30)
+    mask = Image.new("L", qr.size, 255).rotate(angle, Image.BILINEAR, expand=True)
+    qr = qr.rotate(angle, Image.BILINEAR, expand=True)
+
+    width = qr.width + rng.randint(60, 400)
+    height = qr.height + rng.randint(60, 400)
+    photo = Image.new("L", (width, height), rng.randint(120, 200))
+    photo.paste(qr, (rng.randint(0, width - qr.width), rng.randint(0, height - qr.height)), mask)
+
+    # Iluminação irregular (gradiente), ruído do sensor e foco imperfeito
+    pixels = np.asarray(photo, dtype=np.float32)
+    ys, xs = np.mgrid[0:height, 0:width]
+    gx, gy = rng.uniform(-0.4, 0.4), rng.uniform(-0.4, 0.4)
+    lighting = 1.0 + gx * (xs / width - 0.5) + gy * (ys / height - 0.5)
+    noise = np.random.default_rng(rng.getrandbits(32)).normal(0, rng.uniform(4, 14), pixels.shape)
+    pixels = np.clip(pixels * lighting + noise, 0, 255).astype(np.uint8)
+
+    photo = Image.fromarray(pixels).filter(ImageFilter.GaussianBlur(rng.uniform(0.3, 1.2)))
+    output = io.BytesIO()
+    photo.convert("RGB").save(output, "JPEG", quality=rng.randint(50, 85))
+    return output.getvalue()
+
+
+@asynccontextmanager
+async def in_process_client(directory: str) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Cliente ligado à aplicação no próprio processo, com banco temporário.
+
+    Tudo o que grava no banco (sessões das rotas, escrita em lote, registro
+    de leituras e partições por evento) é ligado ao banco em `directory`.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from main import app
+    from app import config
+    from app.database.batch_writer import BatchWriter, get_batch_writer
+    from app.database.database import Base, get_db
+    from app.database.migrations import run_migrations
+    from app.database.partitions import PartitionManager, get_partition_manager
+    from app.database.scan_log import ScanLog, get_scan_log
+
+    engine = create_engine(
+        f"sqlite:///{os.path.join(directory, 'load.db')}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
+    session_factory = sessionmaker(bind=engine)
+
+    batch_writer = None
+    if config.BATCH_WRITES_ENABLED:
+        batch_writer = BatchWriter(
+            session_factory, config.BATCH_MAX_SIZE, config.BATCH_MAX_DELAY_MS
+        )
+    scan_log = None
+    if config.SCAN_LOG_ENABLED:
+        scan_log = ScanLog(
+            session_factory,
+            config.SCAN_LOG_BATCH_SIZE,
+            config.SCAN_LOG_FLUSH_MS,
+            config.SCAN_LOG_MAX_PENDING,
+        )
+    partitions = PartitionManager(os.path.join(directory, "events"), session_factory)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_batch_writer] = lambda: batch_writer
+    app.dependency_overrides[get_scan_log] = lambda: scan_log
+    app.dependency_overrides[get_partition_manager] = lambda: partitions
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=60
+        ) as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(previous)
+        if batch_writer is not None:
+            batch_writer.stop()
+        if scan_log is not None:
+            scan_log.stop()
+        partitions.dispose()
+        engine.dispose()
+
+
+class LoadRun:
+    """Estado compartilhado pelos clientes durante a execução."""
+
+    def __init__(self, client: httpx.AsyncClient, photos: List[tuple], codes: List[str]):
+        self.client = client
+        self.photos = photos
+        self.codes = codes
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.rejected: Dict[str, int] = defaultdict(int)
+        self.decoded = 0
+        self.decode_attempts = 0
+
+    async def create(self, rng: random.Random) -> httpx.Response:
+        response = await self.client.post(
+            "/api/v1/generate-qrcode", json={"data": f"Convidado {rng.getrandbits(32)}"}
+        )
+        if response.status_code == 200:
+            self.codes.append(response.headers["X-Invite-Code"])
+        return response
+
+    async def validate(self, rng: random.Random) -> httpx.Response:
+        code, photo = rng.choice(self.photos)
+        files = {"file": ("foto.jpg", photo, "image/jpeg")}
+        response = await self.client.post("/api/v1/read-qrcode", files=files)
+        if response.status_code == 200:
+            self.decode_attempts += 1
+            body = response.json()
+            if body["success"] and body["invite_code"] == code:
+                self.decoded += 1
+        return response
+
+    async def lookup(self, rng: random.Random) -> httpx.Response:
+        return await self.client.get(f"/api/v1/invites/{rng.choice(self.codes)}")
+
+    async def list(self, rng: random.Random) -> httpx.Response:
+        return await self.client.get("/api/v1/invites", params={"skip": rng.randint(0, 500), "limit": 50})
+
+    async def client_loop(self, mix: Dict[str, float], seed: int, deadline: float) -> None:
+        rng = random.Random(seed)
+        names, weights = list(mix), list(mix.values())
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await getattr(self, name)(rng)
+            except httpx.TransportError:
+                self.errors[name] += 1
+                continue
+            elapsed = time.perf_counter() - start
+            if response.status_code == 503:
+                self.rejected[name] += 1
+                await asyncio.sleep(float(response.headers.get("Retry-After", "1")) / 10)
+            elif response.status_code == 200:
+                self.latencies[name].append(elapsed)
+            else:
+                self.errors[name] += 1
+
+
+async def seed_invites(client: httpx.AsyncClient, count: int, rng: random.Random) -> List[tuple]:
+    """Cria convites reais e gera uma foto simulada de cada um."""
+    photos = []
+    for n in range(count):
+        response = await client.post("/api/v1/generate-qrcode", json={"data": f"Convidado {n}"})
+        response.raise_for_status()
+        photos.append((response.headers["X-Invite-Code"], phone_photo(response.content, rng)))
+    return photos
+
+
+async def run(args) -> Optional[LoadRun]:
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.url:
+            client_context = httpx.AsyncClient(
+                base_url=args.url, timeout=60, limits=httpx.Limits(max_connections=args.clients)
+            )
+        else:
+            client_context = in_process_client(tmp)
+
+        async with client_context as client:
+            photos = await seed_invites(client, args.invites, rng)
+            if args.save_photos:
+                os.makedirs(args.save_photos, exist_ok=True)
+                for n, (_, photo) in enumerate(photos):
+                    with open(os.path.join(args.save_photos, f"foto_{n:03d}.jpg"), "wb") as f:
+                        f.write(photo)
+
+            state = LoadRun(client, photos, [code for code, _ in photos])
+            started = time.monotonic()
+            deadline = started + args.duration
+            await asyncio.gather(*[
+                state.client_loop(args.mix, args.seed + n, deadline) for n in range(args.clients)
+            ])
+            state.elapsed = time.monotonic() - started
+            return state
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, int(len(values) * fraction))] * 1000
+
+
+def report(state: LoadRun, args) -> None:
+    target = args.url or "ASGI no processo"
+    print(f"{args.clients} clientes por {args.duration:.0f} s ({target}), {len(state.photos)} fotos")
+    print(f"{'operação':<10}{'ok':>8}{'req/s':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'503':>7}{'erros':>7}")
+    total = 0
+    for name in args.mix:
+        latencies = sorted(state.latencies[name])
+        total += len(latencies)
+        print(
+            f"{name:<10}{len(latencies):>8}{len(latencies) / state.elapsed:>9.1f}"
+            f"{percentile(latencies, 0.50):>8.0f}ms{percentile(latencies, 0.95):>8.0f}ms"
+            f"{percentile(latencies, 0.99):>8.0f}ms{state.rejected[name]:>7}{state.errors[name]:>7}"
+        )
+    print(f"{'total':<10}{total:>8}{total / state.elapsed:>9.1f}")
+    if state.decode_attempts:
+        rate = state.decoded / state.decode_attempts
+        print(f"leitura das fotos: {state.decoded}/{state.decode_attempts} ({rate:.1%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("create=1,validate=6,lookup=2,list=1"))
+    parser.add_argument("--invites", type=int, default=64, help="convites reais fotografados")
+    parser.add_argument("--url", help="servidor em execução (padrão: ASGI no processo)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save-photos", help="diretório para salvar as fotos simuladas")
+    args = parser.parse_args()
+
+    report(asyncio.run(run(args)), args)
+
+
+if __name__ == "__main__":
+    main()
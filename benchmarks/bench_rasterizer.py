@@ -0,0 +1,63 @@
+"""
+Benchmark da rasterização de QR Codes: desenho por módulo no PIL vs NumPy.
+
+Uso:
+    python -m benchmarks.bench_rasterizer [--codes 1000]
+"""
+import argparse
+import io
+import time
+import uuid
+
+from qrcode.image.pil import PilImage
+
+from app.api import fast_encoder
+from app.api.qrcode_service import QRCodeService
+from app.api.rasterizer import rasterize
+
+
+def pil_rasterize(modules):
+    img = PilImage(
+        QRCodeService.BORDER,
+        len(modules),
+        QRCodeService.BOX_SIZE,
+        qrcode_modules=modules,
+        fill_color="black",
+        back_color="white",
+    )
+    for row in range(len(modules)):
+        for col in range(len(modules)):
+            if modules[row][col]:
+                img.drawrect(row, col)
+    return img.get_image()
+
+
+def numpy_rasterize(modules):
+    return rasterize(modules, QRCodeService.BOX_SIZE, QRCodeService.BORDER)
+
+
+def measure(func, matrices, save):
+    start = time.perf_counter()
+    for modules in matrices:
+        img = func(modules)
+        if save:
+            img.save(io.BytesIO(), "PNG")
+    return len(matrices) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--codes", type=int, default=1000)
+    args = parser.parse_args()
+
+    matrices = [fast_encoder.encode(str(uuid.uuid4())) for _ in range(args.codes)]
+
+    print(f"{'etapa':<20}{'PIL (img/s)':>14}{'NumPy (img/s)':>16}{'ganho':>8}")
+    for name, save in (("rasterização", False), ("rasterização + PNG", True)):
+        pil = measure(pil_rasterize, matrices, save)
+        vectorized = measure(numpy_rasterize, matrices, save)
+        print(f"{name:<20}{pil:>14.0f}{vectorized:>16.0f}{vectorized / pil:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Benchmark do custo do registro de leituras na latência de POST /read-qrcode.
+
+Compara três modos com clientes simultâneos, na aplicação em processo (ASGI,
+banco temporário):
+
+- `off`: sem registro de leituras
+- `buffered`: ScanLog (buffer em memória gravado em lote pela thread de fundo)
+- `sync`: um INSERT com commit por leitura, dentro da requisição
+
+Uso:
+    python -m benchmarks.bench_scan_log [--scans 600] [--clients 8]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+import httpx
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.api.qrcode_service import QRCodeService
+from app.database.database import Base, get_db
+from app.database.migrations import run_migrations
+from app.database.scan_log import ScanLog, get_scan_log
+from app.models.invite import Invite
+from app.models.scan_event import ScanEvent
+from main import app
+
+MODES = ("off", "buffered", "sync")
+
+
+class SyncScanLog(ScanLog):
+    """Grava cada leitura na hora, com uma transação por leitura."""
+
+    def record(
+        self,
+        outcome: str,
+        invite_code: Optional[str] = None,
+        gate_id: Optional[str] = None,
+        decode_ms: Optional[float] = None,
+        event_id: Optional[str] = None,
+    ) -> None:
+        db = self._session_factory()
+        try:
+            db.execute(insert(ScanEvent.__table__), [{
+                "invite_code": invite_code,
+                "outcome": outcome,
+                "gate_id": gate_id,
+                "event_id": event_id,
+                "scanned_at": datetime.utcnow(),
+                "decode_ms": decode_ms,
+            }])
+            db.commit()
+        finally:
+            db.close()
+        self.events_written += 1
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p), len(ordered) - 1)]
+
+
+async def run(mode: str, invites: int, scans: int, clients: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            connect_args={"check_same_thread": False, "timeout": 30},
+        )
+        Base.metadata.create_all(bind=engine)
+        run_migrations(engine)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        db = session_factory()
+        codes = [str(uuid.uuid4()) for _ in range(invites)]
+        images = [QRCodeService.generate_qrcode(code) for code in codes]
+        db.add_all(Invite(invite_code=code, data="benchmark") for code in codes)
+        db.commit()
+        db.close()
+
+        if mode == "off":
+            scan_log = None
+        elif mode == "sync":
+            scan_log = SyncScanLog(session_factory)
+        else:
+            scan_log = ScanLog(session_factory)
+
+        def override_get_db():
+            session = session_factory()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        previous = dict(app.dependency_overrides)
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_scan_log] = lambda: scan_log
+
+        latencies: List[float] = []
+        failures = 0
+        counter = iter(range(scans))
+
+        async def worker(client: httpx.AsyncClient, gate: str):
+            nonlocal failures
+            for n in counter:
+                image = images[n % len(images)]
+                start = time.perf_counter()
+                response = await client.post(
+                    "/api/v1/read-qrcode",
+                    files={"file": ("qrcode.png", image, "image/png")},
+                    headers={"X-Gate-ID": gate},
+                )
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    failures += 1
+
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                start = time.perf_counter()
+                await asyncio.gather(*(worker(client, f"portaria-{n}") for n in range(clients)))
+                elapsed = time.perf_counter() - start
+        finally:
+            app.dependency_overrides.clear()
+            app.dependency_overrides.update(previous)
+
+        written = 0
+        if scan_log is not None:
+            scan_log.stop()
+            written = scan_log.events_written
+        engine.dispose()
+
+        return {
+            "rate": scans / elapsed,
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "written": written,
+            "failures": failures,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scans", type=int, default=600)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--invites", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'modo':<10}{'leituras/s':>12}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'gravadas':>10}{'falhas':>8}")
+    for mode in MODES:
+        result = asyncio.run(run(mode, args.invites, args.scans, args.clients))
+        print(f"{mode:<10}{result['rate']:>12.0f}{result['p50']:>9.2f}{result['p95']:>9.2f}"
+              f"{result['p99']:>9.2f}{result['written']:>10}{result['failures']:>8}")
+
+
+if __name__ == "__main__":
+    main()
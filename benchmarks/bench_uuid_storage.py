@@ -0,0 +1,89 @@
+"""
+Benchmark do armazenamento de invite_code: texto (36 caracteres) vs UUID binário.
+
+Compara o tamanho da tabela, do índice único e a latência de busca por código.
+
+Uso:
+    python -m benchmarks.bench_uuid_storage [--rows 1000000] [--lookups 20000]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+import uuid
+
+SCHEMA = """
+CREATE TABLE invites (
+    id INTEGER NOT NULL PRIMARY KEY,
+    invite_code {column_type} NOT NULL,
+    data VARCHAR,
+    created_at DATETIME,
+    is_validated BOOLEAN
+);
+CREATE UNIQUE INDEX ix_invites_invite_code ON invites (invite_code);
+"""
+
+
+def build(path, column_type, codes, encode):
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA.format(column_type=column_type))
+    connection.executemany(
+        "INSERT INTO invites (invite_code, data, created_at, is_validated) "
+        "VALUES (?, 'benchmark', '2025-01-01 00:00:00', 0)",
+        ((encode(code),) for code in codes),
+    )
+    connection.commit()
+    connection.execute("VACUUM")
+    return connection
+
+
+def sizes(connection):
+    rows = connection.execute(
+        "SELECT name, SUM(pgsize) FROM dbstat "
+        "WHERE name IN ('invites', 'ix_invites_invite_code') GROUP BY name"
+    ).fetchall()
+    return dict(rows)
+
+
+def lookup_latency(connection, codes, encode, lookups):
+    sample = [encode(code) for code in random.sample(codes, lookups)]
+    query = "SELECT id, data FROM invites WHERE invite_code = ?"
+    start = time.perf_counter()
+    for code in sample:
+        connection.execute(query, (code,)).fetchone()
+    return (time.perf_counter() - start) / lookups * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    args = parser.parse_args()
+
+    codes = [uuid.uuid4() for _ in range(args.rows)]
+    variants = [
+        ("texto", "VARCHAR", str),
+        ("binário", "BLOB", lambda code: code.bytes),
+    ]
+
+    print(f"{args.rows} convites")
+    print(f"{'formato':<10}{'tabela (MB)':>13}{'índice (MB)':>13}{'busca (µs)':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, column_type, encode in variants:
+            path = os.path.join(tmp, f"{column_type}.db")
+            connection = build(path, column_type, codes, encode)
+            size = sizes(connection)
+            latency = lookup_latency(connection, codes, encode, min(args.lookups, args.rows))
+            connection.close()
+            print(
+                f"{name:<10}"
+                f"{size['invites'] / 2**20:>13.1f}"
+                f"{size['ix_invites_invite_code'] / 2**20:>13.1f}"
+                f"{latency:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,20 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from pathlib import Path
 
+from app.api.admission import Overloaded
 from app.api.routes import router
 from app.database.database import engine, Base
+from app.database.batch_writer import shutdown_batch_writer
+from app.database.migrations import run_migrations
+from app.database.partitions import shutdown_partitions
+from app.database.scan_log import shutdown_scan_log
 from app.models.invite import Invite
 
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 app = FastAPI(
     title="EasyQR API",
     description="Sistema de convites com QR Code",
@@ -28,6 +34,22 @@ app.include_router(router, prefix="/api/v1", tags=["QR Code"])
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Servidor sobrecarregado, tente novamente em instantes"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    shutdown_batch_writer()
+    shutdown_partitions()
+    shutdown_scan_log()
+
+
 @app.get("/")
 async def root():
     return FileResponse("templates/login.html")
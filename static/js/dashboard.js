@@ -1,20 +1,53 @@
+const CHECKIN_RESYNC_MS = 60000;
+
+let stats = null;
+let checkinSeries = null;
+
 document.addEventListener('DOMContentLoaded', async function() {
-    await loadStats();
+    await loadCheckins();
+    setInterval(loadCheckins, CHECKIN_RESYNC_MS);
+    await connectEvents();
 });
 
+async function connectEvents() {
+    if (!window.EventSource) {
+        await loadStats();
+        return;
+    }
+
+    // A cada (re)conexão o servidor envia um resumo e, depois, apenas as alterações
+    const source = new EventSource(`${API_BASE_URL}/events`);
+
+    source.addEventListener('summary', event => {
+        stats = JSON.parse(event.data);
+        renderStats();
+    });
+
+    source.addEventListener('stats', event => {
+        if (!stats) return;
+        const delta = JSON.parse(event.data);
+        stats.total += delta.total;
+        stats.validated += delta.validated;
+        stats.pending += delta.pending;
+        renderStats();
+    });
+
+    source.addEventListener('checkin', event => {
+        addCheckin(JSON.parse(event.data));
+    });
+
+    source.onerror = () => {
+        console.warn('Conexão de eventos interrompida, reconectando...');
+    };
+}
+
 async function loadStats() {
     try {
-        const { response, responseTime } = await apiRequest('/invites');
+        const { response, responseTime } = await apiRequest('/stats/summary');
 
         if (response.ok) {
-            const invites = await response.json();
-            const total = invites.length;
-            const validated = invites.filter(inv => inv.is_validated).length;
-            const pending = total - validated;
-
-            document.getElementById('totalInvites').textContent = total;
-            document.getElementById('validatedInvites').textContent = validated;
-            document.getElementById('pendingInvites').textContent = pending;
+            stats = await response.json();
+            renderStats();
 
             if (responseTime > 1000) {
                 console.warn(`Slow API response: ${responseTime.toFixed(2)}ms`);
@@ -32,3 +65,63 @@ async function loadStats() {
         document.getElementById('pendingInvites').textContent = 'Erro';
     }
 }
+
+function renderStats() {
+    document.getElementById('totalInvites').textContent = stats.total;
+    document.getElementById('validatedInvites').textContent = stats.validated;
+    document.getElementById('pendingInvites').textContent = stats.pending;
+}
+
+async function loadCheckins() {
+    try {
+        const { response } = await apiRequest('/stats/checkins?bucket=minute');
+
+        if (response.ok) {
+            checkinSeries = await response.json();
+            renderCheckins(checkinSeries);
+        } else {
+            console.error('Erro ao carregar entradas por minuto');
+        }
+    } catch (error) {
+        console.error('Erro ao carregar entradas por minuto:', error);
+    }
+}
+
+function toMinute(isoString) {
+    return Math.floor(Date.parse(isoString + 'Z') / 60000);
+}
+
+function addCheckin(checkin) {
+    if (!checkinSeries || checkinSeries.points.length === 0) return;
+
+    const last = checkinSeries.points[checkinSeries.points.length - 1];
+    if (toMinute(checkin.validated_at) === toMinute(last.start)) {
+        last.count += 1;
+        checkinSeries.total += 1;
+        renderCheckins(checkinSeries);
+    } else {
+        // Começou um novo minuto: busca a janela atualizada
+        loadCheckins();
+    }
+}
+
+function renderCheckins(series) {
+    const chart = document.getElementById('checkinChart');
+    const max = Math.max(1, ...series.points.map(point => point.count));
+
+    chart.innerHTML = '';
+    series.points.forEach(point => {
+        const bar = document.createElement('div');
+        const time = new Date(point.start + 'Z').toLocaleTimeString('pt-BR', {
+            hour: '2-digit',
+            minute: '2-digit'
+        });
+        bar.className = 'checkin-bar';
+        bar.style.height = `${(point.count / max) * 100}%`;
+        bar.title = `${time}: ${point.count} entrada(s)`;
+        chart.appendChild(bar);
+    });
+
+    document.getElementById('checkinTotal').textContent =
+        `${series.total} entrada(s) na última hora`;
+}
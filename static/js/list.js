@@ -1,38 +1,70 @@
 let allInvites = [];
 
+// Cópia local dos convites, atualizada pelo feed de alterações
+const invitesById = new Map();
+let changeSeq = 0;
+let listStale = true;
+
 document.addEventListener('DOMContentLoaded', async function() {
     await loadInvites();
 });
 
-async function loadInvites() {
+async function syncChanges() {
+    // Busca apenas os convites criados, validados ou arquivados desde a última sincronização
+    let changed = false;
+    let hasMore = true;
+
+    while (hasMore) {
+        const { response, responseTime } = await apiRequest(`/invites/changes?since=${changeSeq}`);
+        if (!response.ok) {
+            throw new Error('Erro ao carregar convites');
+        }
+
+        const feed = await response.json();
+        feed.invites.forEach(invite => invitesById.set(invite.id, invite));
+        feed.removed.forEach(id => invitesById.delete(id));
+        changed = changed || feed.invites.length > 0 || feed.removed.length > 0;
+        changeSeq = feed.seq;
+        hasMore = feed.has_more;
+
+        console.log(`${feed.invites.length + feed.removed.length} alterações carregadas em ${responseTime.toFixed(2)}ms`);
+    }
+
+    allInvites = Array.from(invitesById.values());
+    return changed;
+}
+
+function showInvites() {
+    listStale = false;
     const invitesList = document.getElementById('invitesList');
     const emptyState = document.getElementById('emptyState');
 
-    try {
-        const { response, responseTime } = await apiRequest('/invites');
-
-        if (response.ok) {
-            allInvites = await response.json();
+    if (allInvites.length === 0) {
+        invitesList.style.display = 'none';
+        emptyState.style.display = 'block';
+    } else {
+        invitesList.style.display = '';
+        emptyState.style.display = 'none';
+        filterInvites();
+    }
+}
 
-            console.log(`${allInvites.length} convites carregados em ${responseTime.toFixed(2)}ms`);
+function showError() {
+    listStale = true;
+    document.getElementById('invitesList').innerHTML = `
+        <div class="error-message">
+            Erro ao carregar convites. Verifique se a API está rodando.
+        </div>
+    `;
+}
 
-            if (allInvites.length === 0) {
-                invitesList.style.display = 'none';
-                emptyState.style.display = 'block';
-            } else {
-                invitesList.innerHTML = '';
-                renderInvites(allInvites);
-            }
-        } else {
-            throw new Error('Erro ao carregar convites');
-        }
+async function loadInvites() {
+    try {
+        await syncChanges();
+        showInvites();
     } catch (error) {
         console.error('Erro:', error);
-        invitesList.innerHTML = `
-            <div class="error-message">
-                Erro ao carregar convites. Verifique se a API está rodando.
-            </div>
-        `;
+        showError();
     }
 }
 
@@ -89,16 +121,13 @@ function filterInvites() {
 }
 
 async function refreshList() {
-    document.getElementById('searchInput').value = '';
-    document.getElementById('statusFilter').value = 'all';
-
-    const invitesList = document.getElementById('invitesList');
-    invitesList.innerHTML = `
-        <div class="loading-spinner">
-            <div class="spinner"></div>
-            <p>Carregando convites...</p>
-        </div>
-    `;
-
-    await loadInvites();
+    // Aplica apenas as alterações; sem mudanças, a lista não é redesenhada
+    try {
+        if (await syncChanges() || listStale) {
+            showInvites();
+        }
+    } catch (error) {
+        console.error('Erro:', error);
+        showError();
+    }
 }
@@ -0,0 +1,41 @@
+"""
+Configuração compartilhada dos testes.
+"""
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from app.database.scan_log import get_scan_log
+
+# Os bancos SQLite dos testes ficam em um diretório temporário da sessão
+TEST_DB_DIR = tempfile.mkdtemp(prefix="easyqr-tests-")
+
+
+def database_url(name: str) -> str:
+    """Retorna a URL de um banco SQLite de teste no diretório temporário da sessão."""
+    return f"sqlite:///{os.path.join(TEST_DB_DIR, name)}"
+
+
+@pytest.fixture(autouse=True)
+def disable_scan_log():
+    """
+    Desliga o registro de leituras global, que gravaria no banco principal.
+
+    Os testes do registro sobrescrevem esta dependência com um ScanLog
+    ligado ao próprio banco de teste.
+    """
+    from main import app
+
+    previous = app.dependency_overrides.get(get_scan_log)
+    app.dependency_overrides[get_scan_log] = lambda: None
+    yield
+    if previous is None:
+        app.dependency_overrides.pop(get_scan_log, None)
+    else:
+        app.dependency_overrides[get_scan_log] = previous
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(TEST_DB_DIR, ignore_errors=True)
@@ -0,0 +1,224 @@
+"""
+Testes para o controle de admissão das etapas custosas.
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from app.api.admission import AdmissionController, Overloaded, get_decode_admission
+from app.api.qrcode_service import QRCodeService
+
+
+@pytest.fixture
+def saturated_decode():
+    """Controle de leitura com uma única vaga e sem fila."""
+    controller = AdmissionController("decode", 1, 0, 100, retry_after=3)
+    app.dependency_overrides[get_decode_admission] = lambda: controller
+    yield controller
+    del app.dependency_overrides[get_decode_admission]
+
+
+class TestAdmissionController:
+    """Testes para AdmissionController."""
+
+    def test_admits_up_to_limit_then_queues(self):
+        """Testa que a fila é atendida em ordem quando vagas são liberadas."""
+        controller = AdmissionController("teste", 2, 5, 1000)
+
+        async def scenario():
+            first = await controller.acquire()
+            await controller.acquire()
+            order = []
+
+            async def waiter(n):
+                ticket = await controller.acquire()
+                order.append(n)
+                ticket.release()
+
+            waiters = [asyncio.create_task(waiter(n)) for n in range(3)]
+            await asyncio.sleep(0.01)
+            assert controller.stats()["queued"] == 3
+
+            first.release()
+            first.release()  # liberar de novo não tem efeito
+            await asyncio.gather(*waiters)
+            return order
+
+        assert asyncio.run(scenario()) == [0, 1, 2]
+        stats = controller.stats()
+        assert stats["active"] == 1
+        assert stats["admitted"] == 5
+        assert stats["peak_queue"] == 3
+
+    def test_full_queue_is_rejected_immediately(self):
+        """Testa recusa imediata quando a fila está cheia."""
+        controller = AdmissionController("teste", 1, 0, 1000)
+
+        async def scenario():
+            await controller.acquire()
+            start = time.perf_counter()
+            with pytest.raises(Overloaded):
+                await controller.acquire()
+            return time.perf_counter() - start
+
+        assert asyncio.run(scenario()) < 0.05
+        assert controller.rejected_queue_full == 1
+
+    def test_queue_timeout_does_not_leak_slots(self):
+        """Testa recusa por tempo de espera e devolução correta das vagas."""
+        controller = AdmissionController("teste", 1, 1, 20)
+
+        async def scenario():
+            ticket = await controller.acquire()
+            with pytest.raises(Overloaded):
+                await controller.acquire()
+            ticket.release()
+
+        asyncio.run(scenario())
+        stats = controller.stats()
+        assert stats["rejected_timeout"] == 1
+        assert stats["active"] == 0
+        assert stats["queued"] == 0
+
+    def test_cancelled_waiter_does_not_leak_slots(self):
+        """Testa que cancelar uma requisição na fila não consome a vaga."""
+        controller = AdmissionController("teste", 1, 1, 1000)
+
+        async def scenario():
+            ticket = await controller.acquire()
+            waiter = asyncio.create_task(controller.acquire())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            ticket.release()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+            await asyncio.sleep(0.01)
+
+        asyncio.run(scenario())
+        assert controller.stats()["active"] == 0
+
+    def test_release_from_another_thread(self):
+        """Testa o repasse da vaga entre event loops de threads diferentes."""
+        controller = AdmissionController("teste", 1, 1, 1000)
+        ticket = asyncio.run(controller.acquire())
+
+        releaser = threading.Timer(0.05, ticket.release)
+        releaser.start()
+        second = asyncio.run(controller.acquire())
+        second.release()
+
+        assert controller.stats()["active"] == 0
+        assert controller.admitted == 2
+
+    def test_latency_is_bounded_under_overload(self):
+        """Testa que, sob sobrecarga, as admitidas terminam dentro do limite e as demais são recusadas."""
+        controller = AdmissionController("teste", 4, 8, 200)
+        work = 0.02
+        latencies = []
+        rejected = []
+
+        async def request():
+            start = time.perf_counter()
+            try:
+                ticket = await controller.acquire()
+            except Overloaded:
+                rejected.append(time.perf_counter() - start)
+                return
+            try:
+                await asyncio.sleep(work)
+            finally:
+                ticket.release()
+            latencies.append(time.perf_counter() - start)
+
+        async def scenario():
+            await asyncio.gather(*[request() for _ in range(200)])
+
+        asyncio.run(scenario())
+
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        assert len(latencies) + len(rejected) == 200
+        assert rejected and latencies
+        assert p99 < controller.queue_timeout + work + 0.1
+        assert max(rejected) < controller.queue_timeout + 0.1
+        assert controller.stats()["active"] == 0
+
+    def test_invalid_limits(self):
+        """Testa validação dos limites."""
+        with pytest.raises(ValueError):
+            AdmissionController("teste", 0, 1, 100)
+        with pytest.raises(ValueError):
+            AdmissionController("teste", 1, -1, 100)
+
+
+class TestAdmissionAPI:
+    """Testes da recusa com 503 nas rotas."""
+
+    def test_saturated_decode_returns_503(self, saturated_decode):
+        """Testa 503 com Retry-After quando a leitura está saturada."""
+        client = TestClient(app)
+        image = QRCodeService.generate_qrcode("qualquer").read()
+        files = {"file": ("qrcode.png", image, "image/png")}
+
+        ticket = asyncio.run(saturated_decode.acquire())
+        response = client.post("/api/v1/read-qrcode", files=files)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "3"
+
+        ticket.release()
+        response = client.post("/api/v1/read-qrcode", files=files)
+        assert response.status_code == 200
+        assert saturated_decode.stats()["active"] == 0
+
+    def test_rejected_upload_is_not_received(self, saturated_decode):
+        """Testa que a recusa acontece antes da leitura do corpo da requisição."""
+        received = []
+        messages = []
+
+        async def receive():
+            received.append(1)
+            return {"type": "http.request", "body": b"x" * 1024, "more_body": True}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": "/api/v1/read-qrcode",
+            "raw_path": b"/api/v1/read-qrcode",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"content-type", b"multipart/form-data; boundary=limite")],
+            "client": ("127.0.0.1", 1234),
+            "server": ("testserver", 80),
+        }
+
+        async def scenario():
+            ticket = await saturated_decode.acquire()
+            try:
+                await app(scope, receive, send)
+            finally:
+                ticket.release()
+
+        asyncio.run(scenario())
+        assert messages[0]["status"] == 503
+        assert received == []
+
+    def test_admission_counters(self, saturated_decode):
+        """Testa a exposição dos contadores de cada etapa."""
+        client = TestClient(app)
+        ticket = asyncio.run(saturated_decode.acquire())
+        client.post("/api/v1/read-qrcode", files={"file": ("a.png", b"x", "image/png")})
+        ticket.release()
+
+        stats = {item["stage"]: item for item in client.get("/api/v1/admission").json()}
+        assert set(stats) == {"decode", "render", "batch"}
+        assert stats["decode"]["rejected_queue_full"] == 1
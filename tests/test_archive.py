@@ -0,0 +1,144 @@
+"""
+Testes para o arquivamento de convites antigos.
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from app.api.archive_service import ArchiveService
+from app.api.qrcode_service import QRCodeService
+from app.database.database import Base, get_db
+from app.database.migrations import run_migrations
+from app.models.invite import ArchivedInvite, Invite
+from tests.conftest import database_url
+
+SQLALCHEMY_DATABASE_URL = database_url("test_archive.db")
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def client():
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(previous)
+
+
+@pytest.fixture
+def db():
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+def create_invite(db, days_ago, data="Convite"):
+    invite = Invite(
+        invite_code=str(uuid.uuid4()),
+        data=data,
+        created_at=datetime.utcnow() - timedelta(days=days_ago)
+    )
+    db.add(invite)
+    db.commit()
+    return invite.id, invite.invite_code
+
+
+class TestArchiveService:
+    """Testes para ArchiveService."""
+
+    def test_old_invites_are_moved(self, db):
+        """Testa que apenas convites fora da janela vão para o arquivo."""
+        old = [create_invite(db, 400) for _ in range(3)]
+        recent_id, recent_code = create_invite(db, 1)
+
+        assert ArchiveService.archive(db, 365, chunk_size=2) == 3
+
+        for invite_id, invite_code in old:
+            assert db.get(Invite, invite_id) is None
+            archived = db.get(ArchivedInvite, invite_id)
+            assert archived.invite_code == invite_code
+        assert db.get(Invite, recent_id).invite_code == recent_code
+
+    def test_find_invite_falls_through(self, db):
+        """Testa busca transparente na tabela ativa e no arquivo."""
+        _, old_code = create_invite(db, 400, "Antigo")
+        _, recent_code = create_invite(db, 1, "Recente")
+        ArchiveService.archive(db, 365)
+
+        assert isinstance(ArchiveService.find_invite(db, old_code), ArchivedInvite)
+        assert ArchiveService.find_invite(db, old_code).data == "Antigo"
+        assert isinstance(ArchiveService.find_invite(db, recent_code), Invite)
+        assert ArchiveService.find_invite(db, str(uuid.uuid4())) is None
+
+    def test_ids_are_not_reused(self, db):
+        """Testa que um convite novo não recebe o ID de um arquivado."""
+        archived_id, _ = create_invite(db, 400)
+        ArchiveService.archive(db, 365)
+
+        new_id, _ = create_invite(db, 0)
+        assert new_id > archived_id
+
+    def test_negative_retention(self, db):
+        """Testa que janelas negativas são recusadas."""
+        with pytest.raises(ValueError):
+            ArchiveService.archive(db, -1)
+
+
+class TestArchiveAPI:
+    """Testes das rotas com convites arquivados."""
+
+    def test_archived_invite_is_readable(self, client):
+        """Testa consulta e validação de um convite arquivado."""
+        db = TestingSessionLocal()
+        _, invite_code = create_invite(db, 400, "Arquivado")
+        db.close()
+
+        assert client.post("/api/v1/archive").json()["archived"] >= 1
+
+        response = client.get(f"/api/v1/invites/{invite_code}")
+        assert response.status_code == 200
+        assert response.json()["data"] == "Arquivado"
+
+        qr_image = QRCodeService.generate_qrcode(invite_code)
+        files = {"file": ("qrcode.png", qr_image.read(), "image/png")}
+        result = client.post("/api/v1/read-qrcode", files=files).json()
+        assert result["success"] is True
+        assert result["is_validated"] is True
+
+    def test_list_includes_archived_on_request(self, client):
+        """Testa que a listagem só inclui o arquivo quando solicitado."""
+        db = TestingSessionLocal()
+        _, invite_code = create_invite(db, 400)
+        db.close()
+        client.post("/api/v1/archive")
+
+        hot = client.get("/api/v1/invites", params={"limit": 100000}).json()
+        everything = client.get(
+            "/api/v1/invites", params={"limit": 100000, "include_archived": True}
+        ).json()
+
+        assert invite_code not in [invite["invite_code"] for invite in hot]
+        assert invite_code in [invite["invite_code"] for invite in everything]
+        assert [invite["id"] for invite in everything] == sorted(i["id"] for i in everything)
+
+    def test_negative_retention(self, client):
+        """Testa resposta 400 para janela negativa."""
+        response = client.post("/api/v1/archive", params={"older_than_days": -1})
+        assert response.status_code == 400
@@ -0,0 +1,120 @@
+"""
+Testes para a escrita em lote de convites.
+"""
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from app.database.database import Base, get_db
+from app.database.batch_writer import BatchWriter, get_batch_writer
+from app.models.invite import Invite
+from tests.conftest import database_url
+
+SQLALCHEMY_DATABASE_URL = database_url("test_batch.db")
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.create_all(bind=engine)
+
+
+class TestBatchWriter:
+    """Testes para BatchWriter."""
+
+    def test_submit_returns_id(self):
+        """Testa que o convite é gravado e o ID é retornado."""
+        writer = BatchWriter(TestingSessionLocal, max_delay_ms=1)
+        try:
+            invite_code = str(uuid.uuid4())
+            invite_id = writer.submit(invite_code, "Dados").result(timeout=5)
+        finally:
+            writer.stop()
+
+        db = TestingSessionLocal()
+        try:
+            invite = db.get(Invite, invite_id)
+            assert invite is not None
+            assert invite.invite_code == invite_code
+            assert invite.data == "Dados"
+        finally:
+            db.close()
+
+    def test_concurrent_submits_are_grouped(self):
+        """Testa que envios concorrentes são agrupados em poucas transações."""
+        writer = BatchWriter(TestingSessionLocal, max_batch_size=100, max_delay_ms=50)
+        try:
+            with ThreadPoolExecutor(max_workers=20) as pool:
+                futures = list(pool.map(
+                    lambda i: writer.submit(str(uuid.uuid4()), str(i)),
+                    range(60)
+                ))
+            ids = [future.result(timeout=5) for future in futures]
+        finally:
+            writer.stop()
+
+        assert len(set(ids)) == 60
+        assert writer.rows_written == 60
+        assert writer.batches_flushed < 60
+
+    def test_failed_row_does_not_fail_batch(self):
+        """Testa que um código duplicado falha sozinho sem afetar o lote."""
+        writer = BatchWriter(TestingSessionLocal, max_batch_size=10, max_delay_ms=50)
+        try:
+            invite_code = str(uuid.uuid4())
+            writer.submit(invite_code, "a").result(timeout=5)
+            duplicate = writer.submit(invite_code, "b")
+            other = writer.submit(str(uuid.uuid4()), "c")
+
+            assert other.result(timeout=5) > 0
+            assert duplicate.exception(timeout=5) is not None
+        finally:
+            writer.stop()
+
+    def test_cancelled_submit_does_not_stop_writer(self):
+        """Testa que um envio cancelado é ignorado e os demais do lote são resolvidos."""
+        writer = BatchWriter(TestingSessionLocal, max_batch_size=10, max_delay_ms=200)
+        try:
+            cancelled = writer.submit(str(uuid.uuid4()), "cancelado")
+            other = writer.submit(str(uuid.uuid4()), "ok")
+            cancelled.cancel()
+
+            assert other.result(timeout=5) > 0
+            assert writer.submit(str(uuid.uuid4()), "depois").result(timeout=5) > 0
+        finally:
+            writer.stop()
+
+
+def test_generate_qrcode_with_batch_writer():
+    """Testa a rota de geração usando o escritor em lote."""
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    writer = BatchWriter(TestingSessionLocal, max_delay_ms=1)
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_batch_writer] = lambda: writer
+    try:
+        client = TestClient(app)
+        response = client.post("/api/v1/generate-qrcode", json={"data": "Convite em lote"})
+    finally:
+        app.dependency_overrides.clear()
+        app.dependency_overrides.update(previous)
+        writer.stop()
+
+    assert response.status_code == 200
+    invite_id = int(response.headers["X-Invite-ID"])
+
+    db = TestingSessionLocal()
+    try:
+        invite = db.get(Invite, invite_id)
+        assert invite.invite_code == response.headers["X-Invite-Code"]
+        assert invite.data == "Convite em lote"
+    finally:
+        db.close()
@@ -0,0 +1,128 @@
+"""
+Testes para o feed incremental de alterações dos convites.
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from app.api.archive_service import ArchiveService
+from app.api.changes_service import ChangesService
+from app.database.database import Base, get_db
+from app.database.migrations import run_migrations
+from app.models.invite import Invite
+from tests.conftest import database_url
+
+SQLALCHEMY_DATABASE_URL = database_url("test_changes.db")
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def client():
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(previous)
+
+
+def create(client, data="Convidado"):
+    response = client.post("/api/v1/generate-qrcode", json={"data": data})
+    return int(response.headers["X-Invite-ID"]), response.content
+
+
+def sync(client, since=0, limit=ChangesService.DEFAULT_LIMIT):
+    """Consome o feed até o fim, como a página de listagem."""
+    invites, removed, pages = {}, set(), 0
+    while True:
+        feed = client.get(f"/api/v1/invites/changes?since={since}&limit={limit}").json()
+        for invite in feed["invites"]:
+            invites[invite["id"]] = invite
+        removed.update(feed["removed"])
+        since = feed["seq"]
+        pages += 1
+        if not feed["has_more"]:
+            return since, invites, removed, pages
+
+
+class TestChangeFeed:
+    """Testes para GET /invites/changes."""
+
+    def test_only_changes_since_cursor(self, client):
+        """Testa que apenas convites criados após o cursor são devolvidos."""
+        cursor, _, _, _ = sync(client)
+        first, _ = create(client, "Ana")
+        second, _ = create(client, "Bruno")
+
+        feed = client.get(f"/api/v1/invites/changes?since={cursor}").json()
+        assert [invite["id"] for invite in feed["invites"]] == [first, second]
+        assert feed["seq"] > cursor
+
+        unchanged = client.get(f"/api/v1/invites/changes?since={feed['seq']}").json()
+        assert unchanged["invites"] == [] and unchanged["removed"] == []
+        assert unchanged["seq"] == feed["seq"]
+
+    def test_validation_is_a_change(self, client):
+        """Testa que a validação devolve o convite de novo, já validado."""
+        invite_id, image = create(client)
+        cursor, _, _, _ = sync(client)
+
+        client.post("/api/v1/read-qrcode", files={"file": ("qrcode.png", image, "image/png")})
+
+        feed = client.get(f"/api/v1/invites/changes?since={cursor}").json()
+        assert [invite["id"] for invite in feed["invites"]] == [invite_id]
+        assert feed["invites"][0]["is_validated"] is True
+        assert feed["invites"][0]["validated_at"] is not None
+
+    def test_pages_cover_every_change_once(self, client):
+        """Testa a paginação: cada alteração aparece exatamente uma vez."""
+        cursor, _, _, _ = sync(client)
+        created = [create(client, f"Convidado {n}")[0] for n in range(7)]
+
+        _, invites, _, pages = sync(client, cursor, limit=3)
+        assert sorted(invites) == created
+        assert pages == 3
+
+    def test_archived_invites_are_removed(self, client):
+        """Testa que convites arquivados aparecem em `removed`."""
+        db = TestingSessionLocal()
+        old = Invite(
+            invite_code=str(uuid.uuid4()),
+            data="Antigo",
+            created_at=datetime.utcnow() - timedelta(days=400)
+        )
+        db.add(old)
+        db.commit()
+        old_id = old.id
+
+        cursor, local, _, _ = sync(client)
+        assert old_id in local
+
+        ArchiveService.archive(db, older_than_days=365)
+        db.close()
+
+        _, invites, removed, _ = sync(client, cursor)
+        assert old_id in removed
+        assert old_id not in invites
+
+    def test_invalid_parameters(self, client):
+        """Testa validação de `since` e `limit`."""
+        assert client.get("/api/v1/invites/changes?since=-1").status_code == 400
+        assert client.get("/api/v1/invites/changes?limit=0").status_code == 400
+        assert client.get("/api/v1/invites/changes?limit=5000").status_code == 400
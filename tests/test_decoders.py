@@ -0,0 +1,143 @@
+"""
+Testes para os backends de leitura e a cadeia de fallback.
+"""
+import pytest
+
+from app.api.decoders import (
+    BACKENDS, BackendMeasurement, DecoderBackend, DecoderChain, DecoderUnavailable,
+    estimate_chain, evaluate, load_backend, recommend_chain
+)
+from app.api.qrcode_service import QRCodeService
+
+
+class FixedDecoder(DecoderBackend):
+    """Backend de teste que devolve sempre o mesmo resultado."""
+
+    def __init__(self, name, result=None, error=None):
+        self.name = name
+        self.result = result
+        self.error = error
+        self.calls = 0
+
+    def decode(self, image):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class MissingDecoder(DecoderBackend):
+    """Backend de teste cuja biblioteca não está instalada."""
+
+    name = "ausente"
+
+    def __init__(self):
+        raise DecoderUnavailable("biblioteca ausente")
+
+
+@pytest.fixture
+def chain_of(monkeypatch):
+    """Monta uma DecoderChain com backends de teste registrados."""
+    def build(*backends):
+        for backend in backends:
+            monkeypatch.setitem(BACKENDS, backend.name, lambda backend=backend: backend)
+        return DecoderChain([backend.name for backend in backends])
+    return build
+
+
+def measurement(name, successes, latency_ms):
+    return BackendMeasurement(name, successes, [latency_ms / 1000] * len(successes))
+
+
+class TestDecoderChain:
+    """Testes para DecoderChain."""
+
+    def test_first_result_wins(self, chain_of):
+        """Testa que a cadeia para no primeiro backend que lê."""
+        first, second, third = FixedDecoder("a"), FixedDecoder("b", "ok"), FixedDecoder("c", "outro")
+        chain = chain_of(first, second, third)
+
+        assert chain.decode(None) == "ok"
+        assert (first.calls, second.calls, third.calls) == (1, 1, 0)
+        assert chain.hits == {"a": 0, "b": 1, "c": 0}
+
+    def test_backend_error_falls_through(self, chain_of):
+        """Testa que um backend com erro não interrompe a cadeia."""
+        chain = chain_of(FixedDecoder("a", error=RuntimeError("falhou")), FixedDecoder("b", "ok"))
+        assert chain.decode(None) == "ok"
+
+    def test_nothing_found(self, chain_of):
+        """Testa retorno None quando nenhum backend lê."""
+        assert chain_of(FixedDecoder("a"), FixedDecoder("b")).decode(None) is None
+
+    def test_unavailable_backends_are_skipped(self, monkeypatch, chain_of):
+        """Testa que backends sem biblioteca são ignorados."""
+        monkeypatch.setitem(BACKENDS, "ausente", MissingDecoder)
+        chain_of(FixedDecoder("fixo", "ok"))
+
+        chain = DecoderChain(["ausente", "fixo"])
+        assert chain.names == ["fixo"]
+        assert "ausente" in chain.skipped
+
+        with pytest.raises(DecoderUnavailable):
+            DecoderChain(["ausente"])
+
+    def test_unknown_backend(self):
+        """Testa erro para nome de backend desconhecido."""
+        with pytest.raises(ValueError):
+            DecoderChain(["inexistente"])
+
+    def test_read_qrcode_uses_given_chain(self, chain_of):
+        """Testa que QRCodeService.read_qrcode usa a cadeia informada."""
+        image = QRCodeService.generate_qrcode("qualquer").read()
+        assert QRCodeService.read_qrcode(image, chain_of(FixedDecoder("a", "fixo"))) == "fixo"
+
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+def test_installed_backend_reads_generated_qrcode(name):
+    """Testa cada backend instalado com um QR Code gerado pelo serviço."""
+    try:
+        backend = load_backend(name)
+    except DecoderUnavailable as e:
+        pytest.skip(str(e))
+
+    code = QRCodeService.generate_unique_code()
+    image = QRCodeService.generate_qrcode(code).read()
+    [result] = evaluate([backend], [(image, code)])
+    assert result.successes == [True]
+
+
+class TestRecommendation:
+    """Testes para a estimativa e a recomendação da cadeia."""
+
+    def test_estimate_chain_cost(self):
+        """Testa que o custo inclui os backends tentados até o acerto."""
+        fast = measurement("rapido", [True, False], 1)
+        slow = measurement("lento", [True, True], 10)
+
+        estimate = estimate_chain([fast, slow])
+        assert estimate.success_rate == 1.0
+        assert estimate.mean_ms == pytest.approx((1 + (1 + 10)) / 2)
+
+    def test_fast_backend_first_with_fallback(self):
+        """Testa que o backend rápido vem primeiro e o robusto cobre as falhas."""
+        fast = measurement("rapido", [True] * 9 + [False], 1)
+        slow = measurement("lento", [True] * 10, 10)
+
+        chain = recommend_chain([slow, fast])
+        assert chain.names == ("rapido", "lento")
+        assert chain.success_rate == 1.0
+
+    def test_tolerance_drops_slow_fallback(self):
+        """Testa que a tolerância troca um pouco de acerto por velocidade."""
+        fast = measurement("rapido", [True] * 9 + [False], 1)
+        slow = measurement("lento", [True] * 10, 10)
+
+        assert recommend_chain([slow, fast], tolerance=0.1).names == ("rapido",)
+
+    def test_useless_fallback_is_left_out(self):
+        """Testa que um backend que não recupera nenhuma falha fica de fora."""
+        best = measurement("melhor", [True] * 10, 2)
+        redundant = measurement("redundante", [True] * 5 + [False] * 5, 5)
+
+        assert recommend_chain([redundant, best]).names == ("melhor",)
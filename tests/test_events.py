@@ -0,0 +1,177 @@
+"""
+Testes para o difusor de eventos e o fluxo Server-Sent Events do painel.
+"""
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import httpx
+import pytest
+import uvicorn
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from app.api.events import EventBroadcaster, format_sse, get_event_broadcaster
+from app.database.database import Base, get_db
+from app.database.migrations import run_migrations
+from tests.conftest import database_url
+
+SQLALCHEMY_DATABASE_URL = database_url("test_events.db")
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+SUBSCRIBERS = 50
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def wait_until(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("Condição não atingida")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def server():
+    """Servidor uvicorn real, necessário para respostas em fluxo contínuo."""
+    broadcaster = EventBroadcaster()
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_event_broadcaster] = lambda: broadcaster
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    uvicorn_server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=uvicorn_server.run, daemon=True)
+    thread.start()
+    wait_until(lambda: uvicorn_server.started)
+
+    yield f"http://127.0.0.1:{port}/api/v1", broadcaster
+
+    uvicorn_server.should_exit = True
+    thread.join(10)
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(previous)
+
+
+class TestEventBroadcaster:
+    """Testes para EventBroadcaster."""
+
+    def test_fan_out_to_many_subscribers(self):
+        """Testa que todos os assinantes recebem todos os eventos, em ordem."""
+        broadcaster = EventBroadcaster()
+
+        async def scenario():
+            subscriptions = [broadcaster.subscribe() for _ in range(500)]
+            publisher = threading.Thread(target=lambda: [
+                broadcaster.publish("stats", {"n": n}) for n in range(20)
+            ])
+            publisher.start()
+
+            async def consume(subscription):
+                return [(await subscription.get(5))["data"]["n"] for _ in range(20)]
+
+            received = await asyncio.gather(*[consume(s) for s in subscriptions])
+            publisher.join()
+            for subscription in subscriptions:
+                subscription.close()
+            return received
+
+        received = asyncio.run(scenario())
+
+        assert all(events == list(range(20)) for events in received)
+        assert broadcaster.subscriber_count == 0
+
+    def test_slow_subscriber_is_dropped(self):
+        """Testa que um assinante que não consome é desconectado sem afetar os demais."""
+        broadcaster = EventBroadcaster(max_pending=2)
+
+        async def scenario():
+            slow = broadcaster.subscribe()
+            fast = broadcaster.subscribe()
+            received = []
+            for n in range(5):
+                broadcaster.publish("stats", {"n": n})
+                received.append((await fast.get(1))["data"]["n"])
+
+            with pytest.raises(ConnectionError):
+                await slow.get(1)
+            return received
+
+        assert asyncio.run(scenario()) == [0, 1, 2, 3, 4]
+
+    def test_timeout_returns_none(self):
+        """Testa que a espera sem eventos retorna None."""
+        async def scenario():
+            async with EventBroadcaster().subscribe() as subscription:
+                return await subscription.get(0.01)
+
+        assert asyncio.run(scenario()) is None
+
+    def test_format_sse(self):
+        """Testa a formatação no protocolo Server-Sent Events."""
+        assert format_sse("stats", {"total": 1}) == 'event: stats\ndata: {"total": 1}\n\n'
+
+
+class TestEventStream:
+    """Testes do endpoint /events com assinantes concorrentes."""
+
+    def test_many_dashboards_receive_live_events(self, server):
+        """Testa que dezenas de painéis recebem o resumo e os eventos de criação e validação."""
+        base_url, broadcaster = server
+
+        async def listen(client):
+            events = []
+            async with client.stream("GET", f"{base_url}/events") as response:
+                assert response.headers["content-type"].startswith("text/event-stream")
+                event_type = None
+                async for line in response.aiter_lines():
+                    if line.startswith("event: "):
+                        event_type = line[len("event: "):]
+                    elif line.startswith("data: "):
+                        events.append((event_type, json.loads(line[len("data: "):])))
+                        if event_type == "checkin":
+                            return events
+
+        async def scenario():
+            limits = httpx.Limits(max_connections=SUBSCRIBERS + 5)
+            async with httpx.AsyncClient(timeout=10, limits=limits) as client:
+                listeners = [asyncio.create_task(listen(client)) for _ in range(SUBSCRIBERS)]
+                while broadcaster.subscriber_count < SUBSCRIBERS:
+                    await asyncio.sleep(0.01)
+
+                created = await client.post(f"{base_url}/generate-qrcode", json={"data": "Ao vivo"})
+                files = {"file": ("qrcode.png", created.content, "image/png")}
+                await client.post(f"{base_url}/read-qrcode", files=files)
+
+                return created.headers["X-Invite-Code"], await asyncio.gather(*listeners)
+
+        invite_code, results = asyncio.run(scenario())
+
+        assert len(results) == SUBSCRIBERS
+        for events in results:
+            types = [event_type for event_type, _ in events]
+            assert types == ["summary", "stats", "checkin"]
+            assert set(events[0][1]) == {"total", "validated", "pending"}
+            assert events[1][1] == {"total": 1, "validated": 0, "pending": 1}
+            assert events[2][1]["invite_code"] == invite_code
+            assert events[2][1]["data"] == "Ao vivo"
+
+        wait_until(lambda: broadcaster.subscriber_count == 0)
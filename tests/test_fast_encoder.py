@@ -0,0 +1,75 @@
+"""
+Testes para o codificador especializado de QR Codes.
+"""
+import uuid
+
+import numpy as np
+import pytest
+import qrcode
+from qrcode import util
+
+from app.api import fast_encoder
+from app.api.qrcode_service import QRCodeService
+from app.api.signing import PayloadSigner
+
+ERROR_LEVELS = [
+    qrcode.constants.ERROR_CORRECT_L,
+    qrcode.constants.ERROR_CORRECT_M,
+    qrcode.constants.ERROR_CORRECT_Q,
+    qrcode.constants.ERROR_CORRECT_H,
+]
+
+
+def reference_modules(data, error_correction):
+    qr = qrcode.QRCode(version=1, error_correction=error_correction, box_size=10, border=4)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return np.array(qr.modules, dtype=bool)
+
+
+class TestFastEncoder:
+    """Testes para fast_encoder."""
+
+    @pytest.mark.parametrize("error_correction", ERROR_LEVELS)
+    def test_matches_generic_encoder_for_invite_codes(self, error_correction):
+        """Testa que a matriz é idêntica à do qrcode para códigos UUID."""
+        for _ in range(25):
+            data = str(uuid.uuid4())
+            expected = reference_modules(data, error_correction)
+            assert np.array_equal(fast_encoder.encode(data, error_correction), expected)
+
+    def test_matches_generic_encoder_for_signed_payloads(self):
+        """Testa conteúdos assinados, que usam outra versão do QR Code."""
+        signer = PayloadSigner({"k1": b"segredo"})
+        for _ in range(25):
+            data = signer.sign(str(uuid.uuid4()))
+            expected = reference_modules(data, qrcode.constants.ERROR_CORRECT_L)
+            assert np.array_equal(fast_encoder.encode(data), expected)
+
+    @pytest.mark.parametrize("data", [
+        "",
+        "Test QR Code Data",
+        "123456789012345678901234567890",
+        "CONVITE VIP 2025 ACESSO LIBERADO PORTAO 3",
+        "x" * 400,
+    ])
+    def test_matches_generic_encoder_for_other_data(self, data):
+        """Testa conteúdos arbitrários, com modos e versões diferentes."""
+        for error_correction in ERROR_LEVELS:
+            expected = reference_modules(data, error_correction)
+            assert np.array_equal(fast_encoder.encode(data, error_correction), expected)
+
+    def test_mask_penalties_match_lost_point(self):
+        """Testa que as penalidades vetorizadas coincidem com util.lost_point."""
+        rng = np.random.default_rng(0)
+        stack = rng.integers(0, 2, size=(8, 29, 29), dtype=np.uint8)
+
+        expected = [util.lost_point(matrix.astype(bool).tolist()) for matrix in stack]
+        assert fast_encoder.mask_penalties(stack) == expected
+
+    def test_pyzbar_roundtrip(self):
+        """Testa que os QR Codes gerados são lidos com o conteúdo original."""
+        for _ in range(10):
+            data = str(uuid.uuid4())
+            image = QRCodeService.generate_qrcode(data)
+            assert QRCodeService.read_qrcode(image.read()) == data
@@ -0,0 +1,230 @@
+"""
+Testes para a Idempotency-Key na geração de QR Codes.
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from app.api import routes
+from app.api.idempotency_service import IdempotencyService
+from app.database.database import Base, get_db
+from app.database.migrations import run_migrations
+from app.models.idempotency_key import IdempotencyKey
+from app.models.invite import Invite
+from tests.conftest import database_url
+
+SQLALCHEMY_DATABASE_URL = database_url("test_idempotency.db")
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def client():
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(previous)
+
+
+def count_invites(data):
+    db = TestingSessionLocal()
+    try:
+        return db.scalar(select(func.count()).select_from(Invite).where(Invite.data == data))
+    finally:
+        db.close()
+
+
+class TestIdempotencyKey:
+    """Testes para repetição de requisições com a mesma chave."""
+
+    def test_retry_replays_original(self, client):
+        """Testa que a repetição devolve o mesmo convite e a mesma imagem."""
+        data = f"Convite {uuid.uuid4()}"
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+        first = client.post("/api/v1/generate-qrcode", json={"data": data}, headers=headers)
+        second = client.post("/api/v1/generate-qrcode", json={"data": data}, headers=headers)
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert "Idempotent-Replayed" not in first.headers
+        assert second.headers["Idempotent-Replayed"] == "true"
+        assert second.headers["X-Invite-Code"] == first.headers["X-Invite-Code"]
+        assert second.headers["X-Invite-ID"] == first.headers["X-Invite-ID"]
+        assert second.content == first.content
+        assert count_invites(data) == 1
+
+    def test_concurrent_duplicates_create_one_invite(self):
+        """Testa que requisições simultâneas com a mesma chave criam um único convite."""
+        data = f"Convite {uuid.uuid4()}"
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(*[
+                    client.post("/api/v1/generate-qrcode", json={"data": data}, headers=headers)
+                    for _ in range(20)
+                ])
+
+        previous = dict(app.dependency_overrides)
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            responses = asyncio.run(scenario())
+        finally:
+            app.dependency_overrides.clear()
+            app.dependency_overrides.update(previous)
+
+        assert [r.status_code for r in responses] == [200] * 20
+        assert len({r.headers["X-Invite-Code"] for r in responses}) == 1
+        assert len({r.headers["X-Invite-ID"] for r in responses}) == 1
+        assert len({r.content for r in responses}) == 1
+        assert sum("Idempotent-Replayed" not in r.headers for r in responses) == 1
+        assert count_invites(data) == 1
+
+    def test_failure_after_insert_keeps_key(self, client, monkeypatch):
+        """Testa que uma falha depois da inserção não libera a chave nem duplica o convite."""
+        data = f"Convite {uuid.uuid4()}"
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+        def failing_render(payload):
+            raise RuntimeError("falha na renderização")
+
+        monkeypatch.setattr(routes.qr_service, "generate_qrcode", failing_render)
+        first = client.post("/api/v1/generate-qrcode", json={"data": data}, headers=headers)
+        assert first.status_code == 500
+        monkeypatch.undo()
+
+        second = client.post("/api/v1/generate-qrcode", json={"data": data}, headers=headers)
+        assert second.status_code == 200
+        assert second.headers["Idempotent-Replayed"] == "true"
+        assert count_invites(data) == 1
+
+    def test_same_key_different_body(self, client):
+        """Testa recusa quando a chave é reutilizada com outros dados."""
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+        client.post("/api/v1/generate-qrcode", json={"data": "Primeiro"}, headers=headers)
+
+        response = client.post("/api/v1/generate-qrcode", json={"data": "Segundo"}, headers=headers)
+        assert response.status_code == 422
+
+    def test_expired_key_can_be_reused(self, client):
+        """Testa que uma chave expirada gera um novo convite."""
+        data = f"Convite {uuid.uuid4()}"
+        key = str(uuid.uuid4())
+        headers = {"Idempotency-Key": key}
+        first = client.post("/api/v1/generate-qrcode", json={"data": data}, headers=headers)
+
+        db = TestingSessionLocal()
+        db.get(IdempotencyKey, key).expires_at = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+        db.close()
+
+        second = client.post("/api/v1/generate-qrcode", json={"data": data}, headers=headers)
+        assert second.status_code == 200
+        assert "Idempotent-Replayed" not in second.headers
+        assert second.headers["X-Invite-Code"] != first.headers["X-Invite-Code"]
+        assert count_invites(data) == 2
+
+    def test_without_key(self, client):
+        """Testa que sem a chave cada requisição cria um convite."""
+        data = f"Convite {uuid.uuid4()}"
+        client.post("/api/v1/generate-qrcode", json={"data": data})
+        client.post("/api/v1/generate-qrcode", json={"data": data})
+        assert count_invites(data) == 2
+
+    def test_invalid_key(self, client):
+        """Testa recusa de chave longa demais."""
+        response = client.post(
+            "/api/v1/generate-qrcode",
+            json={"data": "Convite"},
+            headers={"Idempotency-Key": "x" * 256}
+        )
+        assert response.status_code == 400
+
+
+class TestIdempotencyWait:
+    """Testes para a espera pela requisição original."""
+
+    def test_wait_only_reads_the_key(self, monkeypatch):
+        """Testa que a espera não tenta reservar a chave de novo a cada consulta."""
+        key = str(uuid.uuid4())
+        fingerprint = IdempotencyService.fingerprint("original")
+        ttl = timedelta(hours=1)
+        owner = TestingSessionLocal()
+        assert IdempotencyService.claim(owner, key, fingerprint, ttl) is None
+
+        claims = []
+        original_claim = IdempotencyService.claim
+
+        def counting_claim(*args):
+            claims.append(args)
+            return original_claim(*args)
+
+        monkeypatch.setattr(IdempotencyService, "claim", staticmethod(counting_claim))
+
+        async def finish_original():
+            await asyncio.sleep(IdempotencyService.POLL_INTERVAL * 10)
+            IdempotencyService.complete(owner, key, 1, "codigo-original")
+            owner.commit()
+
+        async def scenario():
+            db = TestingSessionLocal()
+            try:
+                record, _ = await asyncio.gather(
+                    IdempotencyService.begin(db, key, fingerprint, ttl, wait_timeout=5),
+                    finish_original(),
+                )
+                return record
+            finally:
+                db.close()
+
+        record = asyncio.run(scenario())
+        owner.close()
+
+        assert record.invite_code == "codigo-original"
+        assert len(claims) == 1
+
+    def test_claim_retries_when_key_is_released(self):
+        """Testa que a chave liberada entre a inserção e a leitura é reservada de novo."""
+        key = str(uuid.uuid4())
+        ttl = timedelta(hours=1)
+        owner = TestingSessionLocal()
+        assert IdempotencyService.claim(owner, key, "original", ttl) is None
+
+        db = TestingSessionLocal()
+        original_get = db.get
+
+        def get_after_release(*args, **kwargs):
+            # A original falha e libera a chave logo após a inserção conflitante
+            IdempotencyService.release(owner, key)
+            db.get = original_get
+            return original_get(*args, **kwargs)
+
+        db.get = get_after_release
+        try:
+            assert IdempotencyService.claim(db, key, "repeticao", ttl) is None
+            record = db.get(IdempotencyKey, key, populate_existing=True)
+            assert record.fingerprint == "repeticao"
+        finally:
+            db.close()
+            owner.close()
@@ -0,0 +1,121 @@
+"""
+Testes para a importação de convidados em CSV.
+"""
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from app.api.import_service import ImportService
+from app.database.database import Base, get_db
+from app.database.migrations import run_migrations
+from app.models.invite import Invite
+from tests.conftest import database_url
+
+SQLALCHEMY_DATABASE_URL = database_url("test_import.db")
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def client():
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(previous)
+
+
+def upload(client, content, filename="convidados.csv", **params):
+    files = {"file": (filename, content.encode("utf-8"), "text/csv")}
+    return client.post("/api/v1/invites/import", files=files, params=params)
+
+
+def parse(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+class TestImportService:
+    """Testes para ImportService."""
+
+    def test_rows_are_written_in_chunks(self):
+        """Testa gravação em blocos com sequências de alteração distintas."""
+        csv_text = "nome\n" + "".join(f"Convidado {i}\n" for i in range(5))
+        reader = ImportService.read_csv(io.StringIO(csv_text))
+
+        db = TestingSessionLocal()
+        try:
+            results = list(ImportService.import_rows(db, reader, "nome", chunk_size=2))
+            codes = [r["invite_code"] for r in results if "invite_code" in r]
+
+            invites = db.query(Invite).filter(Invite.invite_code.in_(codes)).all()
+            assert sorted(invite.data for invite in invites) == [f"Convidado {i}" for i in range(5)]
+            assert len({invite.change_seq for invite in invites}) == 5
+            assert all(invite.is_validated is False for invite in invites)
+            assert results[-1] == {"summary": {"created": 5, "errors": 0}}
+        finally:
+            db.close()
+
+    def test_missing_data_column(self):
+        """Testa erro quando a coluna informada não existe."""
+        reader = ImportService.read_csv(io.StringIO("nome\nAna\n"))
+        with pytest.raises(ValueError):
+            ImportService.import_rows(None, reader, "email")
+
+
+class TestImportAPI:
+    """Testes para o endpoint de importação."""
+
+    def test_import_with_data_column(self, client):
+        """Testa importação usando uma coluna como dados do convite."""
+        response = upload(client, "nome;mesa\nAna;1\nBruno;2\n", data_column="nome", delimiter=";")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        results = parse(response)
+        assert [r["row"] for r in results[:-1]] == [2, 3]
+        assert results[-1] == {"summary": {"created": 2, "errors": 0}}
+
+        invite = client.get(f"/api/v1/invites/{results[1]['invite_code']}").json()
+        assert invite["data"] == "Bruno"
+
+    def test_import_whole_row_as_json(self, client):
+        """Testa que, sem coluna, a linha inteira é gravada como JSON."""
+        results = parse(upload(client, "nome,email\nÂngela,angela@example.com\n"))
+
+        invite = client.get(f"/api/v1/invites/{results[0]['invite_code']}").json()
+        assert json.loads(invite["data"]) == {"nome": "Ângela", "email": "angela@example.com"}
+
+    def test_per_row_errors(self, client):
+        """Testa que linhas malformadas são relatadas sem interromper a importação."""
+        results = parse(upload(client, "nome,mesa\nAna,1\nBruno\nCarla,3,extra\nDiego,4\n"))
+
+        errors = [r for r in results if "error" in r]
+        assert [r["row"] for r in errors] == [3, 4]
+        assert results[-1] == {"summary": {"created": 2, "errors": 2}}
+
+    def test_unknown_data_column(self, client):
+        """Testa resposta 400 para coluna inexistente."""
+        response = upload(client, "nome\nAna\n", data_column="email")
+        assert response.status_code == 400
+
+    def test_excel_is_rejected(self, client):
+        """Testa que planilhas Excel são recusadas com orientação."""
+        response = upload(client, "qualquer", filename="convidados.xlsx")
+        assert response.status_code == 400
+        assert "csv" in response.json()["detail"].lower()
@@ -0,0 +1,164 @@
+"""
+Testes para as migrações de esquema e o tipo BinaryUUID.
+"""
+import sqlite3
+import uuid
+from datetime import datetime
+
+from sqlalchemy import create_engine, inspect, LargeBinary
+from sqlalchemy.orm import Session
+
+from app.database.database import Base
+from app.database.migrations import run_migrations
+from app.models.checkin_rollup import CheckinRollup, epoch_minute
+from app.models.invite import Invite
+from app.models.types import BinaryUUID
+
+LEGACY_SCHEMA = """
+CREATE TABLE invites (
+    id INTEGER NOT NULL PRIMARY KEY,
+    invite_code VARCHAR NOT NULL,
+    data VARCHAR,
+    qr_code_path VARCHAR,
+    created_at DATETIME,
+    is_validated BOOLEAN,
+    validated_at DATETIME
+);
+CREATE UNIQUE INDEX ix_invites_invite_code ON invites (invite_code);
+CREATE INDEX ix_invites_id ON invites (id);
+"""
+
+
+class TestBinaryUUID:
+    """Testes para o tipo BinaryUUID."""
+
+    def test_bind_uuid_string(self):
+        """Testa conversão do código textual para 16 bytes."""
+        code = uuid.uuid4()
+        assert BinaryUUID().process_bind_param(str(code), None) == code.bytes
+
+    def test_bind_accepts_uppercase(self):
+        """Testa que formas não canônicas são normalizadas."""
+        code = uuid.uuid4()
+        assert BinaryUUID().process_bind_param(str(code).upper(), None) == code.bytes
+
+    def test_result_is_canonical_string(self):
+        """Testa que o valor lido é a string canônica."""
+        code = uuid.uuid4()
+        assert BinaryUUID().process_result_value(code.bytes, None) == str(code)
+
+    def test_non_uuid_value(self):
+        """Testa que valores que não são UUIDs são preservados."""
+        stored = BinaryUUID().process_bind_param("codigo-antigo", None)
+        assert len(stored) != 16
+        assert BinaryUUID().process_result_value(stored, None) == "codigo-antigo"
+
+
+class TestMigrations:
+    """Testes para a migração de bancos existentes."""
+
+    def _legacy_engine(self, tmp_path, codes):
+        path = tmp_path / "legacy.db"
+        connection = sqlite3.connect(path)
+        connection.executescript(LEGACY_SCHEMA)
+        connection.executemany(
+            "INSERT INTO invites (invite_code, data, is_validated) VALUES (?, ?, ?)",
+            [(code, f"Convite {index}", index % 2) for index, code in enumerate(codes)],
+        )
+        connection.commit()
+        connection.close()
+
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(bind=engine)
+        return engine
+
+    def test_legacy_database_is_migrated(self, tmp_path):
+        """Testa conversão dos códigos e numeração da sequência de alterações."""
+        codes = [str(uuid.uuid4()) for _ in range(5)]
+        engine = self._legacy_engine(tmp_path, codes)
+
+        run_migrations(engine)
+
+        columns = {c["name"]: c["type"] for c in inspect(engine).get_columns("invites")}
+        assert isinstance(columns["invite_code"], LargeBinary)
+        assert "change_seq" in columns
+
+        with Session(engine) as db:
+            invites = db.query(Invite).order_by(Invite.id).all()
+            assert [invite.invite_code for invite in invites] == codes
+            assert [invite.change_seq for invite in invites] == [1, 2, 3, 4, 5]
+            assert db.query(Invite).filter(Invite.invite_code == codes[2]).one().data == "Convite 2"
+
+            db.add(Invite(invite_code=str(uuid.uuid4())))
+            db.commit()
+            assert db.query(Invite).order_by(Invite.id.desc()).first().change_seq == 6
+
+    def test_autoincrement_and_time_indexes(self, tmp_path):
+        """Testa que a tabela migrada não reutiliza IDs e tem os índices de data."""
+        engine = self._legacy_engine(tmp_path, [str(uuid.uuid4()) for _ in range(3)])
+
+        run_migrations(engine)
+
+        indexes = {index["name"] for index in inspect(engine).get_indexes("invites")}
+        assert {"ix_invites_created_at", "ix_invites_validated_at"} <= indexes
+
+        with Session(engine) as db:
+            db.query(Invite).filter(Invite.id == 3).delete()
+            db.commit()
+            db.add(Invite(invite_code=str(uuid.uuid4())))
+            db.commit()
+            assert db.query(Invite).order_by(Invite.id.desc()).first().id == 4
+
+    def test_checkin_rollups_are_backfilled(self, tmp_path):
+        """Testa que validações anteriores às séries são contabilizadas."""
+        engine = self._legacy_engine(tmp_path, [str(uuid.uuid4()) for _ in range(4)])
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                "UPDATE invites SET validated_at = '2025-03-15 19:00:30.000000' WHERE is_validated"
+            )
+
+        run_migrations(engine)
+
+        with Session(engine) as db:
+            rollups = db.query(CheckinRollup).all()
+            assert [(r.minute, r.count) for r in rollups] == [
+                (epoch_minute(datetime(2025, 3, 15, 19, 0)), 2)
+            ]
+
+    def test_checkin_rollups_are_backfilled_once(self, tmp_path):
+        """Testa que o cálculo das séries não se repete nas próximas inicializações."""
+        engine = self._legacy_engine(tmp_path, [str(uuid.uuid4()) for _ in range(2)])
+        with engine.begin() as connection:
+            connection.exec_driver_sql("UPDATE invites SET is_validated = 0")
+        run_migrations(engine)
+
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                "UPDATE invites SET is_validated = 1, validated_at = '2025-03-15 19:00:30.000000'"
+            )
+        run_migrations(engine)
+
+        with Session(engine) as db:
+            assert db.query(CheckinRollup).count() == 0
+
+    def test_event_id_is_added(self, tmp_path):
+        """Testa que os convites existentes ficam no banco principal, sem evento."""
+        engine = self._legacy_engine(tmp_path, [str(uuid.uuid4()) for _ in range(2)])
+
+        run_migrations(engine)
+
+        for table in ("invites", "invites_archive"):
+            assert "event_id" in {c["name"] for c in inspect(engine).get_columns(table)}
+        with Session(engine) as db:
+            assert {invite.event_id for invite in db.query(Invite)} == {None}
+
+    def test_migrations_are_idempotent(self, tmp_path):
+        """Testa que executar as migrações novamente não altera os dados."""
+        codes = [str(uuid.uuid4())]
+        engine = self._legacy_engine(tmp_path, codes)
+
+        run_migrations(engine)
+        run_migrations(engine)
+
+        with Session(engine) as db:
+            assert [invite.invite_code for invite in db.query(Invite)] == codes
@@ -0,0 +1,230 @@
+"""
+Testes para as partições de convites por evento.
+"""
+import os
+import sqlite3
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from app.api.qrcode_service import QRCodeService
+from app.database.database import Base, get_db
+from app.database.migrations import run_migrations
+from app.database.partitions import EventStateError, PartitionManager, get_partition_manager
+from app.models.event import Event
+from app.models.invite import Invite
+from tests.conftest import database_url
+
+SQLALCHEMY_DATABASE_URL = database_url("test_partitions.db")
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def partitions(tmp_path):
+    db = TestingSessionLocal()
+    db.query(Event).delete()
+    db.commit()
+    db.close()
+
+    manager = PartitionManager(str(tmp_path), TestingSessionLocal)
+    yield manager
+    manager.dispose()
+
+
+@pytest.fixture
+def client(partitions):
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_partition_manager] = lambda: partitions
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(previous)
+
+
+def create_invite(client, event_id, data="Convidado"):
+    response = client.post(f"/api/v1/events/{event_id}/generate-qrcode", json={"data": data})
+    assert response.status_code == 200
+    return response.headers["X-Invite-Code"], response.content
+
+
+class TestEventLifecycle:
+    """Testes para cadastro, encerramento e arquivamento de eventos."""
+
+    def test_create_event(self, client, partitions):
+        """Testa o cadastro e a criação do arquivo da partição."""
+        response = client.post("/api/v1/events", json={"id": "festival", "name": "Festival"})
+        assert response.status_code == 201
+        assert response.json()["status"] == "open"
+        assert os.path.exists(partitions.path("festival"))
+
+        assert client.post("/api/v1/events", json={"id": "festival"}).status_code == 409
+        assert client.post("/api/v1/events", json={"id": "../fora"}).status_code == 400
+        assert client.get("/api/v1/events/festival").json()["name"] == "Festival"
+        assert client.get("/api/v1/events/inexistente").status_code == 404
+
+    def test_closed_event_is_read_only(self, client):
+        """Testa que um evento encerrado aceita leituras e recusa escritas."""
+        client.post("/api/v1/events", json={"id": "palestra"})
+        code, image = create_invite(client, "palestra")
+
+        assert client.post("/api/v1/events/palestra/close").json()["status"] == "closed"
+        response = client.post("/api/v1/events/palestra/generate-qrcode", json={"data": "Novo"})
+        assert response.status_code == 409
+        files = {"file": ("qrcode.png", image, "image/png")}
+        assert client.post("/api/v1/events/palestra/read-qrcode", files=files).status_code == 409
+        assert client.get(f"/api/v1/events/palestra/invites/{code}").status_code == 200
+
+        assert client.post("/api/v1/events/palestra/open").json()["status"] == "open"
+        assert client.post("/api/v1/events/palestra/read-qrcode", files=files).json()["success"]
+
+    def test_archive_requires_closed_event(self, client, partitions):
+        """Testa o arquivamento de um evento encerrado e a reabertura."""
+        client.post("/api/v1/events", json={"id": "show"})
+        code, _ = create_invite(client, "show")
+
+        assert client.post("/api/v1/events/show/archive").status_code == 409
+        client.post("/api/v1/events/show/close")
+        response = client.post("/api/v1/events/show/archive")
+        assert response.status_code == 200
+        assert response.json()["archived_at"] is not None
+        assert not os.path.exists(partitions.path("show"))
+        assert os.path.exists(partitions.archived_path("show"))
+        assert client.get(f"/api/v1/events/show/invites/{code}").status_code == 409
+
+        client.post("/api/v1/events/show/open")
+        assert os.path.exists(partitions.path("show"))
+        assert client.get(f"/api/v1/events/show/invites/{code}").status_code == 200
+
+    def test_unknown_event_routes(self, client):
+        """Testa 404 nas rotas de um evento não cadastrado."""
+        assert client.get("/api/v1/events/inexistente/invites").status_code == 404
+        assert client.post("/api/v1/events/inexistente/close").status_code == 404
+
+
+class TestSharedRegistry:
+    """Testes para transições feitas por outro processo (CLI ou outro worker)."""
+
+    def test_other_process_transitions_are_seen(self, partitions):
+        """Testa que escritas veem na hora o encerramento e leituras veem o arquivamento."""
+        server = PartitionManager(partitions.directory, TestingSessionLocal, status_ttl=60)
+        try:
+            partitions.create("compartilhado")
+            server.session("compartilhado", write=True).close()
+
+            partitions.close("compartilhado")
+            with pytest.raises(EventStateError):
+                server.session("compartilhado", write=True)
+            server.session("compartilhado").close()
+
+            partitions.archive("compartilhado")
+            server.status_ttl = 0
+            with pytest.raises(EventStateError):
+                server.session("compartilhado")
+            assert not os.path.exists(partitions.path("compartilhado"))
+        finally:
+            server.dispose()
+
+    def test_archived_partition_is_not_recreated(self, partitions):
+        """Testa que um estado desatualizado não cria um arquivo vazio no lugar do arquivado."""
+        server = PartitionManager(partitions.directory, TestingSessionLocal, status_ttl=60)
+        try:
+            partitions.create("corrida")
+            assert server.status("corrida") == "open"
+
+            partitions.close("corrida")
+            partitions.archive("corrida")
+
+            with pytest.raises(EventStateError):
+                server.session("corrida")
+            assert not os.path.exists(partitions.path("corrida"))
+            assert os.path.exists(partitions.archived_path("corrida"))
+        finally:
+            server.dispose()
+
+
+class TestEventScopedRoutes:
+    """Testes para o roteamento dos convites para a partição do evento."""
+
+    def test_invites_are_isolated_per_event(self, client, partitions):
+        """Testa que cada evento vê apenas os próprios convites."""
+        client.post("/api/v1/events", json={"id": "evento-a"})
+        client.post("/api/v1/events", json={"id": "evento-b"})
+        code_a, _ = create_invite(client, "evento-a", "Ana")
+        create_invite(client, "evento-b", "Bruno")
+
+        invites = client.get("/api/v1/events/evento-a/invites").json()
+        assert [invite["data"] for invite in invites] == ["Ana"]
+        assert invites[0]["event_id"] == "evento-a"
+
+        assert client.get(f"/api/v1/events/evento-b/invites/{code_a}").status_code == 404
+        assert client.get(f"/api/v1/invites/{code_a}").status_code == 404
+
+        db = TestingSessionLocal()
+        assert db.query(Invite).filter(Invite.event_id.isnot(None)).count() == 0
+        db.close()
+
+    def test_validation_and_stats_per_event(self, client):
+        """Testa a validação e o resumo dentro da partição."""
+        client.post("/api/v1/events", json={"id": "congresso"})
+        code, image = create_invite(client, "congresso")
+        create_invite(client, "congresso")
+
+        files = {"file": ("qrcode.png", image, "image/png")}
+        response = client.post("/api/v1/events/congresso/read-qrcode", files=files)
+        assert response.json()["invite_code"] == code
+
+        summary = client.get("/api/v1/events/congresso/stats/summary").json()
+        assert summary == {"total": 2, "validated": 1, "pending": 1}
+
+    def test_import_sets_event_id(self, client):
+        """Testa a importação de CSV na partição do evento."""
+        client.post("/api/v1/events", json={"id": "feira"})
+        csv_data = "nome\nAna\nBruno\n".encode()
+        response = client.post(
+            "/api/v1/events/feira/invites/import?data_column=nome",
+            files={"file": ("lista.csv", csv_data, "text/csv")}
+        )
+        assert response.status_code == 200
+
+        invites = client.get("/api/v1/events/feira/invites").json()
+        assert sorted(invite["data"] for invite in invites) == ["Ana", "Bruno"]
+        assert {invite["event_id"] for invite in invites} == {"feira"}
+
+    def test_write_lock_is_per_event(self, client, partitions):
+        """Testa que uma escrita longa em um evento não bloqueia outro."""
+        client.post("/api/v1/events", json={"id": "grande"})
+        client.post("/api/v1/events", json={"id": "pequeno"})
+
+        # Segura a trava de escrita do arquivo do evento grande
+        holder = sqlite3.connect(partitions.path("grande"))
+        holder.execute("BEGIN IMMEDIATE")
+        try:
+            start = time.perf_counter()
+            create_invite(client, "pequeno")
+            assert time.perf_counter() - start < 1.0
+        finally:
+            holder.rollback()
+            holder.close()
+
+
+def test_qrcode_image_is_valid(client):
+    """Testa que o QR Code gerado na partição é legível."""
+    client.post("/api/v1/events", json={"id": "leitura"})
+    code, image = create_invite(client, "leitura")
+    assert QRCodeService.read_qrcode(image) == code
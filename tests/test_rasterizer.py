@@ -0,0 +1,50 @@
+"""
+Testes para a rasterização vetorizada dos QR Codes.
+"""
+import uuid
+
+import numpy as np
+import pytest
+import qrcode
+
+from app.api import fast_encoder
+from app.api.rasterizer import rasterize
+
+
+def reference_image(data, box_size, border):
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=box_size,
+        border=border,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr.make_image(fill_color="black", back_color="white").get_image()
+
+
+class TestRasterizer:
+    """Testes para rasterize."""
+
+    @pytest.mark.parametrize("box_size,border", [(10, 4), (1, 0), (3, 1), (7, 2)])
+    def test_pixel_identical_to_qrcode(self, box_size, border):
+        """Testa que a imagem é idêntica, pixel a pixel, à do qrcode."""
+        data = str(uuid.uuid4())
+        expected = reference_image(data, box_size, border)
+
+        image = rasterize(fast_encoder.encode(data), box_size, border)
+
+        assert image.mode == expected.mode == "1"
+        assert image.size == expected.size
+        assert np.array_equal(np.asarray(image), np.asarray(expected))
+
+    def test_dark_modules_are_black(self):
+        """Testa a cor e a posição de cada módulo."""
+        modules = np.array([[True, False], [False, True]])
+
+        pixels = np.asarray(rasterize(modules, 2, 1))
+
+        assert pixels.shape == (8, 8)
+        assert not pixels[2:4, 2:4].any()
+        assert pixels[2:4, 4:6].all()
+        assert pixels[0].all() and pixels[-1].all()
@@ -0,0 +1,184 @@
+"""
+Testes para o registro de leituras com escrita adiada.
+"""
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from app.api.qrcode_service import QRCodeService
+from app.database.database import Base, get_db
+from app.database.migrations import run_migrations
+from app.database.scan_log import ScanLog, get_scan_log
+from app.models.scan_event import ScanEvent
+from tests.conftest import database_url
+
+SQLALCHEMY_DATABASE_URL = database_url("test_scan_log.db")
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def count_scans(**filters):
+    db = TestingSessionLocal()
+    try:
+        return db.query(ScanEvent).filter_by(**filters).count()
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def scan_log():
+    log = ScanLog(TestingSessionLocal, max_batch_size=50, flush_interval_ms=60000)
+    yield log
+    log.stop()
+
+
+@pytest.fixture
+def client(scan_log):
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_scan_log] = lambda: scan_log
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(previous)
+
+
+class FailingSession:
+    """Sessão que falha em toda gravação, como um banco indisponível."""
+
+    def execute(self, *args, **kwargs):
+        raise RuntimeError("banco indisponível")
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class TestScanLog:
+    """Testes para o buffer e a gravação em lote."""
+
+    def test_record_is_buffered_until_flush(self, scan_log):
+        """Testa que a leitura só chega ao banco na gravação do buffer."""
+        code = str(uuid.uuid4())
+        scan_log.record("validated", code, gate_id="portaria-1", decode_ms=12.5)
+
+        assert scan_log.pending == 1
+        assert count_scans(invite_code=code) == 0
+
+        assert scan_log.flush() == 1
+        assert scan_log.pending == 0
+        assert count_scans(invite_code=code, gate_id="portaria-1") == 1
+
+    def test_full_batch_is_written_by_background_thread(self):
+        """Testa que um lote completo é gravado sem esperar o intervalo."""
+        gate = str(uuid.uuid4())
+        log = ScanLog(TestingSessionLocal, max_batch_size=10, flush_interval_ms=60000)
+        try:
+            for _ in range(25):
+                log.record("not_found", gate_id=gate)
+
+            deadline = time.monotonic() + 5
+            while log.events_written < 20 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            # Os lotes completos não esperam o intervalo de 60s
+            assert log.events_written >= 20
+            assert log.batches_flushed >= 2
+        finally:
+            log.stop()
+        assert count_scans(gate_id=gate) == 25
+
+    def test_full_buffer_drops_and_counts(self):
+        """Testa que o excedente de `max_pending` é descartado sem bloquear."""
+        log = ScanLog(TestingSessionLocal, max_batch_size=100, max_pending=3)
+        for _ in range(5):
+            log.record("error")
+        assert log.pending == 3
+        assert log.dropped == 2
+        log.stop()
+
+    def test_failed_write_keeps_batch(self):
+        """Testa que um lote que falhou volta ao buffer para a próxima tentativa."""
+        log = ScanLog(FailingSession, max_batch_size=100, flush_interval_ms=60000)
+        log.record("validated", "abc")
+        log.record("validated", "def")
+
+        assert log.flush() == 0
+        assert log.pending == 2
+        assert log.events_written == 0
+
+        log._session_factory = TestingSessionLocal
+        assert log.flush() == 2
+        log.stop()
+
+    def test_stop_writes_pending(self):
+        """Testa que o encerramento grava as leituras pendentes."""
+        code = str(uuid.uuid4())
+        log = ScanLog(TestingSessionLocal, flush_interval_ms=60000)
+        log.record("already_validated", code)
+        log.stop()
+        assert count_scans(invite_code=code) == 1
+
+
+class TestReadQRCodeAudit:
+    """Testes para o registro das leituras em POST /read-qrcode."""
+
+    def test_outcomes_are_recorded(self, client, scan_log):
+        """Testa o registro de cada resultado com a portaria informada."""
+        gate = str(uuid.uuid4())
+        headers = {"X-Gate-ID": gate}
+        response = client.post("/api/v1/generate-qrcode", json={"data": "Ana"})
+        code = response.headers["X-Invite-Code"]
+        files = {"file": ("qrcode.png", response.content, "image/png")}
+
+        client.post("/api/v1/read-qrcode", files=files, headers=headers)
+        client.post("/api/v1/read-qrcode", files=files, headers=headers)
+        unknown = QRCodeService.generate_qrcode(str(uuid.uuid4()))
+        client.post(
+            "/api/v1/read-qrcode",
+            files={"file": ("qrcode.png", unknown, "image/png")},
+            headers=headers
+        )
+        scan_log.flush()
+
+        scans = client.get(f"/api/v1/scans?gate_id={gate}").json()
+        assert [scan["outcome"] for scan in scans] == [
+            "not_found", "already_validated", "validated"
+        ]
+        assert scans[-1]["invite_code"] == code
+        assert all(scan["decode_ms"] > 0 for scan in scans)
+        assert all(scan["event_id"] is None for scan in scans)
+
+    def test_scans_filters(self, client, scan_log):
+        """Testa os filtros da consulta de leituras."""
+        code = str(uuid.uuid4())
+        scan_log.record("validated", code, gate_id="portaria-a")
+        scan_log.record("already_validated", code, gate_id="portaria-b")
+        scan_log.record("validated", code, gate_id="portaria-a", event_id="outro")
+        scan_log.flush()
+
+        scans = client.get(f"/api/v1/scans?invite_code={code}").json()
+        assert len(scans) == 2
+        scans = client.get(f"/api/v1/scans?invite_code={code}&outcome=validated").json()
+        assert [scan["gate_id"] for scan in scans] == ["portaria-a"]
+        scans = client.get(f"/api/v1/scans?invite_code={code}&limit=1").json()
+        assert [scan["outcome"] for scan in scans] == ["already_validated"]
+
+        assert client.get("/api/v1/scans?outcome=desconhecido").status_code == 400
+        assert client.get("/api/v1/scans?limit=0").status_code == 400
@@ -0,0 +1,104 @@
+"""
+Testes para a assinatura HMAC dos QR Codes.
+"""
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from app.api.qrcode_service import QRCodeService
+from app.api.signing import PayloadSigner, get_payload_signer
+
+
+@pytest.fixture
+def signer():
+    return PayloadSigner({"k2": b"segredo-novo", "k1": b"segredo-antigo"})
+
+
+@pytest.fixture
+def client(signer):
+    app.dependency_overrides[get_payload_signer] = lambda: signer
+    yield TestClient(app)
+    del app.dependency_overrides[get_payload_signer]
+
+
+class TestPayloadSigner:
+    """Testes para PayloadSigner."""
+
+    def test_sign_and_verify(self, signer):
+        """Testa que um conteúdo assinado é verificado."""
+        invite_code = str(uuid.uuid4())
+        payload = signer.sign(invite_code)
+
+        assert payload.startswith(f"{invite_code}.k2.")
+        assert signer.verify(payload) == invite_code
+
+    def test_tampered_payload_is_rejected(self, signer):
+        """Testa que código ou assinatura alterados são rejeitados."""
+        payload = signer.sign(str(uuid.uuid4()))
+        _, key_id, mac = payload.split(".")
+
+        assert signer.verify(f"{uuid.uuid4()}.{key_id}.{mac}") is None
+        assert signer.verify(payload[:-1] + ("A" if payload[-1] != "A" else "B")) is None
+        assert signer.verify(payload.replace(".k2.", ".k9.")) is None
+        assert signer.verify("lixo.qualquer") is None
+
+    def test_key_rotation(self, signer):
+        """Testa que conteúdos assinados pela chave anterior continuam válidos."""
+        old_signer = PayloadSigner({"k1": b"segredo-antigo"})
+        invite_code = str(uuid.uuid4())
+
+        assert signer.verify(old_signer.sign(invite_code)) == invite_code
+        assert old_signer.verify(signer.sign(invite_code)) is None
+
+    def test_unsigned_codes(self):
+        """Testa aceitação configurável de códigos sem assinatura."""
+        invite_code = str(uuid.uuid4())
+        lenient = PayloadSigner({"k1": b"s"}, accept_unsigned=True)
+        strict = PayloadSigner({"k1": b"s"}, accept_unsigned=False)
+
+        assert lenient.verify(invite_code) == invite_code
+        assert lenient.verify("não é um uuid") is None
+        assert strict.verify(invite_code) is None
+
+    def test_from_string(self):
+        """Testa leitura das chaves da configuração."""
+        signer = PayloadSigner.from_string("k2:novo, k1:antigo")
+
+        assert signer.active_key_id == "k2"
+        assert PayloadSigner.from_string("k1:antigo").verify(signer.sign("abc")) is None
+
+    def test_invalid_key_id(self):
+        """Testa que identificadores com o separador são recusados."""
+        with pytest.raises(ValueError):
+            PayloadSigner({"a.b": b"s"})
+
+
+class TestSignedAPI:
+    """Testes das rotas com assinatura habilitada."""
+
+    def test_signed_roundtrip(self, client):
+        """Testa que o QR Code gerado é assinado e validado."""
+        response = client.post("/api/v1/generate-qrcode", json={"data": "Assinado"})
+        invite_code = response.headers["X-Invite-Code"]
+
+        payload = QRCodeService.read_qrcode(response.content)
+        assert payload != invite_code
+        assert payload.startswith(invite_code)
+
+        files = {"file": ("qrcode.png", response.content, "image/png")}
+        result = client.post("/api/v1/read-qrcode", files=files).json()
+
+        assert result["success"] is True
+        assert result["invite_code"] == invite_code
+        assert result["data"] == "Assinado"
+
+    def test_forged_code_is_rejected(self, client):
+        """Testa que um código forjado é rejeitado antes do banco."""
+        forged = QRCodeService.generate_qrcode(f"{uuid.uuid4()}.k2.AAAAAAAAAAAAAAAA")
+        files = {"file": ("qrcode.png", forged.read(), "image/png")}
+        result = client.post("/api/v1/read-qrcode", files=files).json()
+
+        assert result["success"] is False
+        assert "assinatura" in result["message"].lower()
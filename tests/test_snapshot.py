@@ -0,0 +1,200 @@
+"""
+Testes para os snapshots de validação offline.
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from app.api.archive_service import ArchiveService
+from app.database.database import Base, get_db
+from app.database.migrations import run_migrations
+from app.models.invite import Invite
+from app.snapshot.client import ADMITTED, ALREADY_VALIDATED, UNKNOWN, OfflineValidator
+from app.snapshot.format import (
+    SnapshotFormatError,
+    pack_delta,
+    pack_snapshot,
+    unpack_delta,
+    unpack_snapshot,
+)
+from tests.conftest import database_url
+
+SQLALCHEMY_DATABASE_URL = database_url("test_snapshot.db")
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def client():
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(previous)
+
+
+class TestSnapshotFormat:
+    """Testes para o formato binário."""
+
+    def test_snapshot_roundtrip(self):
+        """Testa que o snapshot preserva códigos ordenados e bitmap."""
+        codes = [uuid.uuid4().bytes for _ in range(20)]
+        entries = [(code, index % 3 == 0) for index, code in enumerate(codes)]
+
+        version, unpacked, bitmap = unpack_snapshot(pack_snapshot(42, entries))
+
+        assert version == 42
+        assert unpacked == sorted(codes)
+        validated = {code for code, flag in entries if flag}
+        for index, code in enumerate(unpacked):
+            assert bool(bitmap[index >> 3] & (1 << (index & 7))) == (code in validated)
+
+    def test_delta_roundtrip(self):
+        """Testa que o delta preserva os registros."""
+        entries = [(uuid.uuid4().bytes, True), (uuid.uuid4().bytes, False)]
+        assert unpack_delta(pack_delta(3, 9, entries)) == (3, 9, entries)
+
+    def test_corrupted_snapshot_is_rejected(self):
+        """Testa que o checksum detecta corrupção."""
+        data = bytearray(pack_snapshot(1, [(uuid.uuid4().bytes, False)]))
+        data[25] ^= 0xFF
+
+        with pytest.raises(SnapshotFormatError):
+            unpack_snapshot(bytes(data))
+
+
+class TestOfflineValidator:
+    """Testes para o validador offline."""
+
+    def test_admit(self):
+        """Testa admissão, repetição e código desconhecido."""
+        admitted = uuid.uuid4()
+        used = uuid.uuid4()
+        validator = OfflineValidator.from_snapshot(
+            pack_snapshot(5, [(admitted.bytes, False), (used.bytes, True)])
+        )
+
+        assert validator.admit(str(admitted)) == ADMITTED
+        assert validator.admit(str(admitted)) == ALREADY_VALIDATED
+        assert validator.admit(str(used)) == ALREADY_VALIDATED
+        assert validator.admit(str(uuid.uuid4())) == UNKNOWN
+        assert validator.admit("não é um código") == UNKNOWN
+
+    def test_apply_delta(self):
+        """Testa que o delta adiciona convites e marca validações."""
+        existing = uuid.uuid4()
+        validator = OfflineValidator.from_snapshot(pack_snapshot(5, [(existing.bytes, False)]))
+
+        new = uuid.uuid4()
+        validator.apply_delta(pack_delta(5, 7, [(existing.bytes, True), (new.bytes, False)]))
+
+        assert validator.version == 7
+        assert len(validator) == 2
+        assert validator.status(str(existing)) == ALREADY_VALIDATED
+        assert validator.status(str(new)) == ADMITTED
+
+    def test_apply_delta_with_gap_is_rejected(self):
+        """Testa que um delta posterior à versão local é recusado."""
+        validator = OfflineValidator.from_snapshot(pack_snapshot(5, []))
+
+        with pytest.raises(ValueError):
+            validator.apply_delta(pack_delta(6, 7, []))
+
+
+class TestSnapshotAPI:
+    """Testes para os endpoints de snapshot."""
+
+    def test_snapshot_and_delta(self, client):
+        """Testa o ciclo snapshot → novo convite → delta → validação → delta."""
+        response = client.get("/api/v1/snapshot")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/octet-stream"
+        validator = OfflineValidator.from_snapshot(response.content)
+        assert validator.version == int(response.headers["X-Snapshot-Version"])
+
+        generate_response = client.post("/api/v1/generate-qrcode", json={"data": "Offline"})
+        invite_code = generate_response.headers["X-Invite-Code"]
+        assert validator.status(invite_code) == UNKNOWN
+
+        delta = client.get(f"/api/v1/snapshot/delta?since={validator.version}")
+        assert delta.status_code == 200
+        assert validator.apply_delta(delta.content) == 1
+        assert validator.status(invite_code) == ADMITTED
+
+        db = TestingSessionLocal()
+        try:
+            db.execute(
+                update(Invite)
+                .where(Invite.invite_code == invite_code)
+                .values(is_validated=True)
+            )
+            db.commit()
+        finally:
+            db.close()
+
+        # A atualização direta não altera a sequência; o delta fica vazio
+        delta = client.get(f"/api/v1/snapshot/delta?since={validator.version}")
+        assert validator.apply_delta(delta.content) == 0
+
+    def test_validation_is_published_in_delta(self, client):
+        """Testa que a validação pela API gera nova versão."""
+        generate_response = client.post("/api/v1/generate-qrcode", json={"data": "Portaria"})
+        invite_code = generate_response.headers["X-Invite-Code"]
+
+        validator = OfflineValidator.from_snapshot(client.get("/api/v1/snapshot").content)
+        assert validator.status(invite_code) == ADMITTED
+
+        files = {"file": ("qrcode.png", generate_response.content, "image/png")}
+        assert client.post("/api/v1/read-qrcode", files=files).json()["success"] is True
+
+        delta = client.get(f"/api/v1/snapshot/delta?since={validator.version}")
+        validator.apply_delta(delta.content)
+        assert validator.status(invite_code) == ALREADY_VALIDATED
+
+    def test_archived_invites_stay_in_snapshot(self, client):
+        """Testa que convites arquivados continuam no snapshot e a validação deles chega ao delta."""
+        generate_response = client.post("/api/v1/generate-qrcode", json={"data": "Arquivado"})
+        invite_code = generate_response.headers["X-Invite-Code"]
+
+        db = TestingSessionLocal()
+        try:
+            db.execute(
+                update(Invite)
+                .where(Invite.invite_code == invite_code)
+                .values(created_at=datetime.utcnow() - timedelta(days=400))
+            )
+            db.commit()
+            assert ArchiveService.archive(db, older_than_days=365) >= 1
+        finally:
+            db.close()
+
+        validator = OfflineValidator.from_snapshot(client.get("/api/v1/snapshot").content)
+        assert validator.status(invite_code) == ADMITTED
+
+        files = {"file": ("qrcode.png", generate_response.content, "image/png")}
+        assert client.post("/api/v1/read-qrcode", files=files).json()["success"] is True
+
+        delta = client.get(f"/api/v1/snapshot/delta?since={validator.version}")
+        assert validator.apply_delta(delta.content) == 1
+        assert validator.status(invite_code) == ALREADY_VALIDATED
+
+    def test_negative_version(self, client):
+        """Testa versão inválida no delta."""
+        response = client.get("/api/v1/snapshot/delta?since=-1")
+        assert response.status_code == 400
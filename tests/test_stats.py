@@ -0,0 +1,179 @@
+"""
+Testes para as séries de check-in por minuto e por hora.
+"""
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from app.api.stats_service import StatsService
+from app.database.database import Base, get_db
+from app.database.migrations import run_migrations
+from app.models.checkin_rollup import CheckinRollup, epoch_minute
+from app.models.invite import Invite
+from tests.conftest import database_url
+
+SQLALCHEMY_DATABASE_URL = database_url("test_stats.db")
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+Base.metadata.create_all(bind=engine)
+run_migrations(engine)
+
+DOORS_OPEN = datetime(2025, 3, 15, 19, 0)
+
+
+def override_get_db():
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def client():
+    previous = dict(app.dependency_overrides)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    app.dependency_overrides.update(previous)
+
+
+@pytest.fixture
+def db():
+    session = TestingSessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def empty_db(db):
+    db.query(CheckinRollup).delete()
+    db.commit()
+    return db
+
+
+def validate_at(db, moments):
+    invites = [Invite(invite_code=str(uuid.uuid4()), data="Convidado") for _ in moments]
+    db.add_all(invites)
+    db.commit()
+    for invite, moment in zip(invites, moments):
+        invite.is_validated = True
+        invite.validated_at = moment
+    db.commit()
+
+
+def rollup_count(db, moment):
+    rollup = db.get(CheckinRollup, epoch_minute(moment))
+    return rollup.count if rollup else 0
+
+
+class TestCheckinRollups:
+    """Testes para a atualização incremental das contagens."""
+
+    def test_validation_is_counted_once(self, db):
+        """Testa que validar incrementa o minuto e revalidar não conta de novo."""
+        moment = DOORS_OPEN + timedelta(days=1, minutes=5, seconds=30)
+        before = rollup_count(db, moment)
+
+        validate_at(db, [moment, moment + timedelta(seconds=10)])
+        assert rollup_count(db, moment) == before + 2
+
+        invite = db.query(Invite).filter(Invite.validated_at == moment).first()
+        invite.is_validated = True
+        invite.data = "Alterado"
+        db.commit()
+        assert rollup_count(db, moment) == before + 2
+
+    def test_backfill_matches_invites(self, db):
+        """Testa que o recálculo conta os convites validados em cada minuto."""
+        start = DOORS_OPEN + timedelta(days=2)
+        validate_at(db, [start + timedelta(seconds=17 * i) for i in range(12)])
+
+        db.query(CheckinRollup).delete()
+        db.commit()
+        assert StatsService.backfill(db) > 0
+
+        for minute in range(4):
+            moment = start + timedelta(minutes=minute)
+            expected = db.query(Invite).filter(
+                Invite.validated_at >= moment,
+                Invite.validated_at < moment + timedelta(minutes=1)
+            ).count()
+            assert expected > 0
+            assert rollup_count(db, moment) == expected
+
+
+class TestCheckinSeries:
+    """Testes para StatsService.checkin_series."""
+
+    def test_minute_series_fills_gaps(self, empty_db):
+        """Testa que minutos sem validações aparecem com contagem zero."""
+        start = DOORS_OPEN + timedelta(days=3)
+        validate_at(empty_db, [start, start, start + timedelta(minutes=2, seconds=59)])
+
+        series = StatsService.checkin_series(
+            empty_db, "minute", since=start, until=start + timedelta(minutes=3)
+        )
+
+        assert [point["count"] for point in series["points"]] == [2, 0, 1, 0]
+        assert series["points"][1]["start"] == start + timedelta(minutes=1)
+        assert series["total"] == 3
+
+    def test_hour_series(self, empty_db):
+        """Testa a soma dos minutos em intervalos de uma hora."""
+        start = DOORS_OPEN + timedelta(days=4)
+        validate_at(empty_db, [start + timedelta(minutes=10), start + timedelta(minutes=50),
+                               start + timedelta(hours=1, minutes=5)])
+
+        series = StatsService.checkin_series(
+            empty_db, "hour", since=start, until=start + timedelta(hours=1)
+        )
+
+        assert [point["count"] for point in series["points"]] == [2, 1]
+
+    def test_invalid_arguments(self, db):
+        """Testa intervalos desconhecidos e períodos inválidos."""
+        with pytest.raises(ValueError):
+            StatsService.checkin_series(db, "day")
+        with pytest.raises(ValueError):
+            StatsService.checkin_series(db, since=DOORS_OPEN, until=DOORS_OPEN - timedelta(hours=1))
+        with pytest.raises(ValueError):
+            StatsService.checkin_series(db, since=DOORS_OPEN, until=DOORS_OPEN + timedelta(days=2))
+
+
+class TestCheckinAPI:
+    """Testes para o endpoint de séries de check-in."""
+
+    def test_read_qrcode_updates_series(self, client):
+        """Testa que a validação pela leitura do QR Code aparece na série."""
+        before = client.get("/api/v1/stats/checkins").json()
+
+        response = client.post("/api/v1/generate-qrcode", json={"data": "Portaria"})
+        files = {"file": ("qrcode.png", response.content, "image/png")}
+        assert client.post("/api/v1/read-qrcode", files=files).json()["success"] is True
+
+        after = client.get("/api/v1/stats/checkins").json()
+        assert after["bucket"] == "minute"
+        assert len(after["points"]) == StatsService.DEFAULT_POINTS["minute"]
+        assert after["total"] >= before["total"] + 1
+
+    def test_summary(self, client):
+        """Testa o resumo de convites totais, validados e pendentes."""
+        before = client.get("/api/v1/stats/summary").json()
+        client.post("/api/v1/generate-qrcode", json={"data": "Resumo"})
+        after = client.get("/api/v1/stats/summary").json()
+
+        assert after["total"] == before["total"] + 1
+        assert after["pending"] == before["pending"] + 1
+        assert after["total"] == after["validated"] + after["pending"]
+
+    def test_invalid_bucket(self, client):
+        """Testa resposta 400 para intervalo desconhecido."""
+        response = client.get("/api/v1/stats/checkins", params={"bucket": "day"})
+        assert response.status_code == 400